@@ -0,0 +1,168 @@
+"""Golden check and benchmark: compiled API extraction plan versus per-record lookups.
+
+Maps a synthetic SEC EDGAR-sized payload (default 20k filings) with:
+
+* ``reference``: the previous ``_map_payload`` (config lookups, ``dict(raw)``
+  plus ``setdefault`` per record, templates tried inside try/except),
+* ``plan``:      ``_ExtractionPlan`` compiled once per source,
+* ``raw``:       a hand-written loop over the same dicts, as the floor.
+
+    python benchmarks/api_extraction.py --records 20000 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urljoin
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.adapters.api import _ExtractionPlan, _extract_path  # noqa: E402
+from crawler.models import SourceDefinition  # noqa: E402
+
+FORMS = ["10-K", "10-Q", "8-K", "4", "S-1", "DEF 14A"]
+
+CONFIG = {
+    "items_path": "filings.recent",
+    "field_map": {"title": "primaryDocDescription", "published_at": "filingDate"},
+    "base_url": "https://www.sec.gov/",
+    "url_template": "Archives/edgar/data/{cik}/{accessionNumber}/{primaryDocument}",
+    "title_template": "{company} {form}",
+    "summary_template": "{form} filed {filingDate} (report date {reportDate})",
+    "static_fields": {"cik": "320193", "company": "Apple Inc."},
+    "content_type": "filing",
+    "language": "en",
+    "region": "US",
+}
+
+
+def payload(records: int) -> dict[str, Any]:
+    rng = random.Random(5)
+    filings = []
+    for index in range(records):
+        filing = {
+            "accessionNumber": f"0000320193-24-{index:06d}",
+            "filingDate": f"2024-{1 + index % 12:02d}-{1 + index % 28:02d}",
+            "form": rng.choice(FORMS),
+            "primaryDocument": f"doc{index}.htm",
+            "primaryDocDescription": "" if index % 3 else f"Filing {index}",
+            "size": rng.randint(1000, 10_000_000),
+        }
+        if index % 4:
+            filing["reportDate"] = filing["filingDate"]
+        filings.append(filing)
+    return {"cik": "320193", "filings": {"recent": filings}}
+
+
+def reference_map(payload: Any, source: SourceDefinition) -> list[dict[str, Any]]:
+    items_path = source.config.get("items_path")
+    field_map = source.config.get("field_map") or {}
+    base_url = source.config.get("base_url")
+    url_template = source.config.get("url_template")
+    title_template = source.config.get("title_template")
+    summary_template = source.config.get("summary_template")
+    published_at_template = source.config.get("published_at_template")
+    static_fields = source.config.get("static_fields") or {}
+
+    raw_items = _extract_path(payload, items_path) if items_path else payload
+    items: list[dict[str, Any]] = []
+    for raw in raw_items:
+        if not isinstance(raw, dict):
+            continue
+        merged = dict(raw)
+        for key, value in static_fields.items():
+            merged.setdefault(key, value)
+
+        title = merged.get(field_map.get("title", "title"))
+        if not title and title_template:
+            try:
+                title = title_template.format_map(merged)
+            except KeyError:
+                title = None
+
+        url = merged.get(field_map.get("url", "url"))
+        if not url and url_template:
+            try:
+                url = url_template.format_map(merged)
+            except KeyError:
+                url = None
+        if url and base_url:
+            url = urljoin(base_url, str(url))
+
+        published_at = merged.get(field_map.get("published_at", "published_at"))
+        if not published_at and published_at_template:
+            try:
+                published_at = published_at_template.format_map(merged)
+            except KeyError:
+                published_at = None
+
+        summary = merged.get(field_map.get("summary", "summary"))
+        if not summary and summary_template:
+            try:
+                summary = summary_template.format_map(merged)
+            except KeyError:
+                summary = None
+
+        items.append(
+            {
+                "title": title,
+                "url": url,
+                "published_at": published_at,
+                "summary": summary,
+                "content_type": source.config.get("content_type", "news"),
+                "language": source.config.get("language"),
+                "region": source.config.get("region"),
+            }
+        )
+    return items
+
+
+def raw_map(payload: Any) -> list[dict[str, Any]]:
+    return [
+        {
+            "title": raw["primaryDocDescription"],
+            "url": raw["primaryDocument"],
+            "published_at": raw["filingDate"],
+            "summary": raw.get("reportDate"),
+            "content_type": "filing",
+            "language": "en",
+            "region": "US",
+        }
+        for raw in payload["filings"]["recent"]
+    ]
+
+
+def timed(function: Callable[[], object], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    source = SourceDefinition(id="sec_edgar", name="SEC EDGAR", type="api", config=CONFIG)
+    data = payload(args.records)
+    plan = _ExtractionPlan(source)
+    assert plan.map(data) == reference_map(data, source)
+
+    records = args.records * args.repeat
+    for name, function in (
+        ("reference", lambda: reference_map(data, source)),
+        ("plan", lambda: _ExtractionPlan(source).map(data)),
+        ("raw", lambda: raw_map(data)),
+    ):
+        seconds = timed(function, args.repeat)
+        print(f"{name:<10} {seconds:.3f}s  {seconds / records * 1e6:.2f} us/record")
+
+
+if __name__ == "__main__":
+    main()
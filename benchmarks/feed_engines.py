@@ -0,0 +1,160 @@
+"""Compare the feedparser and lxml (iterparse) engines of the RSS adapter.
+
+Fixtures are the feeds of the RSS sources in ``sources_config.yaml``, saved
+as ``<fixtures>/<source_id>.xml``:
+
+    python benchmarks/feed_engines.py --save       # capture current feeds
+    python benchmarks/feed_engines.py --entries 5000
+
+Sources without a saved feed get a synthetic one with ``--entries`` entries
+in the source's format (RSS 1.0 for BIS, RSS 2.0 otherwise). Both engines
+must return the same title, url, published date and summary for every entry.
+``routine`` is the lxml engine with ``stop_when_known: true`` and every entry
+but the newest ``--new`` already stored, i.e. a daily run that stops at the
+first known entry.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.adapters.rss import _parse_feed  # noqa: E402
+from crawler.config import load_settings, load_sources  # noqa: E402
+from crawler.http_client import build_client  # noqa: E402
+from crawler.utils import fetch_response, news_item_id  # noqa: E402
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "feeds"
+
+_RSS2 = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+    "<title>{source}</title><link>https://example.org/</link>"
+    '<atom:link href="https://example.org/feed.xml" rel="self"/>{entries}</channel></rss>'
+)
+_RSS2_ENTRY = (
+    "<item><title><![CDATA[{source} press release {index}: policy statement]]></title>"
+    "<link>https://example.org/press/{index}.htm</link>"
+    '<guid isPermaLink="true">https://example.org/press/{index}.htm</guid>'
+    "<description><![CDATA[<p>The committee decided today &amp; noted that "
+    "economic activity has been expanding at a solid pace ({index}).</p>]]></description>"
+    "<category>Press Release</category>"
+    "<pubDate>{weekday}, {day:02d} Jan 2024 14:00:00 GMT</pubDate></item>"
+)
+_RSS1 = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+    'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    '<channel rdf:about="https://example.org/"><title>{source}</title>'
+    "<link>https://example.org/</link><items><rdf:Seq/></items></channel>{entries}</rdf:RDF>"
+)
+_RSS1_ENTRY = (
+    '<item rdf:about="https://example.org/press/{index}.htm">'
+    "<title>{source} press release {index}</title>"
+    "<link>https://example.org/press/{index}.htm</link>"
+    "<description>Central bankers discuss financial stability ({index}).</description>"
+    "<dc:date>2024-01-{day:02d}T10:00:00Z</dc:date></item>"
+)
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_RDF_SOURCES = {"bis"}
+
+
+def synthetic_feed(source_id: str, entries: int) -> bytes:
+    document, entry = (_RSS1, _RSS1_ENTRY) if source_id in _RDF_SOURCES else (_RSS2, _RSS2_ENTRY)
+    body = "".join(
+        entry.format(
+            source=source_id,
+            index=index,
+            day=1 + index % 28,
+            weekday=_WEEKDAYS[index % 28 % 7],
+        )
+        for index in range(entries)
+    )
+    return document.format(source=source_id, entries=body).encode("utf-8")
+
+
+def save_fixtures(fixtures: Path) -> None:
+    settings = load_settings()
+    fixtures.mkdir(parents=True, exist_ok=True)
+    with build_client(settings) as client:
+        for source in load_sources():
+            if source.type != "rss" or not source.config.get("feed_urls"):
+                continue
+            url = source.config["feed_urls"][0]
+            try:
+                response = fetch_response(
+                    client, url, {"User-Agent": settings["user_agent"]}, 20, 1, 0
+                )
+            except RuntimeError as exc:
+                print(f"{source.id}: {exc}")
+                continue
+            (fixtures / f"{source.id}.xml").write_bytes(response.content)
+            print(f"{source.id}: saved {len(response.content)} bytes")
+
+
+def bench(source, content: bytes, url: str, repeat: int, known_ids=None) -> tuple[float, list]:
+    response = httpx.Response(200, content=content, request=httpx.Request("GET", url))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        items = list(_parse_feed(response, url, source, known_ids))
+    return (time.perf_counter() - started) / repeat, items
+
+
+def _key(items: list) -> list:
+    return [
+        (item["title"], item["url"], item["published_at"], item["summary"]) for item in items
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--new", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", action="store_true", help="Fetch and save feeds first")
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.fixtures)
+
+    print(
+        f"{'source':<16} {'origin':<10} {'entries':>7} {'MB':>6} "
+        f"{'feedparser/s':>12} {'lxml/s':>9} {'speedup':>8} {'routine ms':>10}"
+    )
+    for source in load_sources():
+        if source.type != "rss" or not source.config.get("feed_urls"):
+            continue
+        path = args.fixtures / f"{source.id}.xml"
+        if path.exists():
+            content, origin = path.read_bytes(), "saved"
+        else:
+            content, origin = synthetic_feed(source.id, args.entries), "synthetic"
+        url = source.config["feed_urls"][0]
+        config = {key: value for key, value in source.config.items() if key != "engine"}
+        feedparser_sec, feedparser_items = bench(
+            replace(source, config=config), content, url, args.repeat
+        )
+        lxml_source = replace(source, config={**config, "engine": "lxml"})
+        lxml_sec, lxml_items = bench(lxml_source, content, url, args.repeat)
+        assert _key(feedparser_items) == _key(lxml_items), f"{source.id}: engines disagree"
+        known = {news_item_id(source.id, item["url"]) for item in lxml_items[args.new :]}
+        routine_source = replace(lxml_source, config={**lxml_source.config, "stop_when_known": True})
+        routine_sec, routine_items = bench(routine_source, content, url, args.repeat, known)
+        assert len(routine_items) == min(args.new, len(lxml_items))
+        entries = len(lxml_items)
+        print(
+            f"{source.id:<16} {origin:<10} {entries:>7} {len(content) / 1e6:>6.1f} "
+            f"{entries / feedparser_sec:>12,.0f} {entries / lxml_sec:>9,.0f} "
+            f"{feedparser_sec / lxml_sec:>7.1f}x {routine_sec * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare the BeautifulSoup and lxml engines of the HTML adapter.
+
+Fixtures are the list pages of the HTML sources in ``sources_config.yaml``,
+saved as ``<fixtures>/<source_id>.html``:
+
+    python benchmarks/html_engines.py --save     # capture current pages
+    python benchmarks/html_engines.py            # benchmark saved pages
+
+Sources without a saved page get a synthetic one generated from their
+selectors (rows plus navigation noise), so the script also runs offline.
+Both engines must return identical items for every page.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.adapters.html import _has_selectors, _parse_list_page  # noqa: E402
+from crawler.config import load_settings, load_sources  # noqa: E402
+from crawler.http_client import build_client  # noqa: E402
+from crawler.utils import fetch_text  # noqa: E402
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "html"
+
+_COMPOUND = re.compile(r"^(?P<tag>[\w-]*)(?P<rest>.*)$")
+_PART = re.compile(r"\.([\w-]+)|\[([\w-]+)=['\"]?([^'\"\]]*)['\"]?\]")
+
+
+def _element(compound: str) -> tuple[str, str]:
+    """Opening/closing tags for a simple compound selector like ``a.fl[x='1']``."""
+    match = _COMPOUND.match(compound)
+    tag = match.group("tag") or "div"
+    classes: list[str] = []
+    attrs: list[str] = []
+    for class_name, attr, value in _PART.findall(match.group("rest")):
+        if class_name:
+            classes.append(class_name)
+        else:
+            attrs.append(f'{attr}="{value}"')
+    if classes:
+        attrs.insert(0, f'class="{" ".join(classes)}"')
+    opening = f"<{tag}{''.join(' ' + attr for attr in attrs)}>"
+    return opening, f"</{tag}>"
+
+
+def _nested(selector: str, inner: str) -> str:
+    html = inner
+    for compound in reversed(selector.split()):
+        opening, closing = _element(compound)
+        html = f"{opening}{html}{closing}"
+    return html
+
+
+def synthetic_page(config: dict, rows: int = 40) -> str:
+    item_parts = config["item_selector"].split()
+    container, row_selector = " ".join(item_parts[:-1]), item_parts[-1]
+    row_open, row_close = _element(row_selector)
+    body = []
+    for index in range(rows):
+        link = _nested(config["url_selector"], f"Policy notice {index}")
+        link = link.replace(">", f' href="/notice/{index}.html">', 1)
+        if config["title_selector"] != config["url_selector"]:
+            link += _nested(config["title_selector"], f"Policy notice {index}")
+        published = config.get("published_selector")
+        date = _nested(published, f"2024-01-{1 + index % 28:02d}") if published else ""
+        body.append(f"{row_open}{link}{date}{row_close}")
+    listing = _nested(container, "".join(body)) if container else "".join(body)
+    nav = "".join(f'<li><a href="/nav/{index}.html">Menu {index}</a></li>' for index in range(150))
+    return (
+        "<html><head><title>list</title><script>var x = 1;</script></head><body>"
+        f"<div class='header'><ul>{nav}</ul></div>{listing}"
+        f"<div class='footer'><ul>{nav}</ul></div></body></html>"
+    )
+
+
+def save_fixtures(fixtures: Path) -> None:
+    settings = load_settings()
+    fixtures.mkdir(parents=True, exist_ok=True)
+    with build_client(settings) as client:
+        for source in load_sources():
+            if source.type != "html" or not _has_selectors(source):
+                continue
+            url = source.config["list_urls"][0]
+            try:
+                html = fetch_text(client, url, {"User-Agent": settings["user_agent"]}, 20, 1, 0)
+            except RuntimeError as exc:
+                print(f"{source.id}: {exc}")
+                continue
+            (fixtures / f"{source.id}.html").write_text(html, encoding="utf-8")
+            print(f"{source.id}: saved {len(html)} chars")
+
+
+def bench(source, html: str, url: str, repeat: int) -> tuple[float, list]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        items = _parse_list_page(html, url, source)
+    return (time.perf_counter() - started) / repeat, items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--save", action="store_true", help="Fetch and save list pages first")
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.fixtures)
+
+    print(f"{'source':<20} {'origin':<10} {'items':>5} {'bs4 ms':>8} {'lxml ms':>8} {'speedup':>8}")
+    for source in load_sources():
+        if source.type != "html" or not _has_selectors(source):
+            continue
+        path = args.fixtures / f"{source.id}.html"
+        if path.exists():
+            html, origin = path.read_text(encoding="utf-8"), "saved"
+        else:
+            html, origin = synthetic_page(source.config), "synthetic"
+        url = source.config["list_urls"][0]
+        config = {key: value for key, value in source.config.items() if key != "engine"}
+        soup_sec, soup_items = bench(replace(source, config=config), html, url, args.repeat)
+        lxml_source = replace(source, config={**config, "engine": "lxml"})
+        lxml_sec, lxml_items = bench(lxml_source, html, url, args.repeat)
+        assert soup_items == lxml_items, f"{source.id}: engines disagree"
+        print(
+            f"{source.id:<20} {origin:<10} {len(soup_items):>5} "
+            f"{soup_sec * 1000:>8.2f} {lxml_sec * 1000:>8.2f} {soup_sec / lxml_sec:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Peak RSS of an API fetch: whole-body ``response.json()`` versus streaming ``ijson``.
+
+Writes a large EDGAR-style JSON payload (default 300k filings) to disk and
+serves it in 64 KiB chunks through an ``httpx.MockTransport``, then runs
+``fetch_api`` in a fresh interpreter per mode and reports ``ru_maxrss``.
+Both modes must produce the same items.
+
+    python benchmarks/json_stream.py --records 300000
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.adapters.api import fetch_api  # noqa: E402
+from crawler.models import SourceDefinition  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from api_extraction import CONFIG  # noqa: E402
+
+
+def serve(path: Path) -> httpx.MockTransport:
+    def chunks() -> Iterator[bytes]:
+        with path.open("rb") as handle:
+            while chunk := handle.read(1 << 16):
+                yield chunk
+
+    return httpx.MockTransport(
+        lambda request: httpx.Response(
+            200, content=chunks(), headers={"content-type": "application/json"}
+        )
+    )
+
+
+def measure(mode: str, path: Path) -> None:
+    config = {**CONFIG, "endpoint": "https://data.sec.gov/submissions/CIK0000320193.json"}
+    if mode == "stream":
+        config["stream"] = True
+    source = SourceDefinition(id="sec_edgar", name="SEC EDGAR", type="api", config=config)
+    started = time.perf_counter()
+    with httpx.Client(transport=serve(path)) as client:
+        items = list(fetch_api(source, "bench", 30, 1, 0, client=client))
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    digest = hashlib.sha256(json.dumps(items).encode("utf-8")).hexdigest()
+    print(json.dumps({"items": len(items), "peak_mb": peak_mb, "sec": elapsed, "digest": digest}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=300_000)
+    parser.add_argument("--measure", choices=["whole", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "submissions.json"
+        # Written in a child process: ru_maxrss carries over into later children.
+        subprocess.run(
+            [sys.executable, "-c", (
+                "import json, sys; sys.path.insert(0, sys.argv[1]); "
+                "from api_extraction import payload; "
+                "json.dump(payload(int(sys.argv[2])), open(sys.argv[3], 'w'))"
+            ), str(Path(__file__).resolve().parent), str(args.records), str(path)],
+            check=True,
+        )
+        size_mb = path.stat().st_size / 1024 / 1024
+        print(f"payload    {args.records} filings, {size_mb:.0f} MB")
+        digests = set()
+        for mode in ("whole", "stream"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", mode, "--path", str(path)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            digests.add(result["digest"])
+            print(f"{mode:<10} peak RSS {result['peak_mb']:.0f} MB, {result['sec']:.2f}s")
+        assert len(digests) == 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""JSONL load/dump throughput (MB/s) per storage codec.
+
+Generates a synthetic multi-million-line ``news.jsonl`` and times:
+
+* ``baseline``: the previous per-line ``json.loads`` / ``handle.write`` loop,
+* ``json``:     the codec layer with stdlib json (bulk reads, batched writes),
+* ``orjson``:   the codec layer with orjson, when installed.
+
+    python benchmarks/jsonl_codec.py --lines 2000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from itertools import chain, islice, repeat
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.storage import get_codec, iter_news_items, orjson, write_news_items  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from record_memory import write_archive  # noqa: E402
+
+
+def baseline_load(path: Path) -> Iterator[dict]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            raw = line.strip()
+            if not raw:
+                continue
+            try:
+                yield json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+
+
+def baseline_dump(path: Path, items: Iterable[dict]) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        for item in items:
+            handle.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def timed(function: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def drain(items: Iterable[dict]) -> None:
+    for _ in items:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=2_000_000)
+    parser.add_argument("--sample", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "news.jsonl"
+        output = Path(tmp) / "out.jsonl"
+        write_archive(source, args.lines)
+        size_mb = source.stat().st_size / 1024 / 1024
+        print(f"archive    {args.lines} lines, {size_mb:.0f} MB")
+
+        # Loads stream the whole file; dumps replay an in-memory sample up to the
+        # same line count, so memory stays flat for multi-million-line runs.
+        sample = list(islice(baseline_load(source), args.sample))
+        rounds = max(1, args.lines // len(sample))
+        dump_mb = size_mb * rounds * len(sample) / args.lines
+
+        def replay() -> Iterator[dict]:
+            return chain.from_iterable(repeat(sample, rounds))
+
+        load_sec = timed(lambda: drain(baseline_load(source)))
+        dump_sec = timed(lambda: baseline_dump(output, replay()))
+        print(f"{'baseline':<10} load {size_mb / load_sec:7.1f} MB/s   dump {dump_mb / dump_sec:7.1f} MB/s")
+
+        for name in ("json", "orjson"):
+            if name == "orjson" and orjson is None:
+                print("orjson     not installed")
+                continue
+            codec = get_codec(name)
+            assert list(islice(iter_news_items(source, codec=codec), len(sample))) == sample
+            load_sec = timed(lambda: drain(iter_news_items(source, codec=codec)))
+            dump_sec = timed(lambda: write_news_items(output, replay(), codec=codec))
+            assert list(islice(iter_news_items(output, codec=codec), len(sample))) == sample
+            print(f"{name:<10} load {size_mb / load_sec:7.1f} MB/s   dump {dump_mb / dump_sec:7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
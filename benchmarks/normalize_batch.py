@@ -0,0 +1,86 @@
+"""Golden check and benchmark: ``normalize_batch`` against ``_normalize_item``.
+
+Raw adapter items are rebuilt from ``data/news.jsonl`` (plus messy variants:
+tracking parameters, padded titles, unparseable dates, missing fields) and
+grouped per source. Every batch must normalize exactly like the per-item path.
+
+    python benchmarks/normalize_batch.py --data data/news.jsonl --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.config import load_sources  # noqa: E402
+from crawler.pipeline import _normalize_item, normalize_batch  # noqa: E402
+from crawler.storage import iter_news_items  # noqa: E402
+
+RAW_FIELDS = ("title", "url", "published_at", "summary", "content_type", "language", "region")
+
+
+def raw_batches(data_path: Path) -> dict[str, list[dict]]:
+    batches: dict[str, list[dict]] = {}
+    for index, item in enumerate(iter_news_items(data_path)):
+        raw = {field: item.get(field) for field in RAW_FIELDS}
+        variant = index % 5
+        if variant == 1:
+            raw["url"] = f" {raw['url']}?utm_source=x&b=2&a=1 "
+            raw["title"] = f"  {raw['title']}  "
+        elif variant == 2:
+            raw["published_at"] = "not a date"
+        elif variant == 3:
+            raw["published_at"] = (raw["published_at"] or "")[:10]
+        elif variant == 4:
+            raw.pop("summary")
+            raw["keywords"] = ["policy"]
+        batches.setdefault(item["source_id"], []).append(raw)
+    return batches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", type=Path, default=Path("data/news.jsonl"))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sources = {source.id: source for source in load_sources()}
+    batches = {
+        source_id: raw_items
+        for source_id, raw_items in raw_batches(args.data).items()
+        if source_id in sources
+    }
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    total = sum(len(raw_items) for raw_items in batches.values())
+
+    for source_id, raw_items in batches.items():
+        source = sources[source_id]
+        expected = [_normalize_item(raw, source, fetched_at=fetched_at) for raw in raw_items]
+        assert normalize_batch(raw_items, source, fetched_at=fetched_at) == expected, source_id
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for source_id, raw_items in batches.items():
+            for raw in raw_items:
+                _normalize_item(raw, sources[source_id], fetched_at=fetched_at)
+    per_item_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for source_id, raw_items in batches.items():
+            normalize_batch(raw_items, sources[source_id], fetched_at=fetched_at)
+    batch_sec = time.perf_counter() - started
+
+    items = total * args.repeat
+    print(f"batches    {len(batches)} sources, {total} items (identical output)")
+    print(f"per-item   {per_item_sec:.3f}s  {per_item_sec / items * 1e6:.2f} us/item")
+    print(f"batch      {batch_sec:.3f}s  {batch_sec / items * 1e6:.2f} us/item")
+    print(f"speedup    {per_item_sec / batch_sec:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Micro-benchmark: memoized ``parse_datetime`` against the original implementation.
+
+The inputs mimic one crawl: list pages with ``published_format`` that repeat a
+handful of dates, feed dates in RFC 822 and ISO-8601 form, and the empty values
+that used to call ``datetime.now`` per item. Both versions must agree.
+
+    python benchmarks/parse_datetime.py
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from dateutil import parser as date_parser
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.utils import parse_datetime  # noqa: E402
+
+
+def reference_parse_datetime(value, *, default_timezone=None, fmt=None):
+    """``parse_datetime`` before memoization, kept here as the baseline."""
+    if value is None or value == "":
+        return datetime.now(timezone.utc).isoformat()
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value).strip()
+        if fmt:
+            dt = datetime.strptime(text, fmt)
+        else:
+            dt = date_parser.parse(text)
+    if dt.tzinfo is None:
+        name = (default_timezone or "").strip()
+        if not name:
+            tzinfo = timezone.utc
+        elif name.upper() in {"UTC", "Z"}:
+            tzinfo = timezone.utc
+        else:
+            tzinfo = ZoneInfo(name)
+        dt = dt.replace(tzinfo=tzinfo)
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+def workload(count: int) -> list[tuple[str, str | None, str | None]]:
+    rng = random.Random(7)
+    days = [f"2024-{month:02d}-{day:02d}" for month in (1, 2, 3) for day in range(1, 29)]
+    rfc822 = [f"Mon, {day:02d} Jan 2024 10:{day:02d}:00 GMT" for day in range(1, 29)]
+    iso = [f"2024-01-{day:02d}T08:30:00+00:00" for day in range(1, 29)]
+    cases = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            cases.append((rng.choice(days[:10]), "%Y-%m-%d", "Asia/Shanghai"))
+        elif kind < 0.8:
+            cases.append((rng.choice(rfc822), None, None))
+        elif kind < 0.95:
+            cases.append((rng.choice(iso), None, None))
+        else:
+            cases.append(("", None, None))
+    return cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50_000)
+    args = parser.parse_args()
+
+    cases = workload(args.items)
+    now = datetime.now(timezone.utc).isoformat()
+
+    started = time.perf_counter()
+    expected = [
+        reference_parse_datetime(text, default_timezone=tz, fmt=fmt) for text, fmt, tz in cases
+    ]
+    reference_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [parse_datetime(text, default_timezone=tz, fmt=fmt, now=now) for text, fmt, tz in cases]
+    memoized_sec = time.perf_counter() - started
+
+    for (text, _, _), old, new in zip(cases, expected, actual):
+        if text:
+            assert old == new, (text, old, new)
+
+    print(f"items      {args.items}")
+    print(f"reference  {reference_sec:.3f}s  {reference_sec / args.items * 1e6:.2f} us/item")
+    print(f"memoized   {memoized_sec:.3f}s  {memoized_sec / args.items * 1e6:.2f} us/item")
+    print(f"speedup    {reference_sec / memoized_sec:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
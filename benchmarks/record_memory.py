@@ -0,0 +1,97 @@
+"""Peak RSS of holding an archive as dicts versus slotted ``NewsItem`` records.
+
+Writes a synthetic archive (default 1M items shaped like ``data/news.jsonl``),
+then loads it in a fresh interpreter per mode, the way ``JsonlStore`` does,
+and reports ``ru_maxrss`` and load time.
+
+    python benchmarks/record_memory.py --items 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.storage import load_news_items, load_news_records  # noqa: E402
+from crawler.utils import sha256_text  # noqa: E402
+
+SOURCES = [
+    ("pboc", "中国人民银行", "zh-CN", "CN"),
+    ("nbs", "国家统计局", "zh-CN", "CN"),
+    ("federal_reserve", "Federal Reserve", "en", "US"),
+    ("ecb", "European Central Bank", "en", "EU"),
+    ("boe", "Bank of England", "en", "UK"),
+]
+
+
+def write_archive(path: Path, count: int) -> None:
+    rng = random.Random(3)
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(count):
+            source_id, source_name, language, region = rng.choice(SOURCES)
+            url = f"https://example.org/{source_id}/{index}.html"
+            day = 1 + index % 28
+            item = {
+                "id": sha256_text(f"{source_id}:{url}"),
+                "source_id": source_id,
+                "source_name": source_name,
+                "title": f"Policy update {index} on monetary conditions",
+                "url": url,
+                "canonical_url": url,
+                "published_at": f"2024-01-{day:02d}T16:00:00+00:00",
+                "fetched_at": f"2024-02-{day:02d}T00:00:00.123456+00:00",
+                "summary": None if index % 3 else f"Summary of update {index}.",
+                "keywords": [],
+                "content_type": "news",
+                "language": language,
+                "region": region,
+            }
+            handle.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def measure(mode: str, path: Path) -> None:
+    loader = load_news_records if mode == "records" else load_news_items
+    started = time.perf_counter()
+    items = loader(path)
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"mode": mode, "items": len(items), "peak_mb": peak_mb, "sec": elapsed}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--measure", choices=["dicts", "records"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "news.jsonl"
+        write_archive(path, args.items)
+        size_mb = path.stat().st_size / 1024 / 1024
+        print(f"archive    {args.items} items, {size_mb:.0f} MB")
+        for mode in ("dicts", "records"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", mode, "--path", str(path)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(f"{mode:<10} peak RSS {result['peak_mb']:.0f} MB, load {result['sec']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Run-time and peak RSS of ``JsonlStore.add_items``: full sort versus streaming merge.
+
+Writes a synthetic newest-first archive (default 1M items), then adds a batch
+of new items with ``max_items`` retention in a fresh interpreter per mode:
+
+* ``sort``:  the previous path, load every record, sort, retain, rewrite,
+* ``merge``: ``JsonlStore.add_items`` streaming ``merge_retained``.
+
+Both must leave byte-identical files.
+
+    python benchmarks/retention_merge.py --items 1000000 --new 500
+"""
+from __future__ import annotations
+
+import argparse
+import filecmp
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crawler.models import NewsItem  # noqa: E402
+from crawler.storage import (  # noqa: E402
+    JsonlStore,
+    apply_retention,
+    get_codec,
+    iter_news_items,
+    load_news_records,
+    write_news_items,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from record_memory import write_archive  # noqa: E402
+
+
+def new_batch(count: int) -> list[dict]:
+    return [
+        {
+            "id": f"new-{index}",
+            "source_id": "pboc",
+            "source_name": "中国人民银行",
+            "title": f"New item {index}",
+            "url": f"https://example.org/new/{index}.html",
+            "canonical_url": f"https://example.org/new/{index}.html",
+            "published_at": f"2024-01-{1 + index % 28:02d}T12:00:00+00:00",
+            "fetched_at": "2024-02-01T00:00:00+00:00",
+            "summary": None,
+            "keywords": [],
+            "content_type": "news",
+            "language": "zh-CN",
+            "region": "CN",
+        }
+        for index in range(count)
+    ]
+
+
+def measure(mode: str, path: Path, new: int, max_items: int) -> None:
+    if mode == "prepare":
+        records = load_news_records(path)
+        records.sort(key=lambda item: item.published_at or "", reverse=True)
+        write_news_items(path, records, codec=get_codec("json"))
+        JsonlStore(path).load()  # id index, as left by the previous run
+        return
+    items = new_batch(new)
+    retention = {"enabled": True, "max_items": max_items}
+    codec = get_codec("json")
+    started = time.perf_counter()
+    if mode == "sort":
+        combined = load_news_records(path, codec=codec) + [NewsItem.from_dict(item) for item in items]
+        combined.sort(key=lambda item: item.published_at or "", reverse=True)
+        write_news_items(path, apply_retention(combined, retention), codec=codec)
+    else:
+        JsonlStore(path, codec=codec).load().add_items(items, retention)
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"mode": mode, "peak_mb": peak_mb, "sec": elapsed}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--new", type=int, default=500)
+    parser.add_argument("--measure", choices=["prepare", "sort", "merge"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    max_items = args.items
+
+    if args.measure:
+        measure(args.measure, args.path, args.new, max_items)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source.jsonl"
+        write_archive(source, args.items)
+        # Sorted in a child process: ru_maxrss carries over into later children.
+        subprocess.run(
+            [sys.executable, __file__, "--measure", "prepare", "--path", str(source)],
+            check=True,
+        )
+        size_mb = source.stat().st_size / 1024 / 1024
+        print(f"archive    {args.items} items, {size_mb:.0f} MB, +{args.new} new, max_items {max_items}")
+
+        outputs = {}
+        for mode in ("sort", "merge"):
+            path = Path(tmp) / f"{mode}.jsonl"
+            shutil.copyfile(source, path)
+            shutil.copyfile(source.with_suffix(".idx"), path.with_suffix(".idx"))
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", mode, "--path", str(path),
+                 "--items", str(args.items), "--new", str(args.new)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            outputs[mode] = path
+            print(f"{mode:<10} peak RSS {result['peak_mb']:.0f} MB, {result['sec']:.2f}s")
+        assert filecmp.cmp(outputs["sort"], outputs["merge"], shallow=False)
+        assert sum(1 for _ in iter_news_items(outputs["merge"])) == max_items
+
+
+if __name__ == "__main__":
+    main()
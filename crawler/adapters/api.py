@@ -1,24 +1,372 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
 import os
-from typing import Any
-from urllib.parse import urljoin
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from functools import lru_cache
+from itertools import chain
+from string import Formatter
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+from urllib.parse import quote, urljoin, urlsplit
 
 import httpx
 
+from ..high_water import HighWaterMark, stop_by_date, until_high_water
+from ..http_client import use_async_client, use_client
+from ..json_stream import JsonItemStream, ijson, stream_prefix
 from ..models import SourceDefinition
-from ..utils import fetch_json
+from ..ratelimit import HostRateLimiter
+from ..retry import RetryPolicy
+from ..utils import fetch_json, fetch_json_async, fetch_json_stream, fetch_json_stream_async
+
+
+@lru_cache(maxsize=None)
+def _compile_path(path: str | None) -> Callable[[Any], Any]:
+    """Accessor for a dotted ``items_path``-style path, split once.
+
+    Parts index into dicts; numeric parts also index into lists, so
+    ``Results.series.0.data`` reaches the first series.
+    """
+    if not path:
+        return lambda payload: payload
+    parts = tuple((part, int(part) if part.isdigit() else None) for part in path.split("."))
+
+    def extract(payload: Any) -> Any:
+        current = payload
+        for key, index in parts:
+            if isinstance(current, dict):
+                current = current.get(key)
+            elif index is not None and isinstance(current, list):
+                current = current[index] if index < len(current) else None
+            else:
+                return None
+        return current
+
+    return extract
 
 
 def _extract_path(payload: Any, path: str) -> Any:
-    current = payload
-    for part in path.split("."):
-        if isinstance(current, dict):
-            current = current.get(part)
-        else:
+    return _compile_path(path)(payload)
+
+
+class _Template:
+    """``str.format_map`` template whose top-level field names are parsed once.
+
+    Records lacking one of them give None straight away instead of raising
+    and catching a KeyError; a template without fields is a constant.
+    """
+
+    def __init__(self, template: str) -> None:
+        names = [name for _, name, _, _ in Formatter().parse(template) if name]
+        self.keys = tuple(dict.fromkeys(_ROOT_NAME.match(name).group() for name in names))
+        self.format = template.format_map
+        self.constant = template.format_map({}) if not names else None
+
+    def __call__(self, record: dict[str, Any]) -> str | None:
+        if self.constant is not None:
+            return self.constant
+        for key in self.keys:
+            if key not in record:
+                return None
+        try:
+            return self.format(record)
+        except KeyError:
             return None
-    return current
+
+
+_ROOT_NAME = re.compile(r"[^.\[]*")
+_PLAIN_REFERENCE = re.compile(r"[^:?#;\\\s]+", re.ASCII)
+
+
+@lru_cache(maxsize=None)
+def _compile_join(base_url: str) -> Callable[[str], str]:
+    """``urljoin(base_url, ...)`` with the base split once.
+
+    Plain relative paths (no scheme, query, ``//`` or dot segments), the usual
+    shape of ids and paths in API records, are joined by concatenation; anything
+    else goes through ``urljoin``.
+    """
+    parts = urlsplit(base_url)
+    if (
+        parts.scheme not in ("http", "https")
+        or not parts.netloc
+        or "//" in parts.path
+        or "/." in parts.path
+    ):
+        return lambda url: urljoin(base_url, url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    directory = origin + parts.path[: parts.path.rfind("/") + 1] if parts.path else origin + "/"
+
+    def join(url: str) -> str:
+        if (
+            _PLAIN_REFERENCE.fullmatch(url)
+            and "//" not in url
+            and "/." not in f"/{url}"
+            and url.isascii()
+        ):
+            return origin + url if url.startswith("/") else directory + url
+        return urljoin(base_url, url)
+
+    return join
+
+
+def _auth_params(source: SourceDefinition) -> dict[str, Any]:
+    auth_env = source.config.get("auth_env") or {}
+    resolved: dict[str, Any] = {}
+    for param_key, env_key in auth_env.items():
+        env_value = os.getenv(env_key)
+        if env_value:
+            resolved[param_key] = env_value
+    return resolved
+
+
+class _Request:
+    """One parameter set of a source: endpoint, query params and template fields."""
+
+    def __init__(
+        self, endpoint: str, params: dict[str, Any], fields: dict[str, Any]
+    ) -> None:
+        self.endpoint = endpoint
+        self.params = params
+        self.fields = fields
+
+
+def _requests(source: SourceDefinition, endpoint: str) -> list[_Request]:
+    # ``params`` merged with each of ``param_sets`` (one request stream per
+    # set) and the auth_env values, which are looked up once per run. Keys a
+    # set uses as ``{placeholders}`` in the endpoint go into the path instead
+    # of the query; ``fields`` are only exposed to the templates.
+    base = source.config.get("params") or {}
+    auth = _auth_params(source)
+    path_keys = {name for _, name, _, _ in Formatter().parse(endpoint) if name}
+    requests: list[_Request] = []
+    for param_set in source.config.get("param_sets") or [{}]:
+        param_set = dict(param_set)
+        fields = {**(param_set.pop("fields", None) or {}), **param_set}
+        params = {**base, **param_set, **auth}
+        url = endpoint
+        if path_keys:
+            url = endpoint.format_map(
+                {key: quote(str(params.pop(key, "")), safe="") for key in path_keys}
+            )
+        requests.append(_Request(url, params, fields))
+    return requests
+
+
+_PAGE_PARAMS = {"offset": "offset", "page": "page", "cursor": "cursor"}
+
+
+class _Page:
+    """One response as the adapter keeps it: mapped items, raw item count and
+    the scalars paging reads (total, cursor), never the payload itself.
+    ``reached`` is set once its items run into the source's high-water mark."""
+
+    def __init__(self, items: list[dict[str, Any]], count: int, scalars: dict[str, Any]) -> None:
+        self.items = items
+        self.count = count
+        self.scalars = scalars
+        self.reached = False
+
+
+def _until_reached(pages: Iterable[_Page]) -> Iterator[dict[str, Any]]:
+    # Pages fetched together may run past the one that reached the mark.
+    for page in pages:
+        yield from page.items
+        if page.reached:
+            break
+
+
+def _scalar_paths(pagination: dict[str, Any] | None) -> tuple[str, ...]:
+    if not pagination:
+        return ()
+    if pagination.get("type") == "cursor":
+        return (pagination.get("cursor_path", "next_cursor"),)
+    return (pagination["total_path"],) if pagination.get("total_path") else ()
+
+
+def _page_param(pagination: dict[str, Any]) -> str:
+    return pagination.get("param") or _PAGE_PARAMS[pagination.get("type", "offset")]
+
+
+def _page_size(pagination: dict[str, Any], params: dict[str, Any], first_count: int) -> int:
+    size = pagination.get("page_size") or params.get(pagination.get("size_param", "limit"))
+    return int(size) if size else first_count
+
+
+def _page_params(
+    pagination: dict[str, Any], params: dict[str, Any], index: int, page_size: int
+) -> dict[str, Any]:
+    # Params of the ``index``-th page (0 = the first request) for offset/page paging.
+    param = _page_param(pagination)
+    if pagination.get("type", "offset") == "page":
+        return {**params, param: int(params.get(param, 1)) + index}
+    return {**params, param: int(params.get(param, 0)) + index * page_size}
+
+
+def _remaining_pages(
+    pagination: dict[str, Any] | None, params: dict[str, Any], first: _Page
+) -> list[dict[str, Any]] | None:
+    """Params of every further page when the first page tells how many there are.
+
+    None means the pages have to be walked one at a time (cursor paging, or no
+    ``total_path`` in the payload); an empty list means there is nothing more.
+    """
+    if not pagination:
+        return []
+    if pagination.get("type") == "cursor" or not pagination.get("total_path"):
+        return None
+    try:
+        total = int(first.scalars.get(pagination["total_path"]))
+    except (TypeError, ValueError):
+        return None
+    page_size = _page_size(pagination, params, first.count)
+    if not first.count or not page_size:
+        return []
+    pages = min(int(pagination.get("max_pages", 10)), math.ceil(total / page_size))
+    return [_page_params(pagination, params, index, page_size) for index in range(1, pages)]
+
+
+def _next_page(
+    pagination: dict[str, Any],
+    params: dict[str, Any],
+    page: _Page,
+    index: int,
+    page_size: int,
+) -> dict[str, Any] | None:
+    # Params of page ``index`` given the previous page, or None at the end.
+    if not page.count or index >= int(pagination.get("max_pages", 10)):
+        return None
+    if pagination.get("type") == "cursor":
+        cursor = page.scalars.get(pagination.get("cursor_path", "next_cursor"))
+        return {**params, _page_param(pagination): cursor} if cursor else None
+    if page.count < page_size:
+        return None
+    return _page_params(pagination, params, index, page_size)
+
+
+def _first_params(pagination: dict[str, Any] | None, params: dict[str, Any]) -> dict[str, Any]:
+    if not pagination or pagination.get("type") == "cursor":
+        return params
+    return _page_params(pagination, params, 0, 0)
+
+
+class _ExtractionPlan:
+    """A source's ``items_path`` / ``field_map`` / template config, compiled once per run.
+
+    ``map`` then costs little more than reading the raw dicts: lookup keys and
+    template callables are fixed, and static fields are merged into each record
+    in one step (and not at all when there are none).
+    """
+
+    def __init__(self, source: SourceDefinition) -> None:
+        config = source.config
+        field_map = config.get("field_map") or {}
+        self.source_id = source.id
+        self.items = _compile_path(config.get("items_path"))
+        self.scalar_paths = _scalar_paths(config.get("pagination"))
+        self.stream_prefix = None
+        if config.get("stream"):
+            self.stream_prefix = stream_prefix(config.get("items_path"))
+            if self.stream_prefix is None or ijson is None:
+                logging.warning(
+                    "API source %s cannot stream (%s); reading whole responses",
+                    source.id,
+                    "ijson is not installed" if ijson is None else "numeric items_path",
+                )
+                self.stream_prefix = None
+        base_url = config.get("base_url")
+        self.join = _compile_join(base_url) if base_url else None
+        self.static_fields = config.get("static_fields") or {}
+        self.title, self.url, self.published_at, self.summary = (
+            (field_map.get(name, name), _Template(template) if template else None)
+            for name, template in (
+                ("title", config.get("title_template")),
+                ("url", config.get("url_template")),
+                ("published_at", config.get("published_at_template")),
+                ("summary", config.get("summary_template")),
+            )
+        )
+        self.content_type = config.get("content_type", "news")
+        self.language = config.get("language")
+        self.region = config.get("region")
+
+    def page(self, payload: Any, fields: dict[str, Any] | None = None) -> _Page:
+        raw_items = self.items(payload)
+        if not isinstance(raw_items, list):
+            logging.warning("API source %s returned unexpected payload", self.source_id)
+            raw_items = []
+        scalars = {path: _extract_path(payload, path) for path in self.scalar_paths}
+        return _Page(self.map_items(raw_items, fields), len(raw_items), scalars)
+
+    def stream(self, fields: dict[str, Any] | None = None) -> JsonItemStream:
+        return JsonItemStream(
+            self.stream_prefix,
+            self.scalar_paths,
+            on_items=lambda raw_items: self.map_items(raw_items, fields),
+        )
+
+    def stream_page(self, stream: JsonItemStream) -> _Page:
+        return _Page(stream.items, stream.count, stream.scalars)
+
+    def map(self, payload: Any, fields: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+        return self.page(payload, fields).items
+
+    def map_items(
+        self, raw_items: list[Any], fields: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        static = {**self.static_fields, **fields} if fields else self.static_fields
+        title_key, title_template = self.title
+        url_key, url_template = self.url
+        published_key, published_template = self.published_at
+        summary_key, summary_template = self.summary
+        join = self.join
+        content_type, language, region = self.content_type, self.language, self.region
+
+        items: list[dict[str, Any]] = []
+        for raw in raw_items:
+            if not isinstance(raw, dict):
+                continue
+            # Values from the record win over static fields, as with setdefault.
+            record = {**static, **raw} if static else raw
+
+            title = record.get(title_key)
+            if not title and title_template is not None:
+                title = title_template(record)
+
+            url = record.get(url_key)
+            if not url and url_template is not None:
+                url = url_template(record)
+            if url and join is not None:
+                url = join(str(url))
+
+            published_at = record.get(published_key)
+            if not published_at and published_template is not None:
+                published_at = published_template(record)
+
+            summary = record.get(summary_key)
+            if not summary and summary_template is not None:
+                summary = summary_template(record)
+
+            items.append(
+                {
+                    "title": title,
+                    "url": url,
+                    "published_at": published_at,
+                    "summary": summary,
+                    "content_type": content_type,
+                    "language": language,
+                    "region": region,
+                }
+            )
+        return items
+
+
+def _concurrency(source: SourceDefinition) -> int:
+    return max(1, int(source.config.get("concurrency", 4)))
 
 
 def fetch_api(
@@ -27,92 +375,191 @@ def fetch_api(
     timeout: float,
     max_retries: int,
     retry_backoff: float,
-) -> list[dict[str, Any]]:
+    *,
+    client: httpx.Client | None = None,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    high_water: HighWaterMark | None = None,
+) -> Iterator[dict[str, Any]]:
     endpoint = source.config.get("endpoint")
     if not endpoint:
         logging.warning("API source %s missing endpoint", source.id)
-        return []
+        return
 
     headers = {"User-Agent": user_agent}
-    params = source.config.get("params") or {}
-    auth_env = source.config.get("auth_env") or {}
-    resolved_params = dict(params)
-    for param_key, env_key in auth_env.items():
-        env_value = os.getenv(env_key)
-        if env_value:
-            resolved_params[param_key] = env_value
-    items_path = source.config.get("items_path")
-    field_map = source.config.get("field_map") or {}
-    base_url = source.config.get("base_url")
-    url_template = source.config.get("url_template")
-    title_template = source.config.get("title_template")
-    summary_template = source.config.get("summary_template")
-    published_at_template = source.config.get("published_at_template")
-    static_fields = source.config.get("static_fields") or {}
-
-    with httpx.Client() as client:
-        payload = fetch_json(
-            client,
-            endpoint,
-            headers,
-            timeout,
-            max_retries,
-            retry_backoff,
-            params=resolved_params,
+    pagination = source.config.get("pagination")
+    requests = _requests(source, endpoint)
+    plan = _ExtractionPlan(source)
+    # The date half of the mark only holds within one ordered listing.
+    by_date = stop_by_date(source, len(requests))
+
+    def get(request: _Request, params: dict[str, Any]) -> _Page:
+        if plan.stream_prefix is not None:
+            stream = fetch_json_stream(
+                http,
+                request.endpoint,
+                headers,
+                timeout,
+                max_retries,
+                retry_backoff,
+                params=params,
+                new_stream=lambda: plan.stream(request.fields),
+                limiter=limiter,
+                retry=retry,
+            )
+            page = plan.stream_page(stream)
+        else:
+            payload = fetch_json(
+                http,
+                request.endpoint,
+                headers,
+                timeout,
+                max_retries,
+                retry_backoff,
+                params=params,
+                limiter=limiter,
+                retry=retry,
+            )
+            page = plan.page(payload, request.fields)
+        page.items, page.reached = until_high_water(
+            page.items, source, high_water, by_date=by_date
         )
+        return page
 
-    raw_items = _extract_path(payload, items_path) if items_path else payload
-    if not isinstance(raw_items, list):
-        logging.warning("API source %s returned unexpected payload", source.id)
-        return []
+    def get_pages(request: _Request, params: dict[str, Any]) -> list[_Page]:
+        return [get(request, params)]
+
+    def walk(request: _Request, params: dict[str, Any], page: _Page) -> list[_Page]:
+        page_size = _page_size(pagination, params, page.count)
+        pages: list[_Page] = []
+        index = 1
+        while (
+            not page.reached
+            and (next_params := _next_page(pagination, params, page, index, page_size)) is not None
+        ):
+            page = get(request, next_params)
+            pages.append(page)
+            index += 1
+        return pages
+
+    # First pages of every parameter set go out together; pages whose count is
+    # known from the first one follow together too, while cursor chains are
+    # walked in their own worker. Results are merged in configuration order,
+    # each parameter set up to the page that reaches the high-water mark.
+    with use_client(client) as http, ThreadPoolExecutor(_concurrency(source)) as pool:
+        # Workers run in the caller's context, so their timings keep the source.
+        def submit(function: Callable[..., Any], *args: Any) -> Future:
+            return pool.submit(copy_context().run, function, *args)
+
+        first_params = [_first_params(pagination, request.params) for request in requests]
+        first_pages = [
+            submit(get, request, params) for request, params in zip(requests, first_params)
+        ]
+        firsts = [future.result() for future in first_pages]
+        rest: list[list[Future]] = []
+        for request, params, first in zip(requests, first_params, firsts):
+            if first.reached:
+                rest.append([])
+                continue
+            remaining = _remaining_pages(pagination, params, first)
+            if remaining is None:
+                rest.append([submit(walk, request, params, first)])
+            else:
+                rest.append([submit(get_pages, request, page) for page in remaining])
+        for first, futures in zip(firsts, rest):
+            yield from _until_reached(
+                chain([first], (page for future in futures for page in future.result()))
+            )
+
+
+async def fetch_api_async(
+    source: SourceDefinition,
+    user_agent: str,
+    timeout: float,
+    max_retries: int,
+    retry_backoff: float,
+    *,
+    client: httpx.AsyncClient | None = None,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    high_water: HighWaterMark | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    endpoint = source.config.get("endpoint")
+    if not endpoint:
+        logging.warning("API source %s missing endpoint", source.id)
+        return
+
+    headers = {"User-Agent": user_agent}
+    pagination = source.config.get("pagination")
+    requests = _requests(source, endpoint)
+    plan = _ExtractionPlan(source)
+    # The date half of the mark only holds within one ordered listing.
+    by_date = stop_by_date(source, len(requests))
+    semaphore = asyncio.Semaphore(_concurrency(source))
 
-    items: list[dict[str, Any]] = []
-    for raw in raw_items:
-        if not isinstance(raw, dict):
-            continue
-        merged = dict(raw)
-        for key, value in static_fields.items():
-            merged.setdefault(key, value)
-
-        title = merged.get(field_map.get("title", "title"))
-        if not title and title_template:
-            try:
-                title = title_template.format_map(merged)
-            except KeyError:
-                title = None
-
-        url = merged.get(field_map.get("url", "url"))
-        if not url and url_template:
-            try:
-                url = url_template.format_map(merged)
-            except KeyError:
-                url = None
-        if url and base_url:
-            url = urljoin(base_url, str(url))
-
-        published_at = merged.get(field_map.get("published_at", "published_at"))
-        if not published_at and published_at_template:
-            try:
-                published_at = published_at_template.format_map(merged)
-            except KeyError:
-                published_at = None
-
-        summary = merged.get(field_map.get("summary", "summary"))
-        if not summary and summary_template:
-            try:
-                summary = summary_template.format_map(merged)
-            except KeyError:
-                summary = None
-
-        items.append(
-            {
-                "title": title,
-                "url": url,
-                "published_at": published_at,
-                "summary": summary,
-                "content_type": source.config.get("content_type", "news"),
-                "language": source.config.get("language"),
-                "region": source.config.get("region"),
-            }
+    async def get(request: _Request, params: dict[str, Any]) -> _Page:
+        async with semaphore:
+            if plan.stream_prefix is not None:
+                stream = await fetch_json_stream_async(
+                    http,
+                    request.endpoint,
+                    headers,
+                    timeout,
+                    max_retries,
+                    retry_backoff,
+                    params=params,
+                    new_stream=lambda: plan.stream(request.fields),
+                    limiter=limiter,
+                    retry=retry,
+                )
+                page = plan.stream_page(stream)
+            else:
+                payload = await fetch_json_async(
+                    http,
+                    request.endpoint,
+                    headers,
+                    timeout,
+                    max_retries,
+                    retry_backoff,
+                    params=params,
+                    limiter=limiter,
+                    retry=retry,
+                )
+                page = plan.page(payload, request.fields)
+        page.items, page.reached = until_high_water(
+            page.items, source, high_water, by_date=by_date
         )
-    return items
+        return page
+
+    async def fetch_request(request: _Request) -> list[_Page]:
+        params = _first_params(pagination, request.params)
+        page = await get(request, params)
+        if page.reached:
+            return [page]
+        remaining = _remaining_pages(pagination, params, page)
+        if remaining is not None:
+            return [page, *await asyncio.gather(*(get(request, later) for later in remaining))]
+        pages = [page]
+        page_size = _page_size(pagination, params, page.count)
+        index = 1
+        while (
+            not page.reached
+            and (next_params := _next_page(pagination, params, page, index, page_size)) is not None
+        ):
+            page = await get(request, next_params)
+            pages.append(page)
+            index += 1
+        return pages
+
+    # Requests run together; their items are yielded in configuration order
+    # as each one completes.
+    async with use_async_client(client) as http:
+        tasks = [asyncio.ensure_future(fetch_request(request)) for request in requests]
+        try:
+            for task in tasks:
+                for item in _until_reached(await task):
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,59 +1,588 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from functools import lru_cache
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Container, Iterator
 
 import httpx
+import lxml.html
 from bs4 import BeautifulSoup
+from lxml import etree
 from urllib.parse import urljoin
 
+try:
+    from cssselect import HTMLTranslator, SelectorError
+except ImportError:  # optional, installed with the "fast" extra
+    HTMLTranslator = None
+
+from ..high_water import HighWaterMark, stop_by_date, until_high_water
+from ..http_cache import CacheScope, NotModified
+from ..http_client import use_async_client, use_client
 from ..models import SourceDefinition
-from ..utils import fetch_text
+from ..parsing import ParsePool
+from ..ratelimit import HostRateLimiter
+from ..retry import RetryPolicy
+from ..utils import fetch_response, fetch_response_async, news_item_id
 
+# One fetched and parsed list page: its items and the next page's URL, if any.
+Page = tuple[list[dict[str, Any]], str | None]
 
-def fetch_html(
+
+def _has_selectors(source: SourceDefinition) -> bool:
+    config = source.config
+    return bool(
+        config.get("list_urls")
+        and config.get("item_selector")
+        and config.get("title_selector")
+        and config.get("url_selector")
+    )
+
+
+# BeautifulSoup resolves these against the row it selects from; the XPath
+# translation resolves them against the document.
+_ROW_ANCHOR = re.compile(r":(?:scope|root)\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _compile_selectors(
+    item_selector: str, title_selector: str, url_selector: str, published_selector: str | None
+) -> tuple[etree.XPath, etree.XPath, etree.XPath, etree.XPath | None] | None:
+    """CSS selectors of one source as XPath, compiled once per process."""
+    if HTMLTranslator is None:
+        logging.warning("engine: lxml needs cssselect; using BeautifulSoup")
+        return None
+    row_selectors = (title_selector, url_selector, published_selector or "")
+    if any(_ROW_ANCHOR.search(selector) for selector in row_selectors):
+        logging.warning("engine: lxml cannot anchor :scope/:root at a row; using BeautifulSoup")
+        return None
+    translator = HTMLTranslator()
+    try:
+        # Row selectors match descendants only, like BeautifulSoup's select_one.
+        return (
+            etree.XPath(translator.css_to_xpath(item_selector)),
+            etree.XPath(translator.css_to_xpath(title_selector, prefix="descendant::")),
+            etree.XPath(translator.css_to_xpath(url_selector, prefix="descendant::")),
+            etree.XPath(translator.css_to_xpath(published_selector, prefix="descendant::"))
+            if published_selector
+            else None,
+        )
+    except SelectorError as exc:
+        logging.warning("Cannot compile selectors for lxml (%s); using BeautifulSoup", exc)
+        return None
+
+
+# Elements whose contents BeautifulSoup's get_text leaves out.
+_NO_TEXT = frozenset({"script", "style", "template"})
+
+
+def _strings(element: Any) -> Iterator[str]:
+    if element.text:
+        yield element.text
+    for child in element:
+        # Comments and processing instructions have no string tag.
+        if isinstance(child.tag, str) and child.tag not in _NO_TEXT:
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(element: Any) -> str:
+    # Same result as BeautifulSoup's get_text(strip=True).
+    return "".join(part.strip() for part in _strings(element))
+
+
+def _first(xpath: etree.XPath, row: Any) -> Any:
+    matches = xpath(row)
+    return matches[0] if matches else None
+
+
+def _parse_list_page_lxml(
+    html: str,
+    page_url: str,
     source: SourceDefinition,
-    user_agent: str,
-    timeout: float,
-    max_retries: int,
-    retry_backoff: float,
+    compiled: tuple[etree.XPath, etree.XPath, etree.XPath, etree.XPath | None],
 ) -> list[dict[str, Any]]:
-    list_urls = source.config.get("list_urls") or []
+    item_xpath, title_xpath, url_xpath, published_xpath = compiled
+    if not html.strip():
+        return []
+    root = lxml.html.document_fromstring(
+        html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8")
+    )
+
+    items: list[dict[str, Any]] = []
+    for row in item_xpath(root):
+        title_el = _first(title_xpath, row)
+        url_el = _first(url_xpath, row)
+        if title_el is None or url_el is None:
+            continue
+        base_url = source.config.get("base_url") or page_url
+        raw_url = url_el.get("href")
+        absolute_url = urljoin(base_url, raw_url) if raw_url else None
+        items.append(
+            {
+                "title": _text(title_el),
+                "url": absolute_url,
+                "published_at": _text(_first(published_xpath, row))
+                if published_xpath is not None
+                else None,
+                "summary": None,
+                "content_type": source.config.get("content_type", "news"),
+                "language": source.config.get("language"),
+                "region": source.config.get("region"),
+            }
+        )
+    return items
+
+
+def _parse_list_page(html: str, page_url: str, source: SourceDefinition) -> list[dict[str, Any]]:
+    if source.config.get("engine") == "lxml":
+        compiled = _compile_selectors(
+            source.config["item_selector"],
+            source.config["title_selector"],
+            source.config["url_selector"],
+            source.config.get("published_selector"),
+        )
+        if compiled is not None:
+            return _parse_list_page_lxml(html, page_url, source, compiled)
+
     item_selector = source.config.get("item_selector")
     title_selector = source.config.get("title_selector")
     url_selector = source.config.get("url_selector")
     published_selector = source.config.get("published_selector")
 
-    if not list_urls or not item_selector or not title_selector or not url_selector:
+    items: list[dict[str, Any]] = []
+    soup = BeautifulSoup(html, "lxml")
+    for row in soup.select(item_selector):
+        title_el = row.select_one(title_selector)
+        url_el = row.select_one(url_selector)
+        if not title_el or not url_el:
+            continue
+        base_url = source.config.get("base_url") or page_url
+        raw_url = url_el.get("href")
+        absolute_url = urljoin(base_url, raw_url) if raw_url else None
+        items.append(
+            {
+                "title": title_el.get_text(strip=True),
+                "url": absolute_url,
+                "published_at": row.select_one(published_selector).get_text(strip=True)
+                if published_selector
+                else None,
+                "summary": None,
+                "content_type": source.config.get("content_type", "news"),
+                "language": source.config.get("language"),
+                "region": source.config.get("region"),
+            }
+        )
+    return items
+
+
+def _parse_list_page_bytes(
+    content: bytes, encoding: str, page_url: str, source: SourceDefinition
+) -> list[dict[str, Any]]:
+    # Decoded exactly like ``response.text`` so both paths see the same markup.
+    return _parse_list_page(content.decode(encoding, errors="replace"), page_url, source)
+
+
+def _submit_parse(
+    parser: ParsePool | None, response: httpx.Response, url: str, source: SourceDefinition
+) -> Future:
+    args = (response.content, response.encoding or "utf-8", url, source)
+    if parser is not None:
+        return parser.submit(_parse_list_page_bytes, *args)
+    future: Future = Future()
+    future.set_result(_parse_list_page_bytes(*args))
+    return future
+
+
+def _pagination(source: SourceDefinition) -> dict[str, Any] | None:
+    pagination = source.config.get("pagination") or {}
+    if pagination.get("url_template") or pagination.get("next_selector"):
+        return pagination
+    return None
+
+
+def _template_urls(pagination: dict[str, Any]) -> Iterator[str]:
+    first_page = int(pagination.get("first_page", 2))
+    last_page = pagination.get("last_page")
+    if last_page is None:
+        last_page = first_page + int(pagination.get("max_pages", 50)) - 1
+    for page in range(first_page, int(last_page) + 1):
+        yield pagination["url_template"].format(page=page)
+
+
+@lru_cache(maxsize=None)
+def _css_xpath(selector: str) -> etree.XPath:
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector))
+
+
+def _next_page_url(response: httpx.Response, page_url: str, selector: str) -> str | None:
+    html = response.content.decode(response.encoding or "utf-8", errors="replace")
+    if not html.strip():
+        return None
+    if HTMLTranslator is not None:
+        root = lxml.html.document_fromstring(
+            html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8")
+        )
+        link = _first(_css_xpath(selector), root)
+    else:
+        link = BeautifulSoup(html, "lxml").select_one(selector)
+    href = link.get("href") if link is not None else None
+    return urljoin(page_url, href) if href else None
+
+
+def _item_ids(items: list[dict[str, Any]], source: SourceDefinition) -> list[str]:
+    return [news_item_id(source.id, item["url"]) for item in items if item.get("url")]
+
+
+def _exhausted(items: list[dict[str, Any]], source: SourceDefinition, seen: set[str]) -> bool:
+    """Whether a page holds nothing to keep.
+
+    True for an empty page or a page repeating items of earlier pages (sites
+    that serve their last page for any larger number).
+    """
+    ids = _item_ids(items, source)
+    exhausted = all(item_id in seen for item_id in ids)
+    seen.update(ids)
+    return exhausted
+
+
+def _reaches_known(
+    items: list[dict[str, Any]],
+    source: SourceDefinition,
+    known_ids: Container[str] | None,
+    pagination: dict[str, Any],
+) -> bool:
+    """Whether a page holds an item stored already, so older pages hold no new ones.
+
+    ``stop_when_known: false`` turns this off (pages are then walked until one
+    is empty, repeated or past the high-water mark).
+    """
+    if known_ids is None or not pagination.get("stop_when_known", True):
+        return False
+    return any(item_id in known_ids for item_id in _item_ids(items, source))
+
+
+def _follow_pages(
+    fetch_page: Callable[[str], Page | None],
+    next_url: str | None,
+    pagination: dict[str, Any],
+    accept: Callable[[list[dict[str, Any]]], tuple[list[dict[str, Any]], bool]],
+) -> Iterator[dict[str, Any]]:
+    # Template pages are consumed in order and ``accept`` returns the items to
+    # keep and whether to stop. The first page is fetched alone; once a page
+    # comes back all new the window widens to ``concurrency`` pages, so a walk
+    # that ends on its first page costs one request. Next-links can only be
+    # followed one page at a time.
+    if pagination.get("url_template"):
+        urls = _template_urls(pagination)
+        concurrency = max(1, int(pagination.get("concurrency", 4)))
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # Pages run in the caller's context, so their timings keep the source.
+            def submit(url: str) -> Future:
+                return pool.submit(copy_context().run, fetch_page, url)
+
+            window = deque(submit(url) for url in islice(urls, 1))
+            try:
+                while window:
+                    page = window.popleft().result()
+                    if page is None:
+                        break
+                    kept, stop = accept(page[0])
+                    yield from kept
+                    if stop:
+                        break
+                    window.extend(submit(url) for url in islice(urls, concurrency - len(window)))
+            finally:
+                for future in window:
+                    future.cancel()
+        return
+
+    for _ in range(int(pagination.get("max_pages", 50))):
+        if not next_url:
+            break
+        page = fetch_page(next_url)
+        if page is None:
+            break
+        kept, stop = accept(page[0])
+        yield from kept
+        if stop:
+            break
+        next_url = page[1]
+
+
+async def _follow_pages_async(
+    fetch_page: Callable[[str], Awaitable[Page | None]],
+    next_url: str | None,
+    pagination: dict[str, Any],
+    accept: Callable[[list[dict[str, Any]]], tuple[list[dict[str, Any]], bool]],
+) -> AsyncIterator[dict[str, Any]]:
+    # Same walk as ``_follow_pages`` with tasks in place of threads.
+    if pagination.get("url_template"):
+        urls = _template_urls(pagination)
+        concurrency = max(1, int(pagination.get("concurrency", 4)))
+        window = deque(asyncio.ensure_future(fetch_page(url)) for url in islice(urls, 1))
+        try:
+            while window:
+                page = await window.popleft()
+                if page is None:
+                    break
+                kept, stop = accept(page[0])
+                for item in kept:
+                    yield item
+                if stop:
+                    break
+                window.extend(
+                    asyncio.ensure_future(fetch_page(url))
+                    for url in islice(urls, concurrency - len(window))
+                )
+        finally:
+            for task in window:
+                task.cancel()
+            await asyncio.gather(*window, return_exceptions=True)
+        return
+
+    for _ in range(int(pagination.get("max_pages", 50))):
+        if not next_url:
+            break
+        page = await fetch_page(next_url)
+        if page is None:
+            break
+        kept, stop = accept(page[0])
+        for item in kept:
+            yield item
+        if stop:
+            break
+        next_url = page[1]
+
+
+def fetch_html(
+    source: SourceDefinition,
+    user_agent: str,
+    timeout: float,
+    max_retries: int,
+    retry_backoff: float,
+    *,
+    client: httpx.Client | None = None,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    cache: CacheScope | None = None,
+    parser: ParsePool | None = None,
+    known_ids: Container[str] | None = None,
+    high_water: HighWaterMark | None = None,
+) -> Iterator[dict[str, Any]]:
+    if not _has_selectors(source):
         logging.warning("HTML source %s missing selector config", source.id)
-        return []
+        return
 
     headers = {"User-Agent": user_agent}
+    pagination = _pagination(source)
 
-    items: list[dict[str, Any]] = []
-    with httpx.Client() as client:
+    def fetch(url: str) -> httpx.Response | None:
+        started = time.perf_counter()
+        response = fetch_response(
+            http,
+            url,
+            headers,
+            timeout,
+            max_retries,
+            retry_backoff,
+            limiter=limiter,
+            retry=retry,
+            cache=cache,
+        )
+        if parser is not None:
+            parser.timings.add("fetch", time.perf_counter() - started)
+        return response
+
+    def fetch_page(url: str) -> Page | None:
+        try:
+            response = fetch(url)
+        except RuntimeError as exc:
+            logging.warning("Stop paging %s at %s: %s", source.id, url, exc)
+            return None
+        if response is None:
+            return None
+        next_selector = pagination.get("next_selector")
+        return (
+            _submit_parse(parser, response, url, source).result(),
+            _next_page_url(response, url, next_selector) if next_selector else None,
+        )
+
+    # Pages are handed to the parse stage as soon as they arrive, so the next
+    # request goes out while earlier pages are still being parsed.
+    parsed: list[Future] = []
+    unchanged = 0
+    last_page: tuple[httpx.Response, str] | None = None
+    list_urls = source.config["list_urls"]
+    with use_client(client) as http:
         for url in list_urls:
-            html = fetch_text(client, url, headers, timeout, max_retries, retry_backoff)
-            soup = BeautifulSoup(html, "lxml")
-            for row in soup.select(item_selector):
-                title_el = row.select_one(title_selector)
-                url_el = row.select_one(url_selector)
-                if not title_el or not url_el:
-                    continue
-                base_url = source.config.get("base_url") or url
-                raw_url = url_el.get("href")
-                absolute_url = urljoin(base_url, raw_url) if raw_url else None
-                items.append(
-                    {
-                        "title": title_el.get_text(strip=True),
-                        "url": absolute_url,
-                        "published_at": row.select_one(published_selector).get_text(strip=True)
-                        if published_selector
-                        else None,
-                        "summary": None,
-                        "content_type": source.config.get("content_type", "news"),
-                        "language": source.config.get("language"),
-                        "region": source.config.get("region"),
-                    }
-                )
-    return items
+            response = fetch(url)
+            if response is None:
+                unchanged += 1
+                continue
+            parsed.append(_submit_parse(parser, response, url, source))
+            last_page = (response, url)
+        if unchanged == len(list_urls):
+            raise NotModified(source.id)
+
+        listings = [future.result() for future in parsed]
+
+        seen: set[str] = set()
+        # The date half of the mark only holds for a single ordered listing.
+        by_date = stop_by_date(source, len(list_urls))
+
+        def accept(page_items: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], bool]:
+            if _exhausted(page_items, source, seen):
+                return [], True
+            kept, reached = until_high_water(page_items, source, high_water, by_date=by_date)
+            return kept, reached or _reaches_known(page_items, source, known_ids, pagination)
+
+        # Each list URL is its own newest-first listing, so the mark cuts each
+        # one separately: reaching it on one list says nothing about the next.
+        cuts = [
+            until_high_water(page_items, source, high_water, by_date=by_date)
+            for page_items in listings
+        ]
+        items = [item for kept, _ in cuts for item in kept]
+        # Routine runs stop here: paging goes on only while every item of the
+        # newest pages is new (nothing stored, high-water mark not reached).
+        more = (
+            pagination is not None
+            and not any(reached for _, reached in cuts)
+            and not any(
+                _reaches_known(page_items, source, known_ids, pagination)
+                for page_items in listings
+            )
+            and not _exhausted(items, source, seen)
+        )
+        yield from items
+        if more:
+            next_selector = pagination.get("next_selector")
+            next_url = (
+                _next_page_url(*last_page, next_selector)
+                if next_selector and last_page is not None
+                else None
+            )
+            yield from _follow_pages(fetch_page, next_url, pagination, accept)
+
+
+async def fetch_html_async(
+    source: SourceDefinition,
+    user_agent: str,
+    timeout: float,
+    max_retries: int,
+    retry_backoff: float,
+    *,
+    client: httpx.AsyncClient | None = None,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    cache: CacheScope | None = None,
+    parser: ParsePool | None = None,
+    known_ids: Container[str] | None = None,
+    high_water: HighWaterMark | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    if not _has_selectors(source):
+        logging.warning("HTML source %s missing selector config", source.id)
+        return
+
+    headers = {"User-Agent": user_agent}
+    list_urls = source.config["list_urls"]
+    pagination = _pagination(source)
+
+    async def fetch(url: str) -> httpx.Response | None:
+        started = time.perf_counter()
+        response = await fetch_response_async(
+            http,
+            url,
+            headers,
+            timeout,
+            max_retries,
+            retry_backoff,
+            limiter=limiter,
+            retry=retry,
+            cache=cache,
+        )
+        if parser is not None:
+            parser.timings.add("fetch", time.perf_counter() - started)
+        return response
+
+    async def fetch_page(url: str) -> tuple[Future, httpx.Response] | None:
+        response = await fetch(url)
+        if response is None:
+            return None
+        return _submit_parse(parser, response, url, source), response
+
+    async def follow_page(url: str) -> Page | None:
+        try:
+            page = await fetch_page(url)
+        except RuntimeError as exc:
+            logging.warning("Stop paging %s at %s: %s", source.id, url, exc)
+            return None
+        if page is None:
+            return None
+        future, response = page
+        next_selector = pagination.get("next_selector")
+        return (
+            await asyncio.wrap_future(future),
+            _next_page_url(response, url, next_selector) if next_selector else None,
+        )
+
+    async with use_async_client(client) as http:
+        pages = await asyncio.gather(*(fetch_page(url) for url in list_urls))
+        if all(page is None for page in pages):
+            raise NotModified(source.id)
+
+        listings = [
+            await asyncio.wrap_future(page[0]) for page in pages if page is not None
+        ]
+
+        seen: set[str] = set()
+        # The date half of the mark only holds for a single ordered listing.
+        by_date = stop_by_date(source, len(list_urls))
+
+        def accept(page_items: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], bool]:
+            if _exhausted(page_items, source, seen):
+                return [], True
+            kept, reached = until_high_water(page_items, source, high_water, by_date=by_date)
+            return kept, reached or _reaches_known(page_items, source, known_ids, pagination)
+
+        # Each list URL is its own newest-first listing, so the mark cuts each
+        # one separately: reaching it on one list says nothing about the next.
+        cuts = [
+            until_high_water(page_items, source, high_water, by_date=by_date)
+            for page_items in listings
+        ]
+        items = [item for kept, _ in cuts for item in kept]
+        # Routine runs stop here: paging goes on only while every item of the
+        # newest pages is new (nothing stored, high-water mark not reached).
+        more = (
+            pagination is not None
+            and not any(reached for _, reached in cuts)
+            and not any(
+                _reaches_known(page_items, source, known_ids, pagination)
+                for page_items in listings
+            )
+            and not _exhausted(items, source, seen)
+        )
+        for item in items:
+            yield item
+        if more:
+            next_selector = pagination.get("next_selector")
+            last_page = next(
+                ((page[1], url) for page, url in zip(reversed(pages), reversed(list_urls)) if page),
+                None,
+            )
+            next_url = (
+                _next_page_url(*last_page, next_selector)
+                if next_selector and last_page is not None
+                else None
+            )
+            async for item in _follow_pages_async(follow_page, next_url, pagination, accept):
+                yield item
@@ -1,13 +1,242 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from io import BytesIO
+from typing import Any, AsyncIterator, Container, Iterator
+from urllib.parse import urljoin
 
 import httpx
 import feedparser
+from feedparser.mixin import _FeedParserMixin
+from feedparser.sanitizer import _sanitize_html
+from feedparser.urls import resolve_relative_uris
+from lxml import etree
 
+from ..high_water import HighWaterMark, stop_by_date, until_high_water
+from ..http_cache import CacheScope, NotModified
+from ..http_client import use_async_client, use_client
 from ..models import SourceDefinition
-from ..utils import fetch_text
+from ..ratelimit import HostRateLimiter
+from ..retry import RetryPolicy
+from ..utils import fetch_response, fetch_response_async, news_item_id
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_DCTERMS = "{http://purl.org/dc/terms/}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+_RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+
+# RSS 2.0 items, RSS 1.0 (RDF) items and Atom entries.
+_ENTRY_TAGS = ("item", _RSS1 + "item", _ATOM + "entry")
+# Entry child -> field, following feedparser's element mapping; the first
+# non-empty value of each field wins.
+_ENTRY_FIELDS = {
+    "title": "title",
+    _RSS1 + "title": "title",
+    _ATOM + "title": "title",
+    _DC + "title": "title",
+    "link": "link",
+    _RSS1 + "link": "link",
+    "guid": "id",
+    _ATOM + "id": "id",
+    "pubDate": "published",
+    _ATOM + "published": "published",
+    _DCTERMS + "issued": "published",
+    _ATOM + "updated": "updated",
+    _DC + "date": "updated",
+    _DCTERMS + "modified": "updated",
+    "description": "summary",
+    _RSS1 + "description": "summary",
+    _ATOM + "summary": "summary",
+    _DC + "description": "summary",
+    _CONTENT + "encoded": "content",
+    _ATOM + "content": "content",
+}
+
+
+def _entry_text(element: Any) -> str:
+    if len(element) == 0:
+        return (element.text or "").strip()
+    # Inline markup (Atom type="xhtml", unescaped HTML in a description) is
+    # kept as HTML, as feedparser does.
+    container = element
+    if element.get("type") == "xhtml" and len(element) == 1:
+        container = element[0]
+    for node in container.iter():
+        if isinstance(node.tag, str) and node.tag.startswith("{"):
+            node.tag = etree.QName(node).localname
+    # Moved under a new element, the children no longer inherit the feed's
+    # xmlns declarations, which tostring would otherwise write out on them.
+    holder = etree.Element("div")
+    holder.extend(list(container))
+    inner = (container.text or "") + "".join(
+        etree.tostring(child, method="html", encoding="unicode", with_tail=True)
+        for child in holder
+    )
+    return inner.strip()
+
+
+_HTML_TYPES = ("html", "xhtml", "text/html", "application/xhtml+xml")
+# Fields feedparser sanitizes when they hold HTML.
+_MARKUP_FIELDS = ("title", "summary", "content")
+
+
+def _is_html(atom_type: str | None, field: str, value: str) -> bool:
+    # feedparser's content types: Atom text constructs follow their ``type``
+    # (plain text by default), RSS descriptions are HTML and other RSS text is
+    # HTML only when it looks like it.
+    if atom_type is not None:
+        return atom_type in _HTML_TYPES
+    if field in ("summary", "content"):
+        return True
+    return _FeedParserMixin.looks_like_html(value)
+
+
+def _clean_html(value: str, base: str | None) -> str:
+    # What feedparser does to embedded markup: resolve relative URIs against
+    # xml:base, then sanitize.
+    if base:
+        value = resolve_relative_uris(value, base, "utf-8", "text/html")
+    return _sanitize_html(value, "utf-8", "text/html")
+
+
+def _entry_fields(entry: Any) -> dict[str, str]:
+    """Entry fields as feedparser reports them.
+
+    Relative links resolve only against xml:base (feedparser never sees the
+    feed URL, so they stay relative otherwise) and HTML text goes through
+    feedparser's URI resolver and sanitizer; the ids of stored items then do
+    not depend on the engine.
+    """
+    fields: dict[str, str] = {}
+    about = entry.get(_RDF_ABOUT)
+    if about:
+        fields["id"] = about
+    for child in entry:
+        tag = child.tag
+        if tag == _ATOM + "link":
+            if child.get("rel", "alternate") == "alternate" and "link" not in fields:
+                href = (child.get("href") or "").strip()
+                if href:
+                    fields["link"] = href
+            continue
+        field = _ENTRY_FIELDS.get(tag) if isinstance(tag, str) else None
+        if field is None or field in fields:
+            continue
+        # Read before _entry_text strips the namespaces off the element.
+        atom_type = child.get("type", "text") if tag.startswith(_ATOM) else None
+        base = child.base
+        value = _entry_text(child)
+        if value and field in _MARKUP_FIELDS and _is_html(atom_type, field, value):
+            value = _clean_html(value, base)
+        if value:
+            fields[field] = value
+    link = fields.get("link")
+    if link and "://" not in link and entry.base:
+        fields["link"] = urljoin(entry.base, link)
+    return fields
+
+
+class _NotParsed(Exception):
+    """lxml could not read the feed; feedparser takes over."""
+
+
+def _iter_feed_lxml(
+    content: bytes,
+    feed_url: str,
+    source: SourceDefinition,
+    known_ids: Container[str] | None,
+    high_water: HighWaterMark | None,
+    by_date: bool,
+) -> Iterator[dict[str, Any]]:
+    """Yield entries as ``iterparse`` reads them; ``_NotParsed`` when lxml cannot parse the feed.
+
+    Only the five fields the pipeline uses are extracted. The walk stops at the
+    high-water item; with ``stop_when_known: true`` it also stops at the first
+    entry already stored, which only suits feeds that never pin or re-surface
+    old entries above new ones.
+    """
+    if known_ids is None or not source.config.get("stop_when_known", False):
+        known_ids = ()
+    entries = 0
+    try:
+        for _, entry in etree.iterparse(
+            BytesIO(content),
+            events=("end",),
+            tag=_ENTRY_TAGS,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        ):
+            entries += 1
+            fields = _entry_fields(entry)
+            # Entries are dropped once read, so memory stays flat on long feeds.
+            entry.clear()
+            parent = entry.getparent()
+            while entry.getprevious() is not None:
+                del parent[0]
+            url = fields.get("link") or fields.get("id")
+            item = {
+                "title": fields.get("title"),
+                "url": url,
+                "published_at": fields.get("published") or fields.get("updated"),
+                "summary": fields.get("summary") or fields.get("content"),
+                "content_type": source.config.get("content_type", "news"),
+                "language": source.config.get("language"),
+                "region": source.config.get("region"),
+            }
+            if (known_ids and news_item_id(source.id, url) in known_ids) or (
+                high_water is not None and high_water.reached(source, item, by_date=by_date)
+            ):
+                return
+            yield item
+    except etree.XMLSyntaxError as exc:
+        raise _NotParsed(f"not well-formed XML ({exc})") from exc
+    if not entries:
+        # Nothing recognised (RSS 0.9x namespaces, odd roots): let feedparser try.
+        raise _NotParsed("no entries recognised")
+
+
+def _parse_feed(
+    response: httpx.Response,
+    feed_url: str,
+    source: SourceDefinition,
+    known_ids: Container[str] | None = None,
+    high_water: HighWaterMark | None = None,
+    *,
+    by_date: bool = False,
+) -> Iterator[dict[str, Any]]:
+    yielded: set[str | None] = set()
+    if source.config.get("engine") == "lxml":
+        try:
+            for item in _iter_feed_lxml(
+                response.content, feed_url, source, known_ids, high_water, by_date
+            ):
+                yielded.add(item["url"])
+                yield item
+            return
+        except _NotParsed as exc:
+            logging.info("Feed %s: %s; using feedparser", feed_url, exc)
+    parsed = feedparser.parse(response.text)
+    items: list[dict[str, Any]] = []
+    for entry in parsed.entries:
+        items.append(
+            {
+                "title": entry.get("title"),
+                "url": entry.get("link") or entry.get("id"),
+                "published_at": entry.get("published") or entry.get("updated"),
+                "summary": entry.get("summary"),
+                "content_type": source.config.get("content_type", "news"),
+                "language": source.config.get("language"),
+                "region": source.config.get("region"),
+            }
+        )
+    # A feed that broke half-way resumes after the entries lxml already yielded.
+    for item in until_high_water(items, source, high_water, by_date=by_date)[0]:
+        if item["url"] not in yielded:
+            yield item
 
 
 def fetch_rss(
@@ -16,28 +245,97 @@ def fetch_rss(
     timeout: float,
     max_retries: int,
     retry_backoff: float,
-) -> list[dict[str, Any]]:
+    *,
+    client: httpx.Client | None = None,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    cache: CacheScope | None = None,
+    known_ids: Container[str] | None = None,
+    high_water: HighWaterMark | None = None,
+) -> Iterator[dict[str, Any]]:
     feed_urls = source.config.get("feed_urls") or []
     if not feed_urls:
         logging.warning("RSS source %s missing feed_urls", source.id)
-        return []
+        return
 
-    items: list[dict[str, Any]] = []
     headers = {"User-Agent": user_agent}
-    with httpx.Client() as client:
+    unchanged = 0
+    with use_client(client) as http:
         for url in feed_urls:
-            content = fetch_text(client, url, headers, timeout, max_retries, retry_backoff)
-            parsed = feedparser.parse(content)
-            for entry in parsed.entries:
-                items.append(
-                    {
-                        "title": entry.get("title"),
-                        "url": entry.get("link") or entry.get("id"),
-                        "published_at": entry.get("published") or entry.get("updated"),
-                        "summary": entry.get("summary"),
-                        "content_type": source.config.get("content_type", "news"),
-                        "language": source.config.get("language"),
-                        "region": source.config.get("region"),
-                    }
+            response = fetch_response(
+                http,
+                url,
+                headers,
+                timeout,
+                max_retries,
+                retry_backoff,
+                limiter=limiter,
+                retry=retry,
+                cache=cache,
+            )
+            if response is None:
+                unchanged += 1
+                continue
+            yield from _parse_feed(
+                response, url, source, known_ids, high_water, by_date=stop_by_date(source, len(feed_urls))
+            )
+    if unchanged == len(feed_urls):
+        raise NotModified(source.id)
+
+
+async def fetch_rss_async(
+    source: SourceDefinition,
+    user_agent: str,
+    timeout: float,
+    max_retries: int,
+    retry_backoff: float,
+    *,
+    client: httpx.AsyncClient | None = None,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    cache: CacheScope | None = None,
+    known_ids: Container[str] | None = None,
+    high_water: HighWaterMark | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    feed_urls = source.config.get("feed_urls") or []
+    if not feed_urls:
+        logging.warning("RSS source %s missing feed_urls", source.id)
+        return
+
+    headers = {"User-Agent": user_agent}
+    unchanged = 0
+    async with use_async_client(client) as http:
+        # All feeds download together; entries are yielded in feed order as
+        # each download completes.
+        downloads = [
+            asyncio.ensure_future(
+                fetch_response_async(
+                    http,
+                    url,
+                    headers,
+                    timeout,
+                    max_retries,
+                    retry_backoff,
+                    limiter=limiter,
+                    retry=retry,
+                    cache=cache,
                 )
-    return items
+            )
+            for url in feed_urls
+        ]
+        try:
+            for url, download in zip(feed_urls, downloads):
+                response = await download
+                if response is None:
+                    unchanged += 1
+                    continue
+                for item in _parse_feed(
+                    response, url, source, known_ids, high_water, by_date=stop_by_date(source, len(feed_urls))
+                ):
+                    yield item
+        finally:
+            for download in downloads:
+                download.cancel()
+            await asyncio.gather(*downloads, return_exceptions=True)
+    if unchanged == len(feed_urls):
+        raise NotModified(source.id)
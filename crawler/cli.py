@@ -1,12 +1,26 @@
 from __future__ import annotations
 
 import argparse
+import cProfile
+import io
 import logging
+import pstats
+from pathlib import Path
 
-from .pipeline import crawl
+from .pipeline import compact, crawl, export, migrate
 from .validator import validate
 
 
+def _dump_profile(profiler: cProfile.Profile, path: str) -> None:
+    # Inspect further with `python -m pstats PATH` or snakeviz; parse worker
+    # processes are not profiled.
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path)
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(25)
+    logging.info("Profile written to %s\n%s", path, report.getvalue())
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="PolicyPulse crawler CLI")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -14,15 +28,75 @@ def main() -> None:
     crawl_parser = subparsers.add_parser("crawl", help="Fetch and update news data")
     crawl_parser.add_argument("--data", default="data/news.jsonl", help="Path to news.jsonl")
     crawl_parser.add_argument("--index", default="data/index.json", help="Path to index.json")
+    crawl_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Fetch up to N sources at once (async mode); defaults to settings.concurrency",
+    )
+    crawl_parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Parse HTML pages in N worker processes; defaults to settings.parse_workers",
+    )
+    crawl_parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="crawl.prof",
+        default=None,
+        metavar="PATH",
+        help="Run under cProfile, dump pstats to PATH (default crawl.prof) and log the top calls",
+    )
+
+    compact_parser = subparsers.add_parser(
+        "compact", help="Sort, apply retention and rebuild sidecars of an incremental store"
+    )
+    compact_parser.add_argument("--data", default="data/news.jsonl", help="Path to news.jsonl")
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export the SQLite store to news.jsonl for the site"
+    )
+    export_parser.add_argument("--data", default="data/news.jsonl", help="Path to news.jsonl")
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Split news.jsonl into monthly partitions (data/news/YYYY/MM.jsonl)"
+    )
+    migrate_parser.add_argument("--data", default="data/news.jsonl", help="Path to news.jsonl")
 
     validate_parser = subparsers.add_parser("validate", help="Validate data schema")
     validate_parser.add_argument("--data", default="data/news.jsonl", help="Path to news.jsonl")
+    validate_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Validate byte ranges of the file in this many processes",
+    )
 
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
     if args.command == "crawl":
-        crawl(data_path=args.data, index_path=args.index)
+        profiler = cProfile.Profile() if args.profile else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            crawl(
+                data_path=args.data,
+                index_path=args.index,
+                concurrency=args.concurrency,
+                parse_workers=args.parse_workers,
+            )
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _dump_profile(profiler, args.profile)
+    elif args.command == "compact":
+        compact(data_path=args.data)
+    elif args.command == "export":
+        export(data_path=args.data)
+    elif args.command == "migrate":
+        migrate(data_path=args.data)
     elif args.command == "validate":
-        validate(data_path=args.data)
+        validate(data_path=args.data, workers=args.workers)
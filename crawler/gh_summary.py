@@ -4,6 +4,9 @@ import json
 import sys
 from pathlib import Path
 
+# Keys of a source's ``timings`` that come from the HTTP traces (see http_client).
+_NETWORK_PHASES = ("connect", "tls", "send", "wait", "transfer")
+
 
 def _print_per_source_stats(stats: dict) -> None:
     if not stats:
@@ -12,14 +15,18 @@ def _print_per_source_stats(stats: dict) -> None:
 
     print("\nPer-source stats:")
     print(
-        "| Source | Fetched | New | Skipped | Status | Failure Streak | Zero New Streak | Last Run |"
+        "| Source | Fetched | New | Skipped | Status | Failure Streak | Zero New Streak | Last Run "
+        "| Network (s) | Wait (s) | Parse (s) | Normalize (s) | Dedup (s) |"
     )
-    print("| --- | ---: | ---: | ---: | --- | ---: | ---: | --- |")
+    print("| --- | ---: | ---: | ---: | --- | ---: | ---: | --- | ---: | ---: | ---: | ---: | ---: |")
 
     for source_id in sorted(stats):
         info = stats.get(source_id) or {}
+        timings = info.get("timings") or {}
+        network = sum(timings.get(phase, 0) for phase in _NETWORK_PHASES)
         print(
-            "| {source} | {fetched} | {new} | {skipped} | {status} | {failure} | {zero_new} | {last_run} |".format(
+            "| {source} | {fetched} | {new} | {skipped} | {status} | {failure} | {zero_new} | {last_run} "
+            "| {network} | {wait} | {parse} | {normalize} | {dedup} |".format(
                 source=source_id,
                 fetched=info.get("fetched", 0),
                 new=info.get("new", 0),
@@ -28,10 +35,93 @@ def _print_per_source_stats(stats: dict) -> None:
                 failure=info.get("failure_streak", 0),
                 zero_new=info.get("zero_new_streak", 0),
                 last_run=info.get("last_run", ""),
+                network=round(network, 3),
+                wait=timings.get("wait", 0),
+                parse=timings.get("parse", 0),
+                normalize=timings.get("normalize", 0),
+                dedup=timings.get("dedup", 0),
+            )
+        )
+
+
+def _print_run_stats(run: dict) -> None:
+    if not run:
+        return
+
+    print(
+        "\nRun: wall={wall}s peak_rss={rss}MB storage_load={load}s storage_write={write}s".format(
+            wall=run.get("wall_sec", 0),
+            rss=run.get("peak_rss_mb") if run.get("peak_rss_mb") is not None else "-",
+            load=run.get("storage_load_sec", 0),
+            write=run.get("storage_write_sec", 0),
+        )
+    )
+
+
+def _print_slowest_urls(urls: dict, limit: int = 10) -> None:
+    if not urls:
+        return
+
+    def total(info: dict) -> float:
+        return sum(info.get(phase, 0) for phase in _NETWORK_PHASES)
+
+    print(f"\nSlowest URLs (top {limit}):")
+    print("| URL | Source | Requests | Connect (s) | TLS (s) | Wait (s) | Transfer (s) |")
+    print("| --- | --- | ---: | ---: | ---: | ---: | ---: |")
+
+    for url, info in sorted(urls.items(), key=lambda pair: total(pair[1]), reverse=True)[:limit]:
+        print(
+            "| {url} | {source} | {requests} | {connect} | {tls} | {wait} | {transfer} |".format(
+                url=url,
+                source=info.get("source") or "",
+                requests=info.get("requests", 0),
+                connect=info.get("connect", 0),
+                tls=info.get("tls", 0),
+                wait=info.get("wait", 0),
+                transfer=info.get("transfer", 0),
             )
         )
 
 
+def _print_host_stats(hosts: dict) -> None:
+    if not hosts:
+        return
+
+    print("\nPer-host rate limiting:")
+    print("| Host | Requests | Wait (s) | Max Wait (s) |")
+    print("| --- | ---: | ---: | ---: |")
+
+    for host in sorted(hosts):
+        info = hosts.get(host) or {}
+        print(
+            "| {host} | {requests} | {wait} | {max_wait} |".format(
+                host=host,
+                requests=info.get("requests", 0),
+                wait=info.get("wait_sec", 0),
+                max_wait=info.get("max_wait_sec", 0),
+            )
+        )
+
+
+def _print_http_stats(http: dict) -> None:
+    if not http:
+        return
+
+    versions = ", ".join(
+        f"{version}={count}" for version, count in (http.get("http_versions") or {}).items()
+    )
+    print(
+        "\nHTTP: requests={requests} new_connections={new} reused_connections={reused} "
+        "tls_handshakes={tls} versions={versions}".format(
+            requests=http.get("requests", 0),
+            new=http.get("new_connections", 0),
+            reused=http.get("reused_connections", 0),
+            tls=http.get("tls_handshakes", 0),
+            versions=versions or "-",
+        )
+    )
+
+
 def _print_alerts(alerts: list[dict]) -> None:
     if not alerts:
         return
@@ -62,8 +152,13 @@ def main(argv: list[str]) -> int:
         print("\nindex.json is not valid JSON.")
         return 0
 
-    stats = payload.get("last_run", {}).get("sources", {}) or {}
+    last_run = payload.get("last_run", {}) or {}
+    stats = last_run.get("sources", {}) or {}
     _print_per_source_stats(stats)
+    _print_run_stats(last_run.get("run", {}) or {})
+    _print_slowest_urls(last_run.get("urls", {}) or {})
+    _print_host_stats(last_run.get("hosts", {}) or {})
+    _print_http_stats(last_run.get("http", {}) or {})
 
     alerts = payload.get("alerts", []) or []
     _print_alerts(alerts)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .models import SourceDefinition
+from .utils import news_item_id, parse_datetime, published_timezone
+
+
+@dataclass(frozen=True)
+class HighWaterMark:
+    """Newest item stored for a source, kept in its ``index.json`` state.
+
+    Sources list their newest items first, so an adapter can stop at the item
+    with this ``id``. Stopping at the first item published before
+    ``published_at`` as well is opt-in (see ``stop_by_date``): a pinned or
+    out-of-order older item at the top of a list would hide everything newer
+    below it.
+    """
+
+    published_at: str
+    id: str
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any] | None) -> HighWaterMark | None:
+        if not state or not state.get("published_at") or not state.get("id"):
+            return None
+        return cls(published_at=state["published_at"], id=state["id"])
+
+    def as_state(self) -> dict[str, str]:
+        return {"published_at": self.published_at, "id": self.id}
+
+    @classmethod
+    def advance(
+        cls, mark: HighWaterMark | None, items: Iterable[dict[str, Any]], now: str
+    ) -> HighWaterMark | None:
+        """``mark`` moved up to the newest of the normalized ``items``.
+
+        Items dated ``now`` or later are ignored: that is the fallback for
+        missing or unparseable dates (or a typo), and a mark in the future
+        would cut off every item of the next run.
+        """
+        for item in items:
+            published_at = item["published_at"]
+            if published_at < now and (mark is None or published_at > mark.published_at):
+                mark = cls(published_at=published_at, id=item["id"])
+        return mark
+
+    def reached(
+        self, source: SourceDefinition, raw: dict[str, Any], *, by_date: bool = False
+    ) -> bool:
+        if news_item_id(source.id, raw.get("url")) == self.id:
+            logging.info("Source %s reached its high-water item %s", source.id, raw.get("url"))
+            return True
+        if not by_date or not raw.get("published_at"):
+            return False
+        try:
+            published_at = parse_datetime(
+                raw["published_at"],
+                default_timezone=published_timezone(source.config),
+                fmt=source.config.get("published_format"),
+            )
+        except Exception:
+            return False
+        if published_at >= self.published_at:
+            return False
+        logging.info(
+            "Source %s reached its high-water date at %s (%s < %s)",
+            source.id,
+            raw.get("url"),
+            published_at,
+            self.published_at,
+        )
+        return True
+
+
+def stop_by_date(source: SourceDefinition, listings: int) -> bool:
+    """Whether ``source`` also stops at items older than its mark.
+
+    Only for sources that opt in with ``high_water_by_date: true``, and only
+    when they read a single ordered listing (one list URL, feed or param set).
+    """
+    return bool(source.config.get("high_water_by_date", False)) and listings == 1
+
+
+def until_high_water(
+    items: list[dict[str, Any]],
+    source: SourceDefinition,
+    mark: HighWaterMark | None,
+    *,
+    by_date: bool = False,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Raw ``items`` before the first one at or below ``mark``, and whether it was reached."""
+    if mark is None:
+        return items, False
+    for position, raw in enumerate(items):
+        if mark.reached(source, raw, by_date=by_date):
+            return items[:position], True
+    return items, False
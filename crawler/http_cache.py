@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+
+class NotModified(Exception):
+    """Raised by an adapter when none of its URLs changed since the last run."""
+
+
+class ValidatorCache:
+    """On-disk ETag / Last-Modified / body hash per URL, used for conditional GETs."""
+
+    def __init__(self, path: Path, entries: dict[str, dict[str, Any]] | None = None) -> None:
+        self.path = path
+        self.entries = entries or {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> ValidatorCache:
+        entries: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            try:
+                with path.open("r", encoding="utf-8") as handle:
+                    entries = json.load(handle)
+            except (OSError, json.JSONDecodeError):
+                entries = {}
+        return cls(path, entries)
+
+    def scope(self) -> CacheScope:
+        return CacheScope(self)
+
+    def update(self, entries: dict[str, dict[str, Any]]) -> None:
+        for url, entry in entries.items():
+            if self.entries.get(url) != entry:
+                self.entries[url] = entry
+                self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8") as handle:
+            json.dump(self.entries, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        self._dirty = False
+
+
+class CacheScope:
+    """Validators staged while fetching one source.
+
+    They only reach the shared cache through ``commit`` once the source has been
+    processed, so a failure half-way through never marks a page as already seen.
+    """
+
+    def __init__(self, cache: ValidatorCache) -> None:
+        self.cache = cache
+        self.pending: dict[str, dict[str, Any]] = {}
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        entry = self.cache.entries.get(url) or {}
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, url: str, response: httpx.Response) -> bool:
+        """Stage validators for ``response``; return False when the body is unchanged."""
+        previous = self.cache.entries.get(url) or {}
+        if response.status_code == 304:
+            self.pending[url] = previous
+            return False
+        digest = hashlib.sha256(response.content).hexdigest()
+        self.pending[url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": digest,
+        }
+        return previous.get("sha256") != digest
+
+    def commit(self) -> None:
+        self.cache.update(self.pending)
+        self.pending = {}
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import importlib.util
+import threading
+import time
+from contextlib import AbstractAsyncContextManager, AbstractContextManager, nullcontext
+from typing import Any, Callable
+
+import httpx
+
+from .parsing import current_source
+
+
+# httpcore trace events (``<name>.started`` / ``.complete``) timed per request.
+# httpcore resolves the host inside connect_tcp, so "connect" includes DNS.
+_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http11.send_request_body": "send",
+    "http11.receive_response_headers": "wait",
+    "http11.receive_response_body": "transfer",
+    "http2.send_request_headers": "send",
+    "http2.send_request_body": "send",
+    "http2.receive_response_headers": "wait",
+    "http2.receive_response_body": "transfer",
+}
+PHASES = ("connect", "tls", "send", "wait", "transfer")
+
+
+class ConnectionStats:
+    """Counts requests against new TCP connections / TLS handshakes via httpcore traces.
+
+    The same traces time each request's phases, summed per URL (query string
+    dropped, so API pages share an entry) and per ``current_source``.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.http_versions: dict[str, int] = {}
+        self.urls: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self.tracer(request)
+
+    def on_response(self, response: httpx.Response) -> None:
+        with self._lock:
+            version = response.http_version
+            self.http_versions[version] = self.http_versions.get(version, 0) + 1
+
+    def tracer(self, request: httpx.Request) -> Callable[[str, dict[str, Any]], None]:
+        url = str(request.url.copy_with(query=None, fragment=None))
+        source = current_source.get()
+        started: dict[str, float] = {}
+        with self._lock:
+            entry = self.urls.setdefault(url, {"source": source, "requests": 0})
+            entry["requests"] += 1
+
+        def trace(event_name: str, info: dict[str, Any]) -> None:
+            name, _, event = event_name.rpartition(".")
+            if event == "started":
+                started[name] = time.perf_counter()
+                return
+            phase = _PHASES.get(name)
+            begun = started.pop(name, None)
+            with self._lock:
+                if event_name == "connection.connect_tcp.complete":
+                    self.new_connections += 1
+                elif event_name == "connection.start_tls.complete":
+                    self.tls_handshakes += 1
+                if phase is not None and begun is not None:
+                    entry[phase] = entry.get(phase, 0.0) + time.perf_counter() - begun
+
+        return trace
+
+    async def on_request_async(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+        trace = self.tracer(request)
+
+        async def trace_async(event_name: str, info: dict[str, Any]) -> None:
+            trace(event_name, info)
+
+        request.extensions["trace"] = trace_async
+
+    async def on_response_async(self, response: httpx.Response) -> None:
+        self.on_response(response)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": max(0, self.requests - self.new_connections),
+                "tls_handshakes": self.tls_handshakes,
+                "http_versions": dict(sorted(self.http_versions.items())),
+            }
+
+    def url_snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                url: {
+                    key: round(value, 3) if isinstance(value, float) else value
+                    for key, value in entry.items()
+                }
+                for url, entry in sorted(self.urls.items())
+            }
+
+    def source_snapshot(self, source: str) -> dict[str, float]:
+        """Network phase seconds summed over the source's URLs."""
+        totals: dict[str, float] = {}
+        with self._lock:
+            for entry in self.urls.values():
+                if entry["source"] != source:
+                    continue
+                for phase in PHASES:
+                    if phase in entry:
+                        totals[phase] = totals.get(phase, 0.0) + entry[phase]
+        return {phase: round(value, 3) for phase, value in totals.items()}
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _client_options(settings: dict[str, Any]) -> dict[str, Any]:
+    http = settings.get("http") or {}
+    limits = httpx.Limits(
+        max_connections=int(http.get("max_connections", 20)),
+        max_keepalive_connections=int(http.get("max_keepalive_connections", 10)),
+        keepalive_expiry=float(http.get("keepalive_expiry_sec", 30)),
+    )
+    return {
+        "limits": limits,
+        "http2": bool(http.get("http2", True)) and http2_available(),
+    }
+
+
+def build_client(settings: dict[str, Any], stats: ConnectionStats | None = None) -> httpx.Client:
+    event_hooks: dict[str, list[Any]] = {}
+    if stats is not None:
+        event_hooks = {"request": [stats.on_request], "response": [stats.on_response]}
+    return httpx.Client(event_hooks=event_hooks, **_client_options(settings))
+
+
+def build_async_client(
+    settings: dict[str, Any], stats: ConnectionStats | None = None
+) -> httpx.AsyncClient:
+    event_hooks: dict[str, list[Any]] = {}
+    if stats is not None:
+        event_hooks = {
+            "request": [stats.on_request_async],
+            "response": [stats.on_response_async],
+        }
+    return httpx.AsyncClient(event_hooks=event_hooks, **_client_options(settings))
+
+
+def use_client(client: httpx.Client | None) -> AbstractContextManager[httpx.Client]:
+    # Borrow the shared client when the pipeline passes one (without closing it),
+    # otherwise fall back to a short-lived client for standalone adapter calls.
+    return nullcontext(client) if client is not None else httpx.Client()
+
+
+def use_async_client(
+    client: httpx.AsyncClient | None,
+) -> AbstractAsyncContextManager[httpx.AsyncClient]:
+    return nullcontext(client) if client is not None else httpx.AsyncClient()
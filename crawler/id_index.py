@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DIGEST_SIZE = 32
+_MAGIC = b"PPIDX001"
+# magic, size of the corpus file the index describes, record count; padded to
+# one record so digests stay 32-byte aligned.
+_HEADER = struct.Struct("<8sQQ8x")
+
+
+def id_digest(item_id: str) -> bytes:
+    try:
+        digest = bytes.fromhex(item_id)
+    except ValueError:
+        digest = b""
+    if len(digest) != DIGEST_SIZE:
+        digest = hashlib.sha256(item_id.encode("utf-8")).digest()
+    return digest
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, bits_per_item: int = 10) -> None:
+        self.size = max(64, capacity * bits_per_item)
+        # Each probe uses 4 bytes of the (already uniform) sha256 digest.
+        self.hashes = min(DIGEST_SIZE // 4, max(1, round(bits_per_item * 0.693)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes) -> Iterator[int]:
+        for probe in range(self.hashes):
+            yield int.from_bytes(digest[probe * 4 : probe * 4 + 4], "little") % self.size
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(digest)
+        )
+
+
+class _Records:
+    """Sequence view over the sorted digests of a mapped index file, for bisect."""
+
+    def __init__(self, mm: mmap.mmap, count: int) -> None:
+        self.mm = mm
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, position: int) -> bytes:
+        offset = DIGEST_SIZE * (position + 1)
+        return self.mm[offset : offset + DIGEST_SIZE]
+
+
+class IdIndex:
+    """Persistent set of item ids that is queried without loading the corpus.
+
+    ``<path>`` holds sorted 32-byte sha256 digests behind a small header and is
+    searched in place through mmap + bisect, so opening it costs the same for a
+    thousand or a million ids. New ids go to an unsorted ``<path>.tail`` file
+    (loaded into memory) and are merged into the sorted file once the tail grows
+    past a fraction of it; discarded ids are left out by the next merge. An
+    optional Bloom filter answers most misses without touching the mapped file,
+    at the price of one scan when the index is opened.
+    """
+
+    def __init__(self, path: Path, *, bloom_bits_per_item: int = 0) -> None:
+        self.path = path
+        self.tail_path = path.with_name(path.name + ".tail")
+        self.bloom_bits_per_item = bloom_bits_per_item
+        self.source_size: int | None = None
+        self._handle = None
+        self._mm: mmap.mmap | None = None
+        self._records: _Records | None = None
+        self._tail: set[bytes] = set()
+        self._unsaved: list[bytes] = []
+        self._discarded: set[bytes] = set()
+        self._bloom: BloomFilter | None = None
+
+    def open(self) -> IdIndex:
+        self.close()
+        self.source_size = None
+        self._tail = set()
+        self._unsaved = []
+        self._discarded = set()
+        if not self.path.exists() or self.path.stat().st_size < _HEADER.size:
+            return self
+        handle = self.path.open("rb")
+        magic, source_size, count = _HEADER.unpack(handle.read(_HEADER.size))
+        if magic != _MAGIC or self.path.stat().st_size != DIGEST_SIZE * (count + 1):
+            handle.close()
+            return self
+        self.source_size = source_size
+        self._handle = handle
+        self._mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._records = _Records(self._mm, count)
+        if self.tail_path.exists():
+            raw = self.tail_path.read_bytes()
+            usable = len(raw) - len(raw) % DIGEST_SIZE
+            self._tail = {
+                raw[offset : offset + DIGEST_SIZE] for offset in range(0, usable, DIGEST_SIZE)
+            }
+        if self.bloom_bits_per_item > 0:
+            self._bloom = BloomFilter(count, self.bloom_bits_per_item)
+            for position in range(count):
+                self._bloom.add(self._records[position])
+        return self
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._records = None
+        self._bloom = None
+
+    def __len__(self) -> int:
+        on_disk = len(self._records) if self._records is not None else 0
+        return on_disk + len(self._tail)
+
+    def _on_disk(self, digest: bytes) -> bool:
+        records = self._records
+        if records is None or not len(records):
+            return False
+        if self._bloom is not None and digest not in self._bloom:
+            return False
+        position = bisect.bisect_left(records, digest)
+        return position < len(records) and records[position] == digest
+
+    def __contains__(self, item_id: object) -> bool:
+        if not isinstance(item_id, str):
+            return False
+        digest = id_digest(item_id)
+        if digest in self._discarded:
+            return False
+        return digest in self._tail or self._on_disk(digest)
+
+    def add(self, item_id: str) -> None:
+        digest = id_digest(item_id)
+        self._discarded.discard(digest)
+        if digest in self._tail or self._on_disk(digest):
+            return
+        self._tail.add(digest)
+        self._unsaved.append(digest)
+
+    def discard(self, item_ids: Iterable[str]) -> None:
+        self._discarded.update(id_digest(item_id) for item_id in item_ids)
+
+    def save(self, source_size: int) -> None:
+        """Persist added and discarded ids and record the corpus size they now describe."""
+        on_disk = len(self._records) if self._records is not None else 0
+        if (
+            self._records is None
+            or self._discarded
+            or len(self._tail) > max(1024, on_disk // 16)
+        ):
+            self._merge(source_size)
+            return
+        if self._unsaved:
+            with self.tail_path.open("ab") as handle:
+                handle.write(b"".join(self._unsaved))
+            self._unsaved = []
+        with self.path.open("r+b") as handle:
+            handle.write(_HEADER.pack(_MAGIC, source_size, on_disk))
+        self.source_size = source_size
+
+    def rebuild(self, item_ids: Iterable[str], source_size: int) -> None:
+        self.close()
+        self._discarded = set()
+        self._tail = {id_digest(item_id) for item_id in item_ids}
+        self._merge(source_size, include_disk=False)
+
+    def _merge(self, source_size: int, *, include_disk: bool = True) -> None:
+        existing: Iterable[bytes] = ()
+        if include_disk and self._records is not None:
+            records = self._records
+            existing = (records[position] for position in range(len(records)))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        count = 0
+        previous = None
+        with tmp_path.open("wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, source_size, 0))
+            for digest in heapq.merge(existing, sorted(self._tail)):
+                if digest == previous or digest in self._discarded:
+                    continue
+                handle.write(digest)
+                previous = digest
+                count += 1
+            handle.seek(0)
+            handle.write(_HEADER.pack(_MAGIC, source_size, count))
+        self.close()
+        os.replace(tmp_path, self.path)
+        self.tail_path.unlink(missing_ok=True)
+        self.open()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Callable, Iterator
+
+try:
+    import ijson
+except ImportError:  # optional, installed with the "fast" extra
+    ijson = None
+
+# Parsed elements are handed to ``on_items`` in batches of this size.
+BATCH_SIZE = 1000
+
+
+def stream_prefix(path: str | None) -> str | None:
+    """ijson prefix of the elements of the list at a dotted ``items_path``.
+
+    None when a part is numeric: ijson prefixes cannot address one element of
+    a list, so such paths are read without streaming.
+    """
+    if not path:
+        return "item"
+    parts = path.split(".")
+    if any(part.isdigit() for part in parts):
+        return None
+    return ".".join([*parts, "item"])
+
+
+class _ChunkReader:
+    """File-like view over response chunks for ijson's C reader.
+
+    Every chunk is also sent to the scalar coroutines until each has matched,
+    so a total that precedes the list costs next to nothing; a cursor after it
+    means a second (event-level) pass over the rest of the body.
+    """
+
+    def __init__(self, stream: JsonItemStream) -> None:
+        self.stream = stream
+        self.buffer = b""
+
+    def _take(self, chunk: bytes, size: int) -> bytes:
+        self.stream._scan(chunk)
+        self.buffer = chunk[size:]
+        return chunk[:size]
+
+    def _from_buffer(self, size: int) -> bytes:
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+class _SyncChunkReader(_ChunkReader):
+    def __init__(self, stream: JsonItemStream, chunks: Iterator[bytes]) -> None:
+        super().__init__(stream)
+        self.chunks = chunks
+
+    def read(self, size: int) -> bytes:
+        if self.buffer:
+            return self._from_buffer(size)
+        for chunk in self.chunks:
+            if chunk:
+                return self._take(chunk, size)
+        return b""
+
+
+class _AsyncChunkReader(_ChunkReader):
+    def __init__(self, stream: JsonItemStream, chunks: AsyncIterator[bytes]) -> None:
+        super().__init__(stream)
+        self.chunks = chunks
+
+    async def read(self, size: int) -> bytes:
+        if self.buffer:
+            return self._from_buffer(size)
+        async for chunk in self.chunks:
+            if chunk:
+                return self._take(chunk, size)
+        return b""
+
+
+class JsonItemStream:
+    """Incremental reader that keeps only the list elements at one prefix and a few scalars.
+
+    ``read``/``read_async`` consume the response chunks. Each batch of parsed
+    elements is passed to ``on_items`` (the field mapper) and only its result
+    is kept, so memory follows the mapped output instead of the size of the
+    body. ``scalars`` holds the values found at ``scalar_paths`` (totals,
+    cursors).
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        scalar_paths: tuple[str, ...] = (),
+        on_items: Callable[[list[Any]], list[Any]] | None = None,
+    ) -> None:
+        if ijson is None:
+            raise RuntimeError("Streaming JSON requires the ijson package")
+        self.prefix = prefix
+        self.on_items = on_items
+        self.items: list[Any] = []
+        self.scalars: dict[str, Any] = {}
+        self.count = 0
+        self._targets: dict[str, list[Any]] = {}
+        self._scanners: dict[str, Any] = {}
+        for path in scalar_paths:
+            target = self._targets[path] = ijson.sendable_list()
+            self._scanners[path] = ijson.items_coro(target, path, use_float=True)
+
+    def read(self, chunks: Iterator[bytes]) -> JsonItemStream:
+        batch: list[Any] = []
+        try:
+            for item in ijson.items(
+                _SyncChunkReader(self, chunks), self.prefix, use_float=True
+            ):
+                batch.append(item)
+                if len(batch) >= BATCH_SIZE:
+                    self._flush(batch)
+                    batch = []
+            self._finish()
+        except ijson.JSONError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from exc
+        self._flush(batch)
+        return self
+
+    async def read_async(self, chunks: AsyncIterator[bytes]) -> JsonItemStream:
+        batch: list[Any] = []
+        try:
+            async for item in ijson.items(
+                _AsyncChunkReader(self, chunks), self.prefix, use_float=True
+            ):
+                batch.append(item)
+                if len(batch) >= BATCH_SIZE:
+                    self._flush(batch)
+                    batch = []
+            self._finish()
+        except ijson.JSONError as exc:
+            raise ValueError(f"Invalid JSON: {exc}") from exc
+        self._flush(batch)
+        return self
+
+    def _scan(self, chunk: bytes) -> None:
+        for path in list(self._scanners):
+            self._scanners[path].send(chunk)
+            if self._targets[path]:
+                # The first match wins; stop parsing the body for this path.
+                self.scalars[path] = self._targets[path][0]
+                del self._scanners[path]
+
+    def _flush(self, batch: list[Any]) -> None:
+        if not batch:
+            return
+        self.count += len(batch)
+        self.items.extend(self.on_items(batch) if self.on_items is not None else batch)
+
+    def _finish(self) -> None:
+        for path, scanner in self._scanners.items():
+            scanner.close()
+            if self._targets[path]:
+                self.scalars[path] = self._targets[path][0]
+        self._scanners = {}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
 from typing import Any
 
 
@@ -16,8 +17,10 @@ class SourceDefinition:
     config: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsItem:
+    """One stored news record; field order is the JSONL key order."""
+
     id: str
     source_id: str
     source_name: str
@@ -31,3 +34,36 @@ class NewsItem:
     content_type: str | None = None
     language: str | None = None
     region: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> NewsItem:
+        # Low-cardinality values are shared across the whole archive.
+        return cls(
+            data.get("id"),
+            _intern(data.get("source_id")),
+            _intern(data.get("source_name")),
+            data.get("title"),
+            data.get("url"),
+            data.get("canonical_url"),
+            _intern(data.get("published_at")),
+            _intern(data.get("fetched_at")),
+            data.get("summary"),
+            data.get("keywords") or [],
+            _intern(data.get("content_type")),
+            _intern(data.get("language")),
+            _intern(data.get("region")),
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Read access shared with plain dict items in the storage helpers.
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in NEWS_ITEM_FIELDS}
+
+
+NEWS_ITEM_FIELDS = tuple(item_field.name for item_field in fields(NewsItem))
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
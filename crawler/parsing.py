@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+# Id of the source being crawled; set by the pipeline around each adapter call
+# (and inherited by the tasks it spawns) so timings can be attributed to it.
+current_source: ContextVar[str | None] = ContextVar("current_source", default=None)
+
+
+class StageTimings:
+    """Cumulative seconds spent per pipeline stage (fetch, parse, ...) in one run.
+
+    Time added while ``current_source`` is set is also kept per source.
+    """
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+        self.by_source: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float, source: str | None = None) -> None:
+        source = source or current_source.get()
+        with self._lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+            if source is not None:
+                stages = self.by_source.setdefault(source, {})
+                stages[stage] = stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {stage: round(value, 3) for stage, value in sorted(self.seconds.items())}
+
+    def source_snapshot(self, source: str) -> dict[str, float]:
+        with self._lock:
+            stages = self.by_source.get(source, {})
+            return {stage: round(value, 3) for stage, value in sorted(stages.items())}
+
+
+def _timed(function: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+class ParsePool:
+    """CPU-bound parsing stage, fed with raw response bytes by the fetch stage.
+
+    With ``workers > 0`` pages are parsed in a process pool, so adapters keep
+    fetching (and other sources keep downloading) while earlier pages parse;
+    with ``workers == 0`` parsing runs inline on the caller. Either way the
+    time spent in each stage is collected in ``timings``.
+    """
+
+    def __init__(self, workers: int = 0, timings: StageTimings | None = None) -> None:
+        self.workers = workers
+        self.timings = timings or StageTimings()
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+
+    def submit(self, function: Callable[..., Any], *args: Any) -> Future:
+        if self._executor is not None:
+            future = self._executor.submit(_timed, function, *args)
+        else:
+            future = Future()
+            try:
+                future.set_result(_timed(function, *args))
+            except Exception as exc:
+                future.set_exception(exc)
+        result: Future = Future()
+        # Worker results complete on the executor's thread, outside the
+        # submitting source's context.
+        source = current_source.get()
+        future.add_done_callback(lambda done: self._finish(done, result, source))
+        return result
+
+    def _finish(self, done: Future, result: Future, source: str | None) -> None:
+        exc = done.exception()
+        if exc is not None:
+            result.set_exception(exc)
+            return
+        value, seconds = done.result()
+        self.timings.add("parse", seconds, source)
+        result.set_result(value)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+
+from .id_index import IdIndex
+from .models import NewsItem
+from .storage import (
+    JsonCodec,
+    NewsStore,
+    count_by_source,
+    get_codec,
+    iter_news_items,
+    load_index,
+    load_news_records,
+    write_lines,
+    write_news_items,
+)
+from .utils import parse_datetime
+
+MANIFEST_NAME = "manifest.json"
+UNDATED = "undated"
+_MONTH = re.compile(r"(\d{4})-(\d{2})")
+
+
+def partition_key(published_at: Any) -> str:
+    """``YYYY/MM`` of an ISO ``published_at``; items without one share ``undated``."""
+    match = _MONTH.match(published_at) if isinstance(published_at, str) else None
+    return f"{match.group(1)}/{match.group(2)}" if match else UNDATED
+
+
+def _newest_first(keys: Iterable[str]) -> list[str]:
+    dated = sorted((key for key in keys if key != UNDATED), reverse=True)
+    return dated + ([UNDATED] if UNDATED in keys else [])
+
+
+def partition_files(root: Path) -> list[Path]:
+    """Partition files under ``root`` as found on disk, newest month first."""
+    keys = {
+        str(path.relative_to(root).with_suffix("")).replace(os.sep, "/"): path
+        for path in root.glob("**/*.jsonl")
+    }
+    return [keys[key] for key in _newest_first(keys)]
+
+
+class PartitionedStore(NewsStore):
+    """News items split by publication month into ``<root>/YYYY/MM.jsonl``.
+
+    ``<root>/manifest.json`` lists every partition (newest first) with its item
+    count, byte size, per-source counts and published_at range, so totals,
+    retention and the site can work from the manifest and open only the months
+    they need. A run rewrites just the partitions that received items, and
+    retention drops whole partitions: the newest ``max_items`` are kept rounded
+    up to a month, and a month goes once its newest item falls past ``days``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        bloom_bits_per_item: int = 0,
+        codec: JsonCodec | None = None,
+    ) -> None:
+        self.root = root
+        self.path = root / MANIFEST_NAME
+        self.codec = codec or get_codec()
+        self.ids = IdIndex(root / "news.idx", bloom_bits_per_item=bloom_bits_per_item)
+        self.partitions: dict[str, dict[str, Any]] = {}
+        self.source_names: dict[str, str] = {}
+
+    def partition_path(self, key: str) -> Path:
+        return self.root / f"{key}.jsonl"
+
+    def _data_size(self) -> int:
+        return sum(entry["size"] for entry in self.partitions.values())
+
+    def load(self) -> PartitionedStore:
+        manifest = load_index(self.path)
+        self.partitions = {entry["key"]: entry for entry in manifest.get("partitions") or []}
+        self.source_names = dict(manifest.get("source_names") or {})
+        self.ids.open()
+        on_disk = {
+            str(path.relative_to(self.root).with_suffix("")).replace(os.sep, "/")
+            for path in self.root.glob("**/*.jsonl")
+        }
+        stale = on_disk.symmetric_difference(self.partitions) | {
+            key
+            for key in on_disk & set(self.partitions)
+            if self.partition_path(key).stat().st_size != self.partitions[key]["size"]
+        }
+        for key in stale:
+            self._scan(key)
+        if stale or self.ids.source_size != self._data_size():
+            self._rebuild_ids()
+            self._save_manifest()
+        return self
+
+    def _scan(self, key: str) -> None:
+        path = self.partition_path(key)
+        if not path.exists():
+            self.partitions.pop(key, None)
+            return
+        self._describe(key, load_news_records(path, codec=self.codec))
+
+    def _describe(self, key: str, items: list[NewsItem]) -> None:
+        published = [item.published_at for item in items if item.published_at]
+        for item in items:
+            if item.source_id and item.source_name:
+                self.source_names.setdefault(item.source_id, item.source_name)
+        self.partitions[key] = {
+            "key": key,
+            "path": f"{key}.jsonl",
+            "count": len(items),
+            "size": self.partition_path(key).stat().st_size,
+            "newest": max(published, default=None),
+            "oldest": min(published, default=None),
+            "sources": count_by_source(items),
+        }
+
+    def _rebuild_ids(self) -> None:
+        self.ids.rebuild(
+            (item.get("id") for item in self.iter_news_items() if item.get("id")),
+            self._data_size(),
+        )
+
+    def _save_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "generated_at": parse_datetime(None),
+            "total": self.total,
+            "source_names": dict(sorted(self.source_names.items())),
+            "partitions": [self.partitions[key] for key in self.months()],
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def months(self) -> list[str]:
+        return _newest_first(self.partitions)
+
+    def write_index(self, path: Path, **kwargs: Any) -> None:
+        # The site reads the partitions only when the index says the crawler
+        # writes them, so a manifest left by ``migrate`` is not served early.
+        manifest = Path(os.path.relpath(self.path.resolve(), path.parent.resolve()))
+        super().write_index(
+            path, storage={"mode": "partitioned", "manifest": manifest.as_posix()}, **kwargs
+        )
+
+    @property
+    def sources(self) -> dict[str, int]:
+        sources: dict[str, int] = {}
+        for entry in self.partitions.values():
+            for source_id, count in entry["sources"].items():
+                sources[source_id] = sources.get(source_id, 0) + count
+        return dict(sorted(sources.items(), key=lambda pair: pair[1], reverse=True))
+
+    @property
+    def total(self) -> int:
+        return sum(entry["count"] for entry in self.partitions.values())
+
+    def iter_news_items(self, months: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+        wanted = self.months() if months is None else _newest_first(set(months))
+        for key in wanted:
+            if key in self.partitions:
+                yield from iter_news_items(self.partition_path(key), codec=self.codec)
+
+    def load_news_items(self) -> list[dict[str, Any]]:
+        return list(self.iter_news_items())
+
+    def _write_partition(self, key: str, items: list[NewsItem]) -> None:
+        items.sort(key=lambda item: item.published_at or "", reverse=True)
+        path = self.partition_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        write_news_items(tmp_path, items, codec=self.codec)
+        os.replace(tmp_path, path)
+        self._describe(key, items)
+
+    def _drop_partition(self, key: str) -> None:
+        self.partition_path(key).unlink(missing_ok=True)
+        self.partitions.pop(key, None)
+
+    def _retire_partition(self, key: str) -> None:
+        # Only the dropped month is read to take its ids out of the index.
+        self.ids.discard(
+            item["id"]
+            for item in iter_news_items(self.partition_path(key), codec=self.codec)
+            if item.get("id")
+        )
+        self._drop_partition(key)
+
+    def write_news_items(self, items: Iterable[dict[str, Any] | NewsItem]) -> None:
+        """Replace the whole archive; partitions are streamed, then sorted one by one."""
+        for key in list(self.partitions):
+            self._drop_partition(key)
+        self.root.mkdir(parents=True, exist_ok=True)
+        handles: dict[str, BinaryIO] = {}
+        pending: dict[str, list[dict[str, Any] | NewsItem]] = {}
+
+        def flush(key: str) -> None:
+            if key not in handles:
+                path = self.partition_path(key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                handles[key] = path.open("wb")
+            write_lines(handles[key], pending.pop(key), self.codec)
+
+        try:
+            for item in items:
+                key = partition_key(item.get("published_at"))
+                pending.setdefault(key, []).append(item)
+                if len(pending[key]) >= 4096:
+                    flush(key)
+            for key in list(pending):
+                flush(key)
+        finally:
+            for handle in handles.values():
+                handle.close()
+        for key in handles:
+            self._write_partition(key, load_news_records(self.partition_path(key), codec=self.codec))
+        self._rebuild_ids()
+        self._save_manifest()
+
+    def apply_retention(self, retention: dict[str, Any]) -> bool:
+        if not retention.get("enabled"):
+            return False
+        dropped = False
+        months = self.months()
+
+        max_items = retention.get("max_items")
+        if isinstance(max_items, int) and max_items > 0:
+            kept = 0
+            for key in months:
+                if kept >= max_items:
+                    self._retire_partition(key)
+                    dropped = True
+                    continue
+                kept += self.partitions[key]["count"]
+
+        days = retention.get("days")
+        if isinstance(days, int) and days > 0:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+            for key in months:
+                entry = self.partitions.get(key)
+                if entry is not None and (entry["newest"] or "") < cutoff:
+                    self._retire_partition(key)
+                    dropped = True
+        return dropped
+
+    def add_items(self, items: list[dict[str, Any]], retention: dict[str, Any]) -> None:
+        touched: dict[str, list[NewsItem]] = {}
+        for item in items:
+            touched.setdefault(partition_key(item.get("published_at")), []).append(
+                NewsItem.from_dict(item)
+            )
+        for key, new_items in touched.items():
+            path = self.partition_path(key)
+            existing = load_news_records(path, codec=self.codec) if path.exists() else []
+            self._write_partition(key, existing + new_items)
+
+        # New ids go in before retention, so ids of a new item in a dropped
+        # month are discarded again.
+        for item in items:
+            self.ids.add(item["id"])
+        self.apply_retention(retention)
+        self.ids.save(self._data_size())
+        self._save_manifest()
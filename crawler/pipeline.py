@@ -1,16 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import inspect
 import logging
 import os
+import sys
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Callable, Container, Iterable
 
-from .adapters.api import fetch_api
-from .adapters.html import fetch_html
-from .adapters.rss import fetch_rss
+import httpx
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from .adapters.api import fetch_api, fetch_api_async
+from .adapters.html import fetch_html, fetch_html_async
+from .adapters.rss import fetch_rss, fetch_rss_async
 from .config import load_settings, load_sources
-from .storage import load_index, load_news_items, write_index, write_news_items
-from .utils import canonicalize_url, parse_datetime, sha256_text
+from .http_cache import CacheScope, NotModified, ValidatorCache
+from .high_water import HighWaterMark
+from .http_client import ConnectionStats, build_async_client, build_client
+from .parsing import ParsePool, StageTimings, current_source
+from .ratelimit import HostRateLimiter
+from .retry import RetryPolicy
+from .storage import iter_news_items, load_index, open_store
+from .utils import canonicalize_url, parse_datetime, published_timezone, sha256_text
 
 
 ADAPTERS = {
@@ -19,23 +37,90 @@ ADAPTERS = {
     "api": fetch_api,
 }
 
+ASYNC_ADAPTERS = {
+    "rss": fetch_rss_async,
+    "html": fetch_html_async,
+    "api": fetch_api_async,
+}
 
-def _normalize_item(raw: dict[str, Any], source: Any) -> dict[str, Any]:
+# Adapters that accept a ``cache`` scope for conditional GETs.
+CONDITIONAL_GET_TYPES = {"rss", "html"}
+
+# Adapters that hand raw pages to the ``parser`` stage.
+PARSE_POOL_TYPES = {"html"}
+# Adapters that stop reading (pages, feed entries) once they reach items
+# already stored.
+KNOWN_IDS_TYPES = {"html", "rss"}
+
+
+def _missing_env(source: Any) -> list[str]:
+    missing_env = []
+    if source.requires:
+        for env_key in source.requires:
+            if not os.getenv(env_key):
+                missing_env.append(env_key)
+    return missing_env
+
+
+def _peak_rss_mb() -> float | None:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS; parse worker
+    # processes are not included.
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _effective_user_agent(source: Any, user_agent: str) -> str:
+    effective_user_agent = user_agent
+    if source.requires:
+        for env_key in source.requires:
+            if env_key.endswith("USER_AGENT") and os.getenv(env_key):
+                effective_user_agent = os.getenv(env_key)
+    return effective_user_agent
+
+
+async def _fetch_all_async(
+    calls: list[tuple[Any, dict[str, Any]]],
+    *,
+    client: httpx.AsyncClient,
+    concurrency: int,
+    ingest: Callable[[Any], _SourceIngest],
+) -> dict[str, Any]:
+    # Results (or raised exceptions) are keyed by source id so the caller can
+    # post-process them in registry order, exactly like the sequential path.
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(source: Any, kwargs: dict[str, Any]) -> Any:
+        adapter = ASYNC_ADAPTERS[source.type]
+        # Each task runs in its own copy of the context.
+        current_source.set(source.id)
+        async with semaphore:
+            try:
+                return await ingest(source).consume_async(adapter(**kwargs, client=client))
+            except Exception as exc:
+                return exc
+
+    async with client:
+        results = await asyncio.gather(*(run(source, kwargs) for source, kwargs in calls))
+    return {source.id: result for (source, _), result in zip(calls, results)}
+
+
+def _normalize_item(
+    raw: dict[str, Any], source: Any, *, fetched_at: str | None = None
+) -> dict[str, Any]:
     source_id = source.id
     source_name = source.name
     title = (raw.get("title") or "").strip()
     url = (raw.get("url") or "").strip()
     canonical_url = canonicalize_url(url)
-    fetched_at = parse_datetime(None)
+    fetched_at = fetched_at or parse_datetime(None)
     try:
-        published_format = source.config.get("published_format")
-        published_timezone = source.config.get("published_timezone")
-        if not published_timezone and source.config.get("region") == "CN":
-            published_timezone = "Asia/Shanghai"
         published_at = parse_datetime(
             raw.get("published_at"),
-            default_timezone=published_timezone,
-            fmt=published_format,
+            default_timezone=published_timezone(source.config),
+            fmt=source.config.get("published_format"),
+            now=fetched_at,
         )
     except Exception:
         published_at = fetched_at
@@ -59,24 +144,197 @@ def _normalize_item(raw: dict[str, Any], source: Any) -> dict[str, Any]:
     }
 
 
-def crawl(data_path: str, index_path: str) -> None:
+def normalize_batch(
+    raw_items: list[dict[str, Any]], source: Any, *, fetched_at: str | None = None
+) -> list[dict[str, Any]]:
+    """Normalize one adapter result; same output as ``_normalize_item`` per item.
+
+    Source config is resolved once per batch, canonical URLs and published dates
+    are memoized for repeated values and ids hash from a pre-seeded
+    ``source_id:`` digest.
+    """
+    source_id = source.id
+    source_name = source.name
+    fetched_at = fetched_at or parse_datetime(None)
+    published_format = source.config.get("published_format")
+    default_timezone = published_timezone(source.config)
+    id_prefix = hashlib.sha256(f"{source_id}:".encode("utf-8"))
+    canonical_urls: dict[str, str] = {}
+    # Also remembers unparseable dates, which would otherwise raise every time.
+    # Only strings are memoized: API fields may hold lists or dicts (unhashable)
+    # and 1 == True would share an entry.
+    published: dict[str, str] = {}
+
+    normalized: list[dict[str, Any]] = []
+    for raw in raw_items:
+        url = (raw.get("url") or "").strip()
+        canonical_url = canonical_urls.get(url)
+        if canonical_url is None:
+            canonical_url = canonical_urls[url] = canonicalize_url(url)
+        raw_published = raw.get("published_at")
+        memoize = isinstance(raw_published, str)
+        published_at = published.get(raw_published) if memoize else None
+        if published_at is None:
+            try:
+                published_at = parse_datetime(
+                    raw_published,
+                    default_timezone=default_timezone,
+                    fmt=published_format,
+                    now=fetched_at,
+                )
+            except Exception:
+                published_at = fetched_at
+            if memoize:
+                published[raw_published] = published_at
+        digest = id_prefix.copy()
+        digest.update(canonical_url.encode("utf-8"))
+
+        normalized.append(
+            {
+                "id": digest.hexdigest(),
+                "source_id": source_id,
+                "source_name": source_name,
+                "title": (raw.get("title") or "").strip(),
+                "url": url,
+                "canonical_url": canonical_url,
+                "published_at": published_at,
+                "fetched_at": fetched_at,
+                "summary": raw.get("summary"),
+                "keywords": raw.get("keywords") or [],
+                "content_type": raw.get("content_type"),
+                "language": raw.get("language"),
+                "region": raw.get("region"),
+            }
+        )
+    return normalized
+
+
+# Raw items are normalized and deduplicated in batches of this size while the
+# adapter is still yielding.
+INGEST_BATCH_SIZE = 200
+
+
+async def aiter_raw_items(result: Any) -> AsyncIterator[dict[str, Any]]:
+    """Read an async adapter's result as an async iterator of raw items.
+
+    Adapters yield raw items; one still written as a coroutine returning a
+    list (or any iterable) is awaited and its items are passed on.
+    """
+    if inspect.isawaitable(result):
+        result = await result
+    if hasattr(result, "__aiter__"):
+        async for item in result:
+            yield item
+    else:
+        for item in result:
+            yield item
+
+
+class _SourceIngest:
+    """Normalizes and deduplicates one source's raw items while its adapter yields them.
+
+    New items stay here until the adapter has finished, so a source that fails
+    half-way adds nothing, and the caller merges results in registry order:
+    concurrent runs store exactly what sequential ones do.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        known_ids: Container[str],
+        fetched_at: str,
+        high_water: HighWaterMark | None,
+        timings: StageTimings | None = None,
+    ) -> None:
+        self.source = source
+        self.known_ids = known_ids
+        self.fetched_at = fetched_at
+        self.high_water = high_water
+        self.timings = timings or StageTimings()
+        self.fetched = 0
+        self.skipped = 0
+        self.new_items: list[dict[str, Any]] = []
+        self._new_ids: set[str] = set()
+        self._batch: list[dict[str, Any]] = []
+
+    def consume(self, raw_items: Iterable[dict[str, Any]]) -> _SourceIngest:
+        # Adapters that return a complete list are iterated the same way.
+        for raw in raw_items:
+            self._add(raw)
+        self._flush()
+        return self
+
+    async def consume_async(self, result: Any) -> _SourceIngest:
+        async for raw in aiter_raw_items(result):
+            self._add(raw)
+        self._flush()
+        return self
+
+    def _add(self, raw: dict[str, Any]) -> None:
+        self._batch.append(raw)
+        if len(self._batch) >= INGEST_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        batch, self._batch = self._batch, []
+        self.fetched += len(batch)
+        listed: list[dict[str, Any]] = []
+        with self.timings.timed("normalize"):
+            for normalized in normalize_batch(batch, self.source, fetched_at=self.fetched_at):
+                if not normalized["title"] or not normalized["url"]:
+                    self.skipped += 1
+                    continue
+                listed.append(normalized)
+        with self.timings.timed("dedup"):
+            for normalized in listed:
+                item_id = normalized["id"]
+                if item_id in self._new_ids or item_id in self.known_ids:
+                    self.skipped += 1
+                    continue
+                self._new_ids.add(item_id)
+                self.new_items.append(normalized)
+        self.high_water = HighWaterMark.advance(self.high_water, listed, self.fetched_at)
+
+
+def crawl(
+    data_path: str,
+    index_path: str,
+    *,
+    concurrency: int | None = None,
+    parse_workers: int | None = None,
+) -> None:
+    wall_started = time.perf_counter()
     settings = load_settings()
     sources = load_sources()
 
     data_file = Path(data_path)
     index_file = Path(index_path)
 
-    existing_items = load_news_items(data_file)
-    existing_ids = {item.get("id") for item in existing_items if item.get("id")}
+    load_started = time.perf_counter()
+    store = open_store(data_file, settings.get("storage", {}))
+    existing_ids = store.ids
+    storage_load_sec = time.perf_counter() - load_started
+    # One timestamp for every item fetched in this run.
+    run_started = parse_datetime(None)
     previous_index = load_index(index_file)
     previous_state = previous_index.get("state", {}).get("sources", {})
+    previous_hosts = previous_index.get("state", {}).get("hosts", {})
 
     max_retries = int(settings.get("max_retries", 3))
     retry_backoff = float(settings.get("retry_backoff_sec", 2))
     timeout = float(settings.get("request_timeout_sec", 20))
-    crawl_delay = float(settings.get("crawl_delay_sec", 1.0))
+    limiter = HostRateLimiter.from_settings(settings)
+    retry_policy = RetryPolicy.from_settings(settings)
+    # Hosts unreachable in consecutive runs get one probe instead of full retries.
+    if retry_policy.breaker is not None:
+        retry_policy.breaker.seed(previous_hosts)
     user_agent = settings.get("user_agent", "PolicyPulseBot/0.1")
     retention = settings.get("retention", {})
+    if concurrency is None:
+        concurrency = int(settings.get("concurrency", 1))
+    if parse_workers is None:
+        parse_workers = int(settings.get("parse_workers", 0))
+    parse_pool = ParsePool(parse_workers)
 
     new_items: list[dict[str, Any]] = []
     source_stats: dict[str, dict[str, Any]] = {}
@@ -87,16 +345,76 @@ def crawl(data_path: str, index_path: str) -> None:
     failure_threshold = int(alerting.get("failure_streak_threshold", 3))
     zero_new_threshold = int(alerting.get("zero_new_streak_threshold", 3))
 
+    http_cache = settings.get("http_cache", {})
+    validator_cache: ValidatorCache | None = None
+    # A fresh corpus must be fetched in full, whatever the validators say.
+    if http_cache.get("enabled", True) and store.exists():
+        cache_path = http_cache.get("path")
+        validator_cache = ValidatorCache.load(
+            Path(cache_path) if cache_path else data_file.parent / "http_cache.json"
+        )
+    cache_scopes: dict[str, CacheScope] = {}
+
+    def adapter_kwargs(source: Any) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {
+            "source": source,
+            "user_agent": _effective_user_agent(source, user_agent),
+            "timeout": timeout,
+            "max_retries": max_retries,
+            "retry_backoff": retry_backoff,
+            "limiter": limiter,
+            "retry": retry_policy.for_source(),
+        }
+        if validator_cache is not None and source.type in CONDITIONAL_GET_TYPES:
+            cache_scopes[source.id] = validator_cache.scope()
+            kwargs["cache"] = cache_scopes[source.id]
+        if source.type in PARSE_POOL_TYPES:
+            kwargs["parser"] = parse_pool
+        if source.type in KNOWN_IDS_TYPES:
+            kwargs["known_ids"] = existing_ids
+        if source.config.get("high_water", True):
+            kwargs["high_water"] = HighWaterMark.from_state(
+                previous_state.get(source.id, {}).get("high_water")
+            )
+        return kwargs
+
+    def ingest(source: Any) -> _SourceIngest:
+        return _SourceIngest(
+            source,
+            existing_ids,
+            run_started,
+            HighWaterMark.from_state(previous_state.get(source.id, {}).get("high_water")),
+            parse_pool.timings,
+        )
+
+    # One pooled client per run, so sources sharing a host reuse connections
+    # and TLS sessions instead of handshaking again for every adapter call.
+    connection_stats = ConnectionStats()
+    http_client: httpx.Client | None = None
+    prefetched: dict[str, Any] | None = None
+    if concurrency > 1:
+        calls = [
+            (source, adapter_kwargs(source))
+            for source in sources
+            if source.enabled and not _missing_env(source) and source.type in ASYNC_ADAPTERS
+        ]
+        prefetched = asyncio.run(
+            _fetch_all_async(
+                calls,
+                client=build_async_client(settings, connection_stats),
+                concurrency=concurrency,
+                ingest=ingest,
+            )
+        )
+    else:
+        http_client = build_client(settings, connection_stats)
+
     for source in sources:
         if not source.enabled:
             logging.info("Skip %s (disabled)", source.id)
             continue
 
-        missing_env = []
-        if source.requires:
-            for env_key in source.requires:
-                if not os.getenv(env_key):
-                    missing_env.append(env_key)
+        missing_env = _missing_env(source)
         if missing_env:
             logging.warning("Skip %s (missing env: %s)", source.id, ", ".join(missing_env))
             previous = previous_state.get(source.id, {})
@@ -106,6 +424,7 @@ def crawl(data_path: str, index_path: str) -> None:
                 "last_status": "skipped",
                 "last_error": f"Missing env: {', '.join(missing_env)}",
                 "last_run": parse_datetime(None),
+                "high_water": previous.get("high_water"),
             }
             source_stats[source.id] = {
                 "fetched": 0,
@@ -130,6 +449,7 @@ def crawl(data_path: str, index_path: str) -> None:
                 "last_status": "skipped",
                 "last_error": "Unknown adapter",
                 "last_run": parse_datetime(None),
+                "high_water": previous.get("high_water"),
             }
             source_stats[source.id] = {
                 "fetched": 0,
@@ -144,20 +464,44 @@ def crawl(data_path: str, index_path: str) -> None:
             }
             continue
 
-        effective_user_agent = user_agent
-        if source.requires:
-            for env_key in source.requires:
-                if env_key.endswith("USER_AGENT") and os.getenv(env_key):
-                    effective_user_agent = os.getenv(env_key)
-
         try:
-            raw_items = adapter(
-                source=source,
-                user_agent=effective_user_agent,
-                timeout=timeout,
-                max_retries=max_retries,
-                retry_backoff=retry_backoff,
-            )
+            if prefetched is not None:
+                result = prefetched[source.id]
+                if isinstance(result, BaseException):
+                    raise result
+            else:
+                token = current_source.set(source.id)
+                try:
+                    result = ingest(source).consume(
+                        adapter(**adapter_kwargs(source), client=http_client)
+                    )
+                finally:
+                    current_source.reset(token)
+        except NotModified:
+            logging.info("Source %s not modified", source.id)
+            if source.id in cache_scopes:
+                cache_scopes[source.id].commit()
+            previous = previous_state.get(source.id, {})
+            # Same streak semantics as a run that found nothing new.
+            state_sources[source.id] = {
+                "failure_streak": 0,
+                "zero_new_streak": int(previous.get("zero_new_streak", 0)) + 1,
+                "last_status": "not_modified",
+                "last_error": None,
+                "last_run": parse_datetime(None),
+                "high_water": previous.get("high_water"),
+            }
+            source_stats[source.id] = {
+                "fetched": 0,
+                "new": 0,
+                "skipped": 0,
+                "status": "not_modified",
+                "failure_streak": state_sources[source.id]["failure_streak"],
+                "zero_new_streak": state_sources[source.id]["zero_new_streak"],
+                "last_run": state_sources[source.id]["last_run"],
+                "last_error": state_sources[source.id].get("last_error"),
+            }
+            continue
         except Exception as exc:
             logging.exception("Source %s failed: %s", source.id, exc)
             previous = previous_state.get(source.id, {})
@@ -169,6 +513,7 @@ def crawl(data_path: str, index_path: str) -> None:
                 "last_status": "failed",
                 "last_error": str(exc),
                 "last_run": parse_datetime(None),
+                "high_water": previous.get("high_water"),
             }
             source_stats[source.id] = {
                 "fetched": 0,
@@ -182,20 +527,12 @@ def crawl(data_path: str, index_path: str) -> None:
             }
             continue
 
-        fetched_count = len(raw_items)
-        added = 0
-        skipped = 0
-        for raw in raw_items:
-            normalized = _normalize_item(raw, source)
-            if not normalized["title"] or not normalized["url"]:
-                skipped += 1
-                continue
-            if normalized["id"] in existing_ids:
-                skipped += 1
-                continue
+        fetched_count = result.fetched
+        added = len(result.new_items)
+        skipped = result.skipped
+        for normalized in result.new_items:
             existing_ids.add(normalized["id"])
-            new_items.append(normalized)
-            added += 1
+        new_items.extend(result.new_items)
 
         logging.info(
             "Source %s fetched=%s new=%s skipped=%s",
@@ -205,18 +542,23 @@ def crawl(data_path: str, index_path: str) -> None:
             skipped,
         )
 
+        if source.id in cache_scopes:
+            cache_scopes[source.id].commit()
+
         previous = previous_state.get(source.id, {})
         failure_streak = 0
         if added == 0:
             zero_new_streak = int(previous.get("zero_new_streak", 0)) + 1
         else:
             zero_new_streak = 0
+        high_water = result.high_water
         state_sources[source.id] = {
             "failure_streak": failure_streak,
             "zero_new_streak": zero_new_streak,
             "last_status": "success",
             "last_error": None,
             "last_run": parse_datetime(None),
+            "high_water": high_water.as_state() if high_water is not None else None,
         }
 
         source_stats[source.id] = {
@@ -230,30 +572,17 @@ def crawl(data_path: str, index_path: str) -> None:
             "last_error": state_sources[source.id].get("last_error"),
         }
 
-        if crawl_delay > 0:
-            from time import sleep
-
-            sleep(crawl_delay)
-
-    combined = existing_items + new_items
-    combined.sort(key=lambda item: item.get("published_at", ""), reverse=True)
-
-    if retention.get("enabled"):
-        max_items = retention.get("max_items")
-        if isinstance(max_items, int) and max_items > 0:
-            combined = combined[:max_items]
+    if http_client is not None:
+        http_client.close()
+    parse_pool.close()
 
-        days = retention.get("days")
-        if isinstance(days, int) and days > 0:
-            from datetime import datetime, timedelta, timezone
-
-            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-            combined = [
-                item
-                for item in combined
-                if item.get("published_at")
-                and item["published_at"] >= cutoff.isoformat()
-            ]
+    for source_id, stats in source_stats.items():
+        timings = {
+            **connection_stats.source_snapshot(source_id),
+            **parse_pool.timings.source_snapshot(source_id),
+        }
+        if timings:
+            stats["timings"] = timings
 
     alerts: list[dict[str, Any]] = []
     if alerting_enabled:
@@ -280,13 +609,99 @@ def crawl(data_path: str, index_path: str) -> None:
                     }
                 )
 
-    write_news_items(data_file, combined)
-    write_index(
+    if retry_policy.breaker is not None and retry_policy.breaker.open_hosts():
+        logging.warning("Circuit open hosts: %s", ", ".join(retry_policy.breaker.open_hosts()))
+    rate_limit_stats = limiter.stats()
+    total_wait = sum(stats["wait_sec"] for stats in rate_limit_stats.values())
+    logging.info("Rate limit wait total=%.2fs across %s hosts", total_wait, len(rate_limit_stats))
+    http_stats = connection_stats.snapshot()
+    logging.info(
+        "HTTP requests=%s new_connections=%s reused=%s",
+        http_stats["requests"],
+        http_stats["new_connections"],
+        http_stats["reused_connections"],
+    )
+    stage_timings = parse_pool.timings.snapshot()
+    logging.info(
+        "Stage timings (parse_workers=%s): %s",
+        parse_workers,
+        ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in stage_timings.items()) or "n/a",
+    )
+
+    write_started = time.perf_counter()
+    store.add_items(new_items, retention)
+    storage_write_sec = time.perf_counter() - write_started
+    if validator_cache is not None:
+        validator_cache.save()
+    run_profile = {
+        "wall_sec": round(time.perf_counter() - wall_started, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+        "storage_load_sec": round(storage_load_sec, 3),
+        "storage_write_sec": round(storage_write_sec, 3),
+    }
+    logging.info(
+        "Run wall=%.2fs peak_rss=%sMB storage load=%.2fs write=%.2fs",
+        run_profile["wall_sec"],
+        run_profile["peak_rss_mb"],
+        storage_load_sec,
+        storage_write_sec,
+    )
+    store.write_index(
         index_file,
-        combined,
         source_stats=source_stats,
-        state={"sources": state_sources},
+        state={
+            "sources": state_sources,
+            "hosts": (
+                retry_policy.breaker.host_state(previous_hosts)
+                if retry_policy.breaker is not None
+                else previous_hosts
+            ),
+        },
         alerts=alerts,
+        run_stats={
+            "hosts": rate_limit_stats,
+            "http": http_stats,
+            "timings": stage_timings,
+            "run": run_profile,
+            "urls": connection_stats.url_snapshot(),
+        },
     )
+    total_items = store.total
+    store.close()
+
+    logging.info("Total items=%s (new=%s)", total_items, len(new_items))
+
+
+def compact(data_path: str) -> None:
+    settings = load_settings()
+    storage = settings.get("storage", {})
+    # Only the append-only store defers sorting and retention; compacting any
+    # other layout as a single news.jsonl would rewrite the wrong file.
+    if storage.get("mode", "full") != "incremental":
+        raise SystemExit("compact needs settings.storage.mode: incremental")
+    store = open_store(Path(data_path), storage)
+    store.compact(settings.get("retention", {}))
+    logging.info("Compacted %s (total=%s)", data_path, store.total)
+
+
+def migrate(data_path: str) -> None:
+    """Split a single ``news.jsonl`` into the partitioned layout."""
+    storage = {**load_settings().get("storage", {}), "mode": "partitioned"}
+    source = Path(data_path)
+    store = open_store(source, storage)
+    store.write_news_items(iter_news_items(source, codec=store.codec))
+    logging.info(
+        "Migrated %s items from %s into %s partitions under %s; "
+        "set settings.storage.mode to partitioned to use them",
+        store.total,
+        data_path,
+        len(store.partitions),
+        store.root,
+    )
+
 
-    logging.info("Total items=%s (new=%s)", len(combined), len(new_items))
+def export(data_path: str) -> None:
+    store = open_store(Path(data_path), {**load_settings().get("storage", {}), "mode": "sqlite"})
+    store.export_jsonl(Path(data_path))
+    logging.info("Exported %s items to %s", store.total, data_path)
+    store.close()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """Token bucket per host: each host refills at ``rate`` requests/sec up to ``burst``."""
+
+    def __init__(
+        self,
+        default_rate: float,
+        default_burst: int = 1,
+        hosts: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        self.default_rate = default_rate
+        self.default_burst = max(1, default_burst)
+        self.hosts = {host.lower(): limits for host, limits in (hosts or {}).items()}
+        self._buckets: dict[str, list[float]] = {}
+        self._stats: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, Any]) -> HostRateLimiter:
+        rate_limits = settings.get("rate_limits") or {}
+        default = rate_limits.get("default") or {}
+        if "rate_per_sec" in default:
+            default_rate = float(default["rate_per_sec"])
+        else:
+            # Without explicit limits, keep the old politeness: one request per
+            # crawl_delay_sec, but per host instead of a global pause.
+            crawl_delay = float(settings.get("crawl_delay_sec", 1.0))
+            default_rate = 1.0 / crawl_delay if crawl_delay > 0 else 0.0
+        return cls(
+            default_rate=default_rate,
+            default_burst=int(default.get("burst", 1)),
+            hosts=rate_limits.get("hosts") or {},
+        )
+
+    def _limits(self, host: str) -> tuple[float, int]:
+        override = self.hosts.get(host) or {}
+        rate = float(override.get("rate_per_sec", self.default_rate))
+        burst = max(1, int(override.get("burst", self.default_burst)))
+        return rate, burst
+
+    def _reserve(self, url: str) -> float:
+        host = (urlparse(url).hostname or "").lower()
+        rate, burst = self._limits(host)
+        with self._lock:
+            stats = self._stats.setdefault(
+                host, {"requests": 0, "wait_sec": 0.0, "max_wait_sec": 0.0}
+            )
+            stats["requests"] += 1
+            if rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = [float(burst), now]
+                self._buckets[host] = bucket
+            tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            # Going negative reserves a future slot, so concurrent callers queue
+            # up behind each other instead of all waking at the same moment.
+            tokens -= 1.0
+            bucket[0], bucket[1] = tokens, now
+            wait = -tokens / rate if tokens < 0 else 0.0
+            stats["wait_sec"] += wait
+            stats["max_wait_sec"] = max(stats["max_wait_sec"], wait)
+            return wait
+
+    def acquire(self, url: str) -> float:
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                host: {
+                    "requests": stats["requests"],
+                    "wait_sec": round(stats["wait_sec"], 3),
+                    "max_wait_sec": round(stats["max_wait_sec"], 3),
+                }
+                for host, stats in sorted(self._stats.items())
+            }
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+T = TypeVar("T")
+
+# Timeouts, throttling and transient server errors; any other 4xx/5xx is
+# treated as permanent and fails on the first attempt.
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+_CLOSED, _HALF_OPEN, _PROBING, _OPEN = "closed", "half_open", "probing", "open"
+# Async requests waiting on another task's probe check back this often.
+_PROBE_POLL_SEC = 0.05
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def _retry_after(exc: Exception) -> float | None:
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    value = exc.response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Per-host breaker fed only by host-level failures.
+
+    A host "fails" a run when a request to it ends in a transport error or a
+    retryable status (5xx, 429, ...) and no request to it succeeds; a 404 or a
+    broken selector on one source says nothing about the host. Those streaks
+    are kept in ``index.json`` (``state.hosts``). Hosts at ``threshold`` or
+    more start half-open: one request at a time probes without retries while
+    other requests to the host wait for its outcome. A probe that gets any
+    response closes the breaker; a failed one opens it and later requests to
+    the host fail at once for the rest of the run.
+    """
+
+    def __init__(self, threshold: int = 3) -> None:
+        self.threshold = threshold
+        self._states: dict[str, str] = {}
+        self._probes: dict[str, threading.Event] = {}
+        self._failed: set[str] = set()
+        self._succeeded: set[str] = set()
+        self._lock = threading.Lock()
+
+    def seed(self, hosts: dict[str, dict[str, Any]]) -> None:
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            for host, state in hosts.items():
+                if int((state or {}).get("failure_streak", 0)) >= self.threshold:
+                    self._states.setdefault(host, _HALF_OPEN)
+
+    def _claim(self, host: str) -> tuple[bool, threading.Event | None]:
+        """``(probe, None)`` when the caller may go ahead, ``(False, event)`` to wait."""
+        with self._lock:
+            state = self._states.get(host)
+            if state == _OPEN:
+                raise RuntimeError(f"Circuit open for {host}")
+            if state == _HALF_OPEN:
+                self._states[host] = _PROBING
+                self._probes[host] = threading.Event()
+                return True, None
+            if state == _PROBING:
+                return False, self._probes[host]
+            return False, None
+
+    def acquire(self, url: str) -> bool:
+        """Wait out a probe in flight; True when this caller is the probe."""
+        host = _host(url)
+        while True:
+            probe, pending = self._claim(host)
+            if pending is None:
+                return probe
+            pending.wait()
+
+    async def acquire_async(self, url: str) -> bool:
+        host = _host(url)
+        while True:
+            probe, pending = self._claim(host)
+            if pending is None:
+                return probe
+            while not pending.is_set():
+                await asyncio.sleep(_PROBE_POLL_SEC)
+
+    def record(self, url: str, *, host_failure: bool) -> None:
+        host = _host(url)
+        with self._lock:
+            # Any response short of a host failure (a 404 too) shows the host is up.
+            if host_failure:
+                self._failed.add(host)
+            else:
+                self._succeeded.add(host)
+            state = self._states.get(host)
+            if state is None:
+                return
+            if state == _PROBING:
+                if host_failure:
+                    logging.warning("Circuit open for %s: probe failed", host)
+                self._states[host] = _OPEN if host_failure else _CLOSED
+                self._probes.pop(host).set()
+            elif not host_failure:
+                self._states[host] = _CLOSED
+
+    def release(self, url: str) -> None:
+        # A probe that ended without an outcome (unexpected error) hands the
+        # probe to the next waiting request.
+        host = _host(url)
+        with self._lock:
+            if self._states.get(host) == _PROBING:
+                self._states[host] = _HALF_OPEN
+                self._probes.pop(host).set()
+
+    def open_hosts(self) -> list[str]:
+        with self._lock:
+            return sorted(host for host, state in self._states.items() if state == _OPEN)
+
+    def host_state(self, previous: dict[str, dict[str, Any]]) -> dict[str, dict[str, int]]:
+        """``state.hosts`` for the next run: consecutive failed runs per host."""
+        with self._lock:
+            streaks = {
+                host: int((state or {}).get("failure_streak", 0))
+                for host, state in previous.items()
+            }
+            for host in self._failed - self._succeeded:
+                streaks[host] = streaks.get(host, 0) + 1
+            for host in self._succeeded:
+                streaks.pop(host, None)
+        return {
+            host: {"failure_streak": streak} for host, streak in sorted(streaks.items()) if streak
+        }
+
+
+class RetryPolicy:
+    """Bounded retries with jittered exponential backoff.
+
+    Attempt ``n`` waits ``backoff_sec * 2**(n-1)`` (capped at
+    ``max_backoff_sec``), half of it randomized, or the server's
+    ``Retry-After``; a ``Retry-After`` beyond the cap ends the retries.
+    Only network errors and ``retry_statuses`` are retried. ``deadline_sec``
+    bounds the time one source spends fetching, counted from its first
+    request; past it no new request starts. ``for_source`` gives each source
+    its own deadline while sharing the breaker.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_sec: float = 2.0,
+        *,
+        max_backoff_sec: float = 30.0,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        deadline_sec: float | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.max_retries = max(1, max_retries)
+        self.backoff_sec = backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+        self.retry_statuses = frozenset(retry_statuses)
+        self.deadline_sec = deadline_sec
+        self.breaker = breaker
+        self._deadline: float | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, Any]) -> RetryPolicy:
+        retry = settings.get("retry") or {}
+        deadline = retry.get("source_deadline_sec")
+        return cls(
+            max_retries=int(settings.get("max_retries", 3)),
+            backoff_sec=float(settings.get("retry_backoff_sec", 2)),
+            max_backoff_sec=float(retry.get("max_backoff_sec", 30)),
+            retry_statuses=retry.get("retry_statuses") or RETRY_STATUSES,
+            deadline_sec=float(deadline) if deadline else None,
+            breaker=CircuitBreaker(int(retry.get("breaker_failure_streak", 3))),
+        )
+
+    def for_source(self) -> RetryPolicy:
+        return RetryPolicy(
+            self.max_retries,
+            self.backoff_sec,
+            max_backoff_sec=self.max_backoff_sec,
+            retry_statuses=self.retry_statuses,
+            deadline_sec=self.deadline_sec,
+            breaker=self.breaker,
+        )
+
+    def _remaining(self) -> float | None:
+        if self.deadline_sec is None:
+            return None
+        with self._lock:
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.deadline_sec
+            return self._deadline - time.monotonic()
+
+    def retryable(self, exc: Exception) -> bool:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in self.retry_statuses
+        return True
+
+    def delay(self, attempt: int, exc: Exception) -> float | None:
+        """Seconds to wait before attempt ``attempt + 1``; None to stop retrying."""
+        if not self.retryable(exc):
+            return None
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            if retry_after > self.max_backoff_sec:
+                return None
+            delay = retry_after
+        else:
+            ceiling = min(self.max_backoff_sec, self.backoff_sec * 2 ** (attempt - 1))
+            delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        remaining = self._remaining()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    def _check_deadline(self, url: str) -> None:
+        remaining = self._remaining()
+        if remaining is not None and remaining <= 0:
+            raise RuntimeError(f"Source deadline exceeded before {url}")
+
+    def host_failure(self, exc: Exception) -> bool:
+        """Whether ``exc`` counts against the host (transport error, retryable status)."""
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in self.retry_statuses
+        return isinstance(exc, httpx.RequestError)
+
+    def _failed(self, url: str, attempt: int, attempts: int, exc: Exception) -> float | None:
+        logging.warning("Request failed (%s/%s) %s: %s", attempt, attempts, url, exc)
+        return self.delay(attempt, exc) if attempt < attempts else None
+
+    def _settle(self, url: str, error: Exception | None) -> None:
+        if self.breaker is not None:
+            self.breaker.record(url, host_failure=error is not None and self.host_failure(error))
+
+    def call(
+        self,
+        url: str,
+        attempt: Callable[[], T],
+        *,
+        errors: tuple[type[Exception], ...] = (httpx.RequestError, httpx.HTTPStatusError),
+        acquire: Callable[[str], Any] | None = None,
+    ) -> T:
+        """Run ``attempt`` until it returns, retrying ``errors`` per the policy."""
+        self._check_deadline(url)
+        probe = self.breaker is not None and self.breaker.acquire(url)
+        attempts = 1 if probe else self.max_retries
+        last_error: Exception | None = None
+        try:
+            for number in range(1, attempts + 1):
+                if acquire is not None:
+                    acquire(url)
+                try:
+                    result = attempt()
+                except errors as exc:
+                    last_error = exc
+                    delay = self._failed(url, number, attempts, exc)
+                    if delay is None:
+                        break
+                    time.sleep(delay)
+                    continue
+                self._settle(url, None)
+                return result
+            self._settle(url, last_error)
+        finally:
+            if probe:
+                self.breaker.release(url)
+        raise RuntimeError(f"Failed to fetch {url}") from last_error
+
+    async def call_async(
+        self,
+        url: str,
+        attempt: Callable[[], Awaitable[T]],
+        *,
+        errors: tuple[type[Exception], ...] = (httpx.RequestError, httpx.HTTPStatusError),
+        acquire: Callable[[str], Awaitable[Any]] | None = None,
+    ) -> T:
+        self._check_deadline(url)
+        probe = self.breaker is not None and await self.breaker.acquire_async(url)
+        attempts = 1 if probe else self.max_retries
+        last_error: Exception | None = None
+        try:
+            for number in range(1, attempts + 1):
+                if acquire is not None:
+                    await acquire(url)
+                try:
+                    result = await attempt()
+                except errors as exc:
+                    last_error = exc
+                    delay = self._failed(url, number, attempts, exc)
+                    if delay is None:
+                        break
+                    await asyncio.sleep(delay)
+                    continue
+                self._settle(url, None)
+                return result
+            self._settle(url, last_error)
+        finally:
+            if probe:
+                self.breaker.release(url)
+        raise RuntimeError(f"Failed to fetch {url}") from last_error
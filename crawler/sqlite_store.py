@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from .storage import JsonCodec, NewsStore, get_codec, iter_news_items, write_lines
+
+FIELDS = (
+    "id",
+    "source_id",
+    "source_name",
+    "title",
+    "url",
+    "canonical_url",
+    "published_at",
+    "fetched_at",
+    "summary",
+    "keywords",
+    "content_type",
+    "language",
+    "region",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    id TEXT PRIMARY KEY,
+    source_id TEXT NOT NULL,
+    source_name TEXT,
+    title TEXT,
+    url TEXT,
+    canonical_url TEXT,
+    published_at TEXT,
+    fetched_at TEXT,
+    summary TEXT,
+    keywords TEXT,
+    content_type TEXT,
+    language TEXT,
+    region TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_news_source_published ON news (source_id, published_at);
+CREATE INDEX IF NOT EXISTS idx_news_published ON news (published_at);
+"""
+
+_INSERT = "INSERT OR IGNORE INTO news ({columns}) VALUES ({placeholders})".format(
+    columns=", ".join(FIELDS),
+    placeholders=", ".join("?" for _ in FIELDS),
+)
+# Ties on published_at keep insertion order (rowid), as the stable merge and
+# sort of the JSONL stores do.
+_SELECT = "SELECT {columns} FROM news ORDER BY published_at DESC, rowid".format(
+    columns=", ".join(FIELDS)
+)
+
+
+def _to_row(item: dict[str, Any]) -> tuple[Any, ...]:
+    row = [item.get(field) for field in FIELDS]
+    row[FIELDS.index("keywords")] = json.dumps(item.get("keywords") or [], ensure_ascii=False)
+    return tuple(row)
+
+
+def _from_row(row: tuple[Any, ...]) -> dict[str, Any]:
+    item = dict(zip(FIELDS, row))
+    item["keywords"] = json.loads(item["keywords"]) if item["keywords"] else []
+    return item
+
+
+class _SqliteIds:
+    """Dedup view over the primary key, plus ids added during the current run."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.pending: set[str] = set()
+
+    def __contains__(self, item_id: object) -> bool:
+        if item_id in self.pending:
+            return True
+        row = self.connection.execute(
+            "SELECT 1 FROM news WHERE id = ?", (item_id,)
+        ).fetchone()
+        return row is not None
+
+    def add(self, item_id: str) -> None:
+        self.pending.add(item_id)
+
+
+class SqliteStore(NewsStore):
+    """News items in SQLite (WAL), with ``news.jsonl`` kept as an export for the site.
+
+    Inserts are batched in a single transaction with ``INSERT OR IGNORE`` on
+    ``id``, retention is two indexed DELETEs, and the JSONL export streams rows
+    straight from a cursor, so a run never parses or sorts the archive in Python.
+    The database is a local working copy: when it is empty an existing JSONL
+    corpus at ``import_path`` is imported, so CI rebuilds it from the committed
+    export each run.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        export_path: Path | None = None,
+        import_path: Path | None = None,
+        codec: JsonCodec | None = None,
+    ) -> None:
+        self.path = path
+        self.export_path = export_path
+        self.import_path = import_path
+        self.codec = codec or get_codec()
+        self.connection: sqlite3.Connection | None = None
+
+    def load(self) -> SqliteStore:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.ids = _SqliteIds(self.connection)
+        if self.import_path is not None and self.total == 0 and self.import_path.exists():
+            self.insert(iter_news_items(self.import_path, codec=self.codec))
+        return self
+
+    def close(self) -> None:
+        if self.connection is not None:
+            # Fold the WAL back into the main file so no -wal/-shm files are
+            # left next to it.
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.connection.close()
+            self.connection = None
+
+    @property
+    def sources(self) -> dict[str, int]:
+        rows = self.connection.execute(
+            "SELECT source_id, COUNT(*) FROM news GROUP BY source_id ORDER BY COUNT(*) DESC"
+        )
+        return {source_id: count for source_id, count in rows}
+
+    @property
+    def total(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM news").fetchone()[0]
+
+    def iter_news_items(self) -> Iterator[dict[str, Any]]:
+        for row in self.connection.execute(_SELECT):
+            yield _from_row(row)
+
+    def load_news_items(self) -> list[dict[str, Any]]:
+        return list(self.iter_news_items())
+
+    def insert(self, items: Any) -> None:
+        with self.connection:
+            self.connection.executemany(_INSERT, (_to_row(item) for item in items))
+
+    def write_news_items(self, items: list[dict[str, Any]]) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM news")
+            self.connection.executemany(_INSERT, (_to_row(item) for item in items))
+        self.export_jsonl()
+
+    def apply_retention(self, retention: dict[str, Any]) -> None:
+        if not retention.get("enabled"):
+            return
+        with self.connection:
+            max_items = retention.get("max_items")
+            if isinstance(max_items, int) and max_items > 0:
+                self.connection.execute(
+                    "DELETE FROM news WHERE id NOT IN "
+                    "(SELECT id FROM news ORDER BY published_at DESC, rowid LIMIT ?)",
+                    (max_items,),
+                )
+            days = retention.get("days")
+            if isinstance(days, int) and days > 0:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+                self.connection.execute(
+                    "DELETE FROM news WHERE published_at IS NULL OR published_at = '' "
+                    "OR published_at < ?",
+                    (cutoff.isoformat(),),
+                )
+
+    def add_items(self, items: list[dict[str, Any]], retention: dict[str, Any]) -> None:
+        self.insert(items)
+        self.apply_retention(retention)
+        self.ids.pending.clear()
+        self.export_jsonl()
+
+    def export_jsonl(self, path: Path | None = None) -> None:
+        target = path or self.export_path
+        if target is None:
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(target.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            write_lines(handle, self.iter_news_items(), self.codec)
+        os.replace(tmp_path, target)
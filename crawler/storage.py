@@ -1,28 +1,205 @@
 from __future__ import annotations
 
+import heapq
 import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable, Container, Iterable, Iterator
 
+from .id_index import IdIndex
+from .models import NewsItem
 from .utils import parse_datetime
 
+try:
+    import orjson
+except ImportError:  # optional, installed with the "fast" extra
+    orjson = None
 
-def load_news_items(path: Path) -> list[dict[str, Any]]:
+_READ_CHUNK = 1 << 20
+_WRITE_BATCH = 4096
+
+
+class JsonCodec:
+    """stdlib json; lines keep the ``json.dumps(..., ensure_ascii=False)`` format."""
+
+    name = "json"
+
+    def __init__(self) -> None:
+        # json.dumps/loads build a new encoder/decoder per call for non-default
+        # options; reuse one of each instead.
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+        self._decode = json.JSONDecoder().decode
+
+    def loads(self, raw: bytes) -> Any:
+        return self._decode(raw.decode("utf-8"))
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encode(value).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson; compact separators, otherwise the same JSON (UTF-8, no ASCII escaping)."""
+
+    name = "orjson"
+
+    def loads(self, raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+
+def get_codec(name: str | None = "json") -> JsonCodec:
+    # orjson is opt-in: its compact separators would rewrite every line of an
+    # archive written by json, so switching codecs has to be a deliberate step.
+    if name in (None, "json"):
+        return JsonCodec()
+    if name == "auto":
+        return OrjsonCodec() if orjson is not None else JsonCodec()
+    if name == "orjson":
+        if orjson is None:
+            raise RuntimeError("storage.codec 'orjson' requires the orjson package")
+        return OrjsonCodec()
+    raise ValueError(f"Unknown storage codec: {name}")
+
+
+def iter_news_items(path: Path, *, codec: JsonCodec | None = None) -> Iterator[dict[str, Any]]:
     if not path.exists():
-        return []
-    items: list[dict[str, Any]] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            raw = line.strip()
-            if not raw:
-                continue
-            try:
-                items.append(json.loads(raw))
-            except json.JSONDecodeError:
-                continue
+        return
+    codec = codec or get_codec()
+    # Bulk reads split into lines in one go instead of a readline per record.
+    with path.open("rb") as handle:
+        pending = b""
+        while True:
+            chunk = handle.read(_READ_CHUNK)
+            if not chunk:
+                lines = [pending]
+            else:
+                lines = (pending + chunk).splitlines()
+                pending = b"" if chunk.endswith((b"\n", b"\r")) else lines.pop()
+            for line in lines:
+                raw = line.strip()
+                if not raw:
+                    continue
+                try:
+                    yield codec.loads(raw)
+                except ValueError:
+                    continue
+            if not chunk:
+                return
+
+
+def load_news_items(path: Path, *, codec: JsonCodec | None = None) -> list[dict[str, Any]]:
+    return list(iter_news_items(path, codec=codec))
+
+
+def load_news_records(path: Path, *, codec: JsonCodec | None = None) -> list[NewsItem]:
+    # Slotted records with interned repeated fields; several times smaller
+    # than the equivalent dicts for a large archive.
+    return [NewsItem.from_dict(item) for item in iter_news_items(path, codec=codec)]
+
+
+def write_lines(
+    handle: BinaryIO, items: Iterable[dict[str, Any] | NewsItem], codec: JsonCodec
+) -> None:
+    # Encoded lines are joined and written in large chunks.
+    batch: list[bytes] = []
+    for item in items:
+        batch.append(codec.dumps(item.to_dict() if isinstance(item, NewsItem) else item))
+        if len(batch) >= _WRITE_BATCH:
+            handle.write(b"\n".join(batch) + b"\n")
+            batch = []
+    if batch:
+        handle.write(b"\n".join(batch) + b"\n")
+
+
+def apply_retention(
+    items: list[dict[str, Any]], retention: dict[str, Any]
+) -> list[dict[str, Any]]:
+    # Expects items sorted newest first.
+    if not retention.get("enabled"):
+        return items
+
+    max_items = retention.get("max_items")
+    if isinstance(max_items, int) and max_items > 0:
+        items = items[:max_items]
+
+    days = retention.get("days")
+    if isinstance(days, int) and days > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        items = [
+            item
+            for item in items
+            if (item.get("published_at") or "") >= cutoff.isoformat()
+        ]
     return items
 
 
+def _published_key(item: dict[str, Any] | NewsItem) -> str:
+    return item.get("published_at") or ""
+
+
+def merge_retained(
+    existing: Iterable[dict[str, Any] | NewsItem],
+    new_items: Iterable[dict[str, Any] | NewsItem],
+    retention: dict[str, Any],
+    *,
+    dropped: Callable[[dict[str, Any] | NewsItem], None] | None = None,
+) -> Iterator[dict[str, Any] | NewsItem]:
+    # Both inputs newest first. Streaming equivalent of sorting
+    # ``existing + new_items`` (ties keep existing items first) and then
+    # ``apply_retention``: everything after max_items or the first item older
+    # than the days cutoff is cut. Cut items are passed to ``dropped`` when
+    # given; otherwise the rest of ``existing`` is left unread.
+    merged = heapq.merge(existing, new_items, key=_published_key, reverse=True)
+    limit = cutoff = None
+    if retention.get("enabled"):
+        max_items = retention.get("max_items")
+        if isinstance(max_items, int) and max_items > 0:
+            limit = max_items
+        days = retention.get("days")
+        if isinstance(days, int) and days > 0:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+    for count, item in enumerate(merged):
+        if (limit is not None and count >= limit) or (
+            cutoff is not None and _published_key(item) < cutoff
+        ):
+            if dropped is None:
+                return
+            dropped(item)
+            for item in merged:
+                dropped(item)
+            return
+        yield item
+
+
+class UnsortedCorpusError(Exception):
+    """Raised when a corpus expected to be newest first is not."""
+
+
+class _NewestFirstReader:
+    # Streams a corpus while checking its order and counting what was read.
+    def __init__(self, items: Iterable[dict[str, Any]]) -> None:
+        self.items = iter(items)
+        self.count = 0
+        self.previous: str | None = None
+
+    def __iter__(self) -> _NewestFirstReader:
+        return self
+
+    def __next__(self) -> dict[str, Any]:
+        item = next(self.items)
+        key = _published_key(item)
+        if self.previous is not None and key > self.previous:
+            raise UnsortedCorpusError(f"item {self.count + 1} is newer than the one before it")
+        self.previous = key
+        self.count += 1
+        return item
+
+
 def load_index(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {}
@@ -33,42 +210,415 @@ def load_index(path: Path) -> dict[str, Any]:
         return {}
 
 
-def write_news_items(path: Path, items: list[dict[str, Any]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        for item in items:
-            handle.write(json.dumps(item, ensure_ascii=False) + "\n")
+def load_id_index(
+    data_path: Path,
+    *,
+    items: Iterable[dict[str, Any]] | None = None,
+    bloom_bits_per_item: int = 0,
+    codec: JsonCodec | None = None,
+) -> IdIndex:
+    # <name>.idx next to the corpus; rebuilt (from ``items`` when the caller
+    # already holds them, otherwise by streaming the file) if it describes a
+    # different version of the corpus.
+    index = IdIndex(
+        data_path.with_suffix(".idx"), bloom_bits_per_item=bloom_bits_per_item
+    ).open()
+    data_size = data_path.stat().st_size if data_path.exists() else 0
+    if index.source_size != data_size:
+        source = items if items is not None else iter_news_items(data_path, codec=codec)
+        index.rebuild((item.get("id") for item in source if item.get("id")), data_size)
+    return index
 
 
-def write_index(
+def write_news_items(
     path: Path,
-    items: list[dict[str, Any]],
+    items: Iterable[dict[str, Any] | NewsItem],
     *,
-    source_stats: dict[str, Any] | None = None,
-    state: dict[str, Any] | None = None,
-    alerts: list[dict[str, Any]] | None = None,
+    codec: JsonCodec | None = None,
 ) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        write_lines(handle, items, codec or get_codec())
+
+
+def count_by_source(items: Iterable[dict[str, Any]]) -> dict[str, int]:
     sources: dict[str, int] = {}
     for item in items:
         source_id = item.get("source_id")
         if not source_id:
             continue
         sources[source_id] = sources.get(source_id, 0) + 1
+    return sources
 
+
+def write_index(
+    path: Path,
+    items: list[dict[str, Any]],
+    *,
+    source_stats: dict[str, Any] | None = None,
+    state: dict[str, Any] | None = None,
+    alerts: list[dict[str, Any]] | None = None,
+    run_stats: dict[str, Any] | None = None,
+    total: int | None = None,
+    sources: dict[str, int] | None = None,
+    storage: dict[str, Any] | None = None,
+) -> None:
+    # Callers that never hold the whole corpus pass total/sources directly.
+    # ``storage`` tells the site where to read an archive that is not the
+    # single news.jsonl next to the index.
+    if sources is None:
+        sources = count_by_source(items)
     payload = {
         "generated_at": parse_datetime(None),
-        "total": len(items),
+        "total": len(items) if total is None else total,
         "sources": sources,
     }
     if source_stats is not None:
         payload["last_run"] = {
             "completed_at": parse_datetime(None),
             "sources": source_stats,
+            **(run_stats or {}),
         }
     if state is not None:
         payload["state"] = state
     if alerts is not None:
         payload["alerts"] = alerts
+    if storage is not None:
+        payload["storage"] = storage
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as handle:
         json.dump(payload, handle, ensure_ascii=False, indent=2)
+
+
+class NewsStore:
+    """Backend contract used by ``crawl()``.
+
+    ``ids`` answers dedup membership without the caller loading the corpus,
+    ``add_items`` persists one run's new records (applying retention where the
+    backend does it), and ``load_news_items`` / ``write_news_items`` /
+    ``write_index`` mirror the module-level JSONL functions.
+    """
+
+    path: Path
+    ids: Container[str]
+
+    def load(self) -> NewsStore:
+        return self
+
+    @property
+    def sources(self) -> dict[str, int]:
+        raise NotImplementedError
+
+    @property
+    def total(self) -> int:
+        return sum(self.sources.values())
+
+    def exists(self) -> bool:
+        """Whether a previous run stored anything (a fresh corpus is fetched in full)."""
+        return self.total > 0
+
+    def load_news_items(self) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    def write_news_items(self, items: list[dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def add_items(self, items: list[dict[str, Any]], retention: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def write_index(self, path: Path, **kwargs: Any) -> None:
+        write_index(path, [], total=self.total, sources=self.sources, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlStore(NewsStore):
+    """The original layout: one newest-first ``news.jsonl``, rewritten on every run.
+
+    A run streams the file through ``merge_retained`` with the sorted new batch
+    into a temporary file, so the corpus is never held in memory; per-source
+    counts are taken from that same stream. A file that turns out not to be
+    sorted (edited by hand) is sorted in full once instead.
+    """
+
+    def __init__(
+        self, path: Path, *, bloom_bits_per_item: int = 0, codec: JsonCodec | None = None
+    ) -> None:
+        self.path = path
+        self.bloom_bits_per_item = bloom_bits_per_item
+        self.codec = codec or get_codec()
+        self._sources: dict[str, int] | None = None
+        self._total = 0
+
+    def load(self) -> JsonlStore:
+        self.ids = load_id_index(
+            self.path, bloom_bits_per_item=self.bloom_bits_per_item, codec=self.codec
+        )
+        return self
+
+    def _tally(
+        self, items: Iterable[dict[str, Any] | NewsItem]
+    ) -> Iterator[dict[str, Any] | NewsItem]:
+        sources: dict[str, int] = {}
+        total = 0
+        for item in items:
+            total += 1
+            source_id = item.get("source_id")
+            if source_id:
+                sources[source_id] = sources.get(source_id, 0) + 1
+            yield item
+        self._sources, self._total = sources, total
+
+    def _count(self) -> None:
+        for _ in self._tally(iter_news_items(self.path, codec=self.codec)):
+            pass
+
+    @property
+    def sources(self) -> dict[str, int]:
+        if self._sources is None:
+            self._count()
+        return self._sources
+
+    @property
+    def total(self) -> int:
+        if self._sources is None:
+            self._count()
+        return self._total
+
+    def exists(self) -> bool:
+        # Counting would read the whole file.
+        return self.path.exists()
+
+    def load_news_items(self) -> list[dict[str, Any]]:
+        return load_news_items(self.path, codec=self.codec)
+
+    def _replace(self, items: Iterable[dict[str, Any] | NewsItem]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with tmp_path.open("wb") as handle:
+                write_lines(handle, self._tally(items), self.codec)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, self.path)
+
+    def _rebuild_ids(self) -> None:
+        self.ids.rebuild(
+            (item["id"] for item in iter_news_items(self.path, codec=self.codec) if item.get("id")),
+            self.path.stat().st_size,
+        )
+
+    def write_news_items(self, items: Iterable[dict[str, Any] | NewsItem]) -> None:
+        self._replace(items)
+        self._rebuild_ids()
+
+    def add_items(self, items: list[dict[str, Any]], retention: dict[str, Any]) -> None:
+        new_items = sorted(
+            (NewsItem.from_dict(item) for item in items), key=_published_key, reverse=True
+        )
+        # Items past the retention cut are still read, to confirm the order and
+        # to take their ids out of the index.
+        dropped_ids: list[str] = []
+        existing = _NewestFirstReader(iter_news_items(self.path, codec=self.codec))
+        try:
+            self._replace(
+                merge_retained(
+                    existing,
+                    new_items,
+                    retention,
+                    dropped=lambda item: dropped_ids.append(item.get("id")),
+                )
+            )
+        except UnsortedCorpusError as exc:
+            logging.warning("%s is not sorted newest first (%s); sorting it in full", self.path, exc)
+            combined = load_news_records(self.path, codec=self.codec) + new_items
+            combined.sort(key=_published_key, reverse=True)
+            self.write_news_items(apply_retention(combined, retention))
+            return
+
+        for item in new_items:
+            self.ids.add(item.id)
+        self.ids.discard(item_id for item_id in dropped_ids if item_id)
+        self.ids.save(self.path.stat().st_size)
+
+
+class IncrementalStore(NewsStore):
+    """Append-only ``news.jsonl`` with a sidecar id index and running per-source counts.
+
+    New records are appended as-is; sorting and retention happen in ``compact``,
+    which runs once ``compact_after_items`` records have piled up since the last
+    compaction. ``<name>.meta.json`` and ``<name>.idx`` remember the data file
+    size they describe, so an externally edited corpus is detected and the
+    sidecars rebuilt.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        compact_after_items: int = 2000,
+        bloom_bits_per_item: int = 0,
+        codec: JsonCodec | None = None,
+    ) -> None:
+        self.path = path
+        self.codec = codec or get_codec()
+        self.meta_path = path.with_suffix(".meta.json")
+        self.compact_after_items = compact_after_items
+        self.ids = IdIndex(path.with_suffix(".idx"), bloom_bits_per_item=bloom_bits_per_item)
+        self._sources: dict[str, int] = {}
+        self.appended_since_compaction = 0
+        self.compacted_at: str | None = None
+
+    @property
+    def sources(self) -> dict[str, int]:
+        return self._sources
+
+    def _data_size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def load(self) -> IncrementalStore:
+        meta = load_index(self.meta_path)
+        self.appended_since_compaction = int(meta.get("appended_since_compaction", 0))
+        self.compacted_at = meta.get("compacted_at")
+        self.ids.open()
+        data_size = self._data_size()
+        if meta.get("data_size") == data_size and self.ids.source_size == data_size:
+            self._sources = dict(meta.get("sources") or {})
+        else:
+            items = iter_news_items(self.path, codec=self.codec)
+            if not meta:
+                # The sidecars are git-ignored, so a fresh checkout has no meta
+                # file; the records after the sorted head are the appends that
+                # still wait for compaction.
+                items = self._count_appended(items)
+            self._rebuild(items)
+        return self
+
+    def _count_appended(self, items: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        self.appended_since_compaction = 0
+        previous: str | None = None
+        for item in items:
+            published_at = item.get("published_at") or ""
+            if self.appended_since_compaction or (previous is not None and published_at > previous):
+                self.appended_since_compaction += 1
+            previous = published_at
+            yield item
+
+    def _rebuild(self, items: Iterable[dict[str, Any]]) -> None:
+        item_ids: list[str] = []
+        self._sources = {}
+        for item in items:
+            item_id = item.get("id")
+            if item_id:
+                item_ids.append(item_id)
+            source_id = item.get("source_id")
+            if source_id:
+                self._sources[source_id] = self._sources.get(source_id, 0) + 1
+        self.ids.rebuild(item_ids, self._data_size())
+        # Superseded by the binary .idx sidecar.
+        self.path.with_suffix(".ids").unlink(missing_ok=True)
+        self._save_meta()
+
+    def _save_meta(self) -> None:
+        payload = {
+            "data_size": self._data_size(),
+            "total": self.total,
+            "sources": self.sources,
+            "appended_since_compaction": self.appended_since_compaction,
+            "compacted_at": self.compacted_at,
+        }
+        with self.meta_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False, indent=2)
+
+    def append(self, items: list[dict[str, Any]]) -> None:
+        if not items:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as handle:
+            write_lines(handle, items, self.codec)
+        for item in items:
+            self.ids.add(item.get("id"))
+            source_id = item.get("source_id")
+            if source_id:
+                self._sources[source_id] = self._sources.get(source_id, 0) + 1
+        self.appended_since_compaction += len(items)
+        self.ids.save(self._data_size())
+        self._save_meta()
+
+    def due_for_compaction(self) -> bool:
+        return self.compact_after_items > 0 and (
+            self.appended_since_compaction >= self.compact_after_items
+        )
+
+    def compact(self, retention: dict[str, Any]) -> None:
+        items = load_news_records(self.path, codec=self.codec)
+        items.sort(key=lambda item: item.published_at or "", reverse=True)
+        items = apply_retention(items, retention)
+        write_news_items(self.path, items, codec=self.codec)
+        self.appended_since_compaction = 0
+        self.compacted_at = parse_datetime(None)
+        self._rebuild(items)
+
+    def load_news_items(self) -> list[dict[str, Any]]:
+        return load_news_items(self.path, codec=self.codec)
+
+    def write_news_items(self, items: list[dict[str, Any]]) -> None:
+        write_news_items(self.path, items, codec=self.codec)
+        self.appended_since_compaction = 0
+        self._rebuild(items)
+
+    def add_items(self, items: list[dict[str, Any]], retention: dict[str, Any]) -> None:
+        self.append(items)
+        if self.due_for_compaction():
+            logging.info("Compacting %s", self.path)
+            self.compact(retention)
+
+
+def partition_root(data_path: Path, storage: dict[str, Any]) -> Path:
+    partition_dir = storage.get("partition_dir")
+    return Path(partition_dir) if partition_dir else data_path.with_suffix("")
+
+
+def data_files(data_path: Path, storage: dict[str, Any]) -> list[Path]:
+    """JSONL files holding the archive: its partitions (newest first) or ``data_path``."""
+    if storage.get("mode") == "partitioned":
+        from .partitioned_store import partition_files
+
+        return partition_files(partition_root(data_path, storage))
+    return [data_path]
+
+
+def open_store(data_path: Path, storage: dict[str, Any]) -> NewsStore:
+    mode = storage.get("mode", "full")
+    bloom_bits_per_item = int(storage.get("bloom_bits_per_item", 0))
+    codec = get_codec(storage.get("codec", "json"))
+    if mode == "incremental":
+        store: NewsStore = IncrementalStore(
+            data_path,
+            compact_after_items=int(storage.get("compact_after_items", 2000)),
+            bloom_bits_per_item=bloom_bits_per_item,
+            codec=codec,
+        )
+    elif mode == "partitioned":
+        from .partitioned_store import PartitionedStore
+
+        store = PartitionedStore(
+            partition_root(data_path, storage),
+            bloom_bits_per_item=bloom_bits_per_item,
+            codec=codec,
+        )
+    elif mode == "sqlite":
+        from .sqlite_store import SqliteStore
+
+        sqlite_path = storage.get("sqlite_path")
+        store = SqliteStore(
+            Path(sqlite_path) if sqlite_path else data_path.with_suffix(".sqlite3"),
+            export_path=data_path if storage.get("export_jsonl", True) else None,
+            import_path=data_path,
+            codec=codec,
+        )
+    else:
+        store = JsonlStore(data_path, bloom_bits_per_item=bloom_bits_per_item, codec=codec)
+    return store.load()
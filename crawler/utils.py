@@ -2,15 +2,21 @@ from __future__ import annotations
 
 import hashlib
 import logging
-import time
+import re
 from datetime import datetime, timezone
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import httpx
 from dateutil import parser as date_parser
 
+from .http_cache import CacheScope
+from .json_stream import JsonItemStream
+from .ratelimit import HostRateLimiter
+from .retry import RetryPolicy
+
 
 def sha256_text(value: str) -> str:
     return hashlib.sha256(value.encode("utf-8")).hexdigest()
@@ -29,10 +35,24 @@ TRACKING_PARAMS = {
 }
 
 
+# Plain http(s) links without query, fragment or params (most list-page links)
+# canonicalize to the lower-cased origin plus the path; anything else goes
+# through the full urlparse round trip below.
+_PLAIN_URL = re.compile(r"(https?)://([^/?#;\[\]\\\s]+)(/[^?#;\\\s]*)?", re.ASCII)
+
+
+@lru_cache(maxsize=1024)
+def _origin(scheme: str, netloc: str) -> str:
+    return f"{scheme}://{netloc.lower()}"
+
+
 def canonicalize_url(url: str) -> str:
     if not url:
         return url
     raw = url.strip()
+    plain = _PLAIN_URL.fullmatch(raw) if raw.isascii() else None
+    if plain:
+        return _origin(plain.group(1), plain.group(2)) + (plain.group(3) or "").rstrip("/")
     parsed = urlparse(raw)
     if not parsed.scheme and not parsed.netloc:
         return raw
@@ -52,6 +72,20 @@ def canonicalize_url(url: str) -> str:
     return urlunparse((scheme, netloc, path.rstrip("/"), "", query, ""))
 
 
+def news_item_id(source_id: str, url: str | None) -> str:
+    # The id the pipeline gives a raw item when normalizing it.
+    return sha256_text(f"{source_id}:{canonicalize_url((url or '').strip())}")
+
+
+def published_timezone(config: dict[str, Any]) -> str | None:
+    # Chinese sources publish local dates without an offset.
+    name = config.get("published_timezone")
+    if not name and config.get("region") == "CN":
+        return "Asia/Shanghai"
+    return name
+
+
+@lru_cache(maxsize=None)
 def _resolve_timezone(name: str | None) -> timezone | ZoneInfo | None:
     if not name:
         return None
@@ -65,17 +99,21 @@ def _resolve_timezone(name: str | None) -> timezone | ZoneInfo | None:
         return timezone.utc
 
 
-def parse_datetime(value: Any, *, default_timezone: str | None = None, fmt: str | None = None) -> str:
-    if value is None or value == "":
-        return datetime.now(timezone.utc).isoformat()
-    if isinstance(value, datetime):
-        dt = value
-    else:
-        text = str(value).strip()
-        if fmt:
-            dt = datetime.strptime(text, fmt)
-        else:
-            dt = date_parser.parse(text)
+# Regex equivalents of the numeric ``published_format`` patterns used by the
+# sources; strptime stays the fallback (and the error path) for everything else.
+_FORMAT_PATTERNS = {
+    "%Y-%m-%d": re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"),
+    "%Y/%m/%d": re.compile(r"(\d{4})/(\d{1,2})/(\d{1,2})"),
+    "%Y.%m.%d": re.compile(r"(\d{4})\.(\d{1,2})\.(\d{1,2})"),
+    "%Y-%m-%d %H:%M": re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2})"),
+    "%Y-%m-%d %H:%M:%S": re.compile(
+        r"(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2}):(\d{1,2})"
+    ),
+}
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _to_utc(dt: datetime, default_timezone: str | None) -> str:
     if dt.tzinfo is None:
         tzinfo = _resolve_timezone(default_timezone) or timezone.utc
         dt = dt.replace(tzinfo=tzinfo)
@@ -83,26 +121,110 @@ def parse_datetime(value: Any, *, default_timezone: str | None = None, fmt: str
     return dt.isoformat()
 
 
-def fetch_text(
+@lru_cache(maxsize=8192)
+def _parse_text(text: str, fmt: str | None, default_timezone: str | None) -> str:
+    # List pages repeat the same few dates, so results are cached per
+    # (text, fmt, tz); failures raise and are simply not cached.
+    if fmt:
+        pattern = _FORMAT_PATTERNS.get(fmt)
+        match = pattern.fullmatch(text) if pattern else None
+        if match:
+            dt = datetime(*map(int, match.groups()))
+        else:
+            dt = datetime.strptime(text, fmt)
+    else:
+        dt = None
+        if _ISO_DATE.match(text):
+            try:
+                dt = datetime.fromisoformat(text)
+            except ValueError:
+                pass
+        if dt is None:
+            dt = date_parser.parse(text)
+    return _to_utc(dt, default_timezone)
+
+
+def parse_datetime(
+    value: Any,
+    *,
+    default_timezone: str | None = None,
+    fmt: str | None = None,
+    now: str | None = None,
+) -> str:
+    """Normalize ``value`` to an ISO-8601 UTC string.
+
+    Empty values map to ``now`` (a run-level timestamp from the caller) or the
+    current time.
+    """
+    if value is None or value == "":
+        return now or datetime.now(timezone.utc).isoformat()
+    if isinstance(value, datetime):
+        return _to_utc(value, default_timezone)
+    return _parse_text(str(value).strip(), fmt or None, default_timezone)
+
+
+# JSON helpers also retry a body that fails to decode (truncated transfer).
+_JSON_ERRORS = (httpx.RequestError, httpx.HTTPStatusError, ValueError)
+
+
+def _policy(retry: RetryPolicy | None, max_retries: int, backoff_sec: float) -> RetryPolicy:
+    return retry if retry is not None else RetryPolicy(max_retries, backoff_sec)
+
+
+def fetch_response(
     client: httpx.Client,
     url: str,
     headers: dict[str, str],
     timeout: float,
     max_retries: int,
     backoff_sec: float,
-) -> str:
-    last_error: Exception | None = None
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = client.get(url, headers=headers, timeout=timeout)
+    *,
+    limiter: HostRateLimiter | None = None,
+    cache: CacheScope | None = None,
+    retry: RetryPolicy | None = None,
+) -> httpx.Response | None:
+    # With a cache scope, returns None when the server answers 304 or the body
+    # hash matches the previous run, so callers can skip parsing entirely.
+    def attempt() -> httpx.Response | None:
+        request_headers = headers
+        if cache is not None:
+            request_headers = {**headers, **cache.conditional_headers(url)}
+        response = client.get(url, headers=request_headers, timeout=timeout)
+        if cache is None or response.status_code != 304:
             response.raise_for_status()
-            return response.text
-        except (httpx.RequestError, httpx.HTTPStatusError) as exc:
-            last_error = exc
-            logging.warning("Request failed (%s/%s) %s: %s", attempt, max_retries, url, exc)
-            if attempt < max_retries:
-                time.sleep(backoff_sec * attempt)
-    raise RuntimeError(f"Failed to fetch {url}") from last_error
+        if cache is not None and not cache.record(url, response):
+            return None
+        return response
+
+    return _policy(retry, max_retries, backoff_sec).call(
+        url, attempt, acquire=limiter.acquire if limiter is not None else None
+    )
+
+
+def fetch_text(
+    client: httpx.Client,
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    max_retries: int,
+    backoff_sec: float,
+    *,
+    limiter: HostRateLimiter | None = None,
+    cache: CacheScope | None = None,
+    retry: RetryPolicy | None = None,
+) -> str | None:
+    response = fetch_response(
+        client,
+        url,
+        headers,
+        timeout,
+        max_retries,
+        backoff_sec,
+        limiter=limiter,
+        cache=cache,
+        retry=retry,
+    )
+    return response.text if response is not None else None
 
 
 def fetch_json(
@@ -113,16 +235,155 @@ def fetch_json(
     max_retries: int,
     backoff_sec: float,
     params: dict[str, Any] | None = None,
+    *,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
 ) -> Any:
-    last_error: Exception | None = None
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = client.get(url, headers=headers, params=params, timeout=timeout)
+    def attempt() -> Any:
+        response = client.get(url, headers=headers, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    return _policy(retry, max_retries, backoff_sec).call(
+        url,
+        attempt,
+        errors=_JSON_ERRORS,
+        acquire=limiter.acquire if limiter is not None else None,
+    )
+
+
+def fetch_json_stream(
+    client: httpx.Client,
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    max_retries: int,
+    backoff_sec: float,
+    params: dict[str, Any] | None = None,
+    *,
+    new_stream: Callable[[], JsonItemStream],
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+) -> JsonItemStream:
+    # Like fetch_json, but the body is read by ``new_stream()`` chunk by chunk
+    # instead of being loaded whole; a retry starts over with a fresh stream.
+    def attempt() -> JsonItemStream:
+        stream = new_stream()
+        with client.stream("GET", url, headers=headers, params=params, timeout=timeout) as response:
+            response.raise_for_status()
+            return stream.read(response.iter_bytes())
+
+    return _policy(retry, max_retries, backoff_sec).call(
+        url,
+        attempt,
+        errors=_JSON_ERRORS,
+        acquire=limiter.acquire if limiter is not None else None,
+    )
+
+
+async def fetch_response_async(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    max_retries: int,
+    backoff_sec: float,
+    *,
+    limiter: HostRateLimiter | None = None,
+    cache: CacheScope | None = None,
+    retry: RetryPolicy | None = None,
+) -> httpx.Response | None:
+    async def attempt() -> httpx.Response | None:
+        request_headers = headers
+        if cache is not None:
+            request_headers = {**headers, **cache.conditional_headers(url)}
+        response = await client.get(url, headers=request_headers, timeout=timeout)
+        if cache is None or response.status_code != 304:
+            response.raise_for_status()
+        if cache is not None and not cache.record(url, response):
+            return None
+        return response
+
+    return await _policy(retry, max_retries, backoff_sec).call_async(
+        url, attempt, acquire=limiter.acquire_async if limiter is not None else None
+    )
+
+
+async def fetch_text_async(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    max_retries: int,
+    backoff_sec: float,
+    *,
+    limiter: HostRateLimiter | None = None,
+    cache: CacheScope | None = None,
+    retry: RetryPolicy | None = None,
+) -> str | None:
+    response = await fetch_response_async(
+        client,
+        url,
+        headers,
+        timeout,
+        max_retries,
+        backoff_sec,
+        limiter=limiter,
+        cache=cache,
+        retry=retry,
+    )
+    return response.text if response is not None else None
+
+
+async def fetch_json_async(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    max_retries: int,
+    backoff_sec: float,
+    params: dict[str, Any] | None = None,
+    *,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+) -> Any:
+    async def attempt() -> Any:
+        response = await client.get(url, headers=headers, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    return await _policy(retry, max_retries, backoff_sec).call_async(
+        url,
+        attempt,
+        errors=_JSON_ERRORS,
+        acquire=limiter.acquire_async if limiter is not None else None,
+    )
+
+
+async def fetch_json_stream_async(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    timeout: float,
+    max_retries: int,
+    backoff_sec: float,
+    params: dict[str, Any] | None = None,
+    *,
+    new_stream: Callable[[], JsonItemStream],
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+) -> JsonItemStream:
+    async def attempt() -> JsonItemStream:
+        stream = new_stream()
+        async with client.stream(
+            "GET", url, headers=headers, params=params, timeout=timeout
+        ) as response:
             response.raise_for_status()
-            return response.json()
-        except (httpx.RequestError, httpx.HTTPStatusError, ValueError) as exc:
-            last_error = exc
-            logging.warning("Request failed (%s/%s) %s: %s", attempt, max_retries, url, exc)
-            if attempt < max_retries:
-                time.sleep(backoff_sec * attempt)
-    raise RuntimeError(f"Failed to fetch {url}") from last_error
+            return await stream.read_async(response.aiter_bytes())
+
+    return await _policy(retry, max_retries, backoff_sec).call_async(
+        url,
+        attempt,
+        errors=_JSON_ERRORS,
+        acquire=limiter.acquire_async if limiter is not None else None,
+    )
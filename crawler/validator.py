@@ -1,47 +1,224 @@
 from __future__ import annotations
 
+import bisect
+import heapq
 import json
+import logging
+import os
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Iterator
 
+from .config import load_settings
+from .id_index import id_digest
+from .storage import data_files
 from .utils import parse_datetime
 
 REQUIRED_FIELDS = ["id", "source_id", "source_name", "title", "url", "published_at"]
 
+# One sort record: 32-byte id digest followed by the big-endian line number, so
+# plain bytes ordering groups equal ids together, earliest line first.
+_LINE = struct.Struct(">Q")
+_RECORD_SIZE = 32 + _LINE.size
+_RUN_RECORDS = 500_000
 
-def validate(data_path: str) -> None:
-    file_path = Path(data_path)
-    if not file_path.exists():
-        raise SystemExit("data file not found")
+# Errors sort by (line, rank) to match the order of a single sequential pass:
+# schema errors, then the duplicate check, then the date check.
+_FIELD_ERROR, _DUPLICATE_ERROR, _DATE_ERROR = 0, 1, 2
 
-    ids: set[str] = set()
-    errors: list[str] = []
 
-    with file_path.open("r", encoding="utf-8") as handle:
-        for line_no, line in enumerate(handle, start=1):
+def _valid_published_at(value: Any) -> bool:
+    # Fast path: everything the crawler writes is strict ISO-8601.
+    if isinstance(value, str):
+        try:
+            datetime.fromisoformat(value)
+            return True
+        except ValueError:
+            pass
+    try:
+        datetime.fromisoformat(parse_datetime(value))
+    except ValueError:
+        return False
+    return True
+
+
+def _write_run(records: list[bytes], directory: str) -> str:
+    records.sort()
+    handle, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(handle, "wb") as run:
+        run.write(b"".join(records))
+    return path
+
+
+def _validate_range(
+    data_path: str, start: int, end: int, run_dir: str
+) -> tuple[list[tuple[int, int, str]], int, list[str]]:
+    """Validate lines in ``[start, end)``; line numbers are local to the range."""
+    errors: list[tuple[int, int, str]] = []
+    runs: list[str] = []
+    records: list[bytes] = []
+    line_no = 0
+    position = start
+    with open(data_path, "rb") as handle:
+        handle.seek(start)
+        while position < end:
+            line = handle.readline()
+            if not line:
+                break
+            position += len(line)
+            line_no += 1
             raw = line.strip()
             if not raw:
                 continue
             try:
                 item = json.loads(raw)
-            except json.JSONDecodeError:
-                errors.append(f"Line {line_no}: invalid json")
+            except ValueError:
+                item = None
+            if not isinstance(item, dict):
+                errors.append((line_no, _FIELD_ERROR, "invalid json"))
                 continue
 
             for field in REQUIRED_FIELDS:
                 if not item.get(field):
-                    errors.append(f"Line {line_no}: missing {field}")
+                    errors.append((line_no, _FIELD_ERROR, f"missing {field}"))
 
             item_id = item.get("id")
             if item_id:
-                if item_id in ids:
-                    errors.append(f"Line {line_no}: duplicate id {item_id}")
-                ids.add(item_id)
+                records.append(id_digest(str(item_id)) + _LINE.pack(line_no))
+                if len(records) >= _RUN_RECORDS:
+                    runs.append(_write_run(records, run_dir))
+                    records = []
 
-            try:
-                datetime.fromisoformat(parse_datetime(item.get("published_at")))
-            except ValueError:
-                errors.append(f"Line {line_no}: invalid published_at")
+            if not _valid_published_at(item.get("published_at")):
+                errors.append((line_no, _DATE_ERROR, "invalid published_at"))
+    if records:
+        runs.append(_write_run(records, run_dir))
+    return errors, line_no, runs
+
+
+def _read_run(path: str, line_offset: int) -> Iterator[tuple[bytes, int]]:
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(_RECORD_SIZE * 4096)
+            if not chunk:
+                return
+            for offset in range(0, len(chunk), _RECORD_SIZE):
+                record = chunk[offset : offset + _RECORD_SIZE]
+                yield record[:32], _LINE.unpack(record[32:])[0] + line_offset
+
+
+def _split_ranges(path: Path, workers: int) -> list[tuple[int, int]]:
+    size = path.stat().st_size
+    boundaries = [0]
+    with path.open("rb") as handle:
+        for part in range(1, workers):
+            handle.seek(size * part // workers)
+            handle.readline()
+            boundary = min(handle.tell(), size)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    if size > boundaries[-1]:
+        boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _ids_at(path: Path, line_numbers: set[int]) -> dict[int, str]:
+    ids: dict[int, str] = {}
+    with path.open("rb") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if line_no in line_numbers:
+                ids[line_no] = str(json.loads(line).get("id"))
+    return ids
+
+
+def validate(data_path: str, *, workers: int = 1, storage: dict[str, Any] | None = None) -> None:
+    # A partitioned archive is validated across all of its month files, with
+    # one duplicate check over the whole set.
+    if storage is None:
+        storage = load_settings().get("storage", {})
+    files = data_files(Path(data_path), storage)
+    if not files or not all(path.exists() for path in files):
+        raise SystemExit("data file not found")
+
+    started = time.perf_counter()
+    tasks = [
+        (path, start, end) for path in files for start, end in _split_ranges(path, max(1, workers))
+    ]
+    errors: list[tuple[int, int, str]] = []
+    # (first global line, path) per file, to report errors against the file.
+    offsets: list[tuple[int, Path]] = []
+    total_lines = 0
+
+    with tempfile.TemporaryDirectory(prefix="validate-") as run_dir:
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                results = list(
+                    pool.map(
+                        _validate_range,
+                        [str(path) for path, _, _ in tasks],
+                        [start for _, start, _ in tasks],
+                        [end for _, _, end in tasks],
+                        [run_dir] * len(tasks),
+                    )
+                )
+        else:
+            results = [_validate_range(str(path), start, end, run_dir) for path, start, end in tasks]
+
+        streams = []
+        for (path, _, _), (range_errors, line_count, runs) in zip(tasks, results):
+            if not offsets or offsets[-1][1] != path:
+                offsets.append((total_lines, path))
+            errors.extend((line_no + total_lines, rank, message) for line_no, rank, message in range_errors)
+            streams.extend(_read_run(run, total_lines) for run in runs)
+            total_lines += line_count
+
+        # External-sort duplicate check: every occurrence after the first is an error.
+        duplicate_lines: set[int] = set()
+        previous = None
+        for digest, line_no in heapq.merge(*streams):
+            if digest == previous:
+                duplicate_lines.add(line_no)
+            previous = digest
+
+    def locate(line_no: int) -> tuple[Path, int]:
+        index = bisect.bisect_left(offsets, line_no, key=lambda entry: entry[0]) - 1
+        first, path = offsets[index]
+        return path, line_no - first
+
+    if duplicate_lines:
+        by_file: dict[Path, dict[int, int]] = {}
+        for line_no in duplicate_lines:
+            path, local = locate(line_no)
+            by_file.setdefault(path, {})[local] = line_no
+        for path, lines in by_file.items():
+            duplicate_ids = _ids_at(path, set(lines))
+            errors.extend(
+                (line_no, _DUPLICATE_ERROR, f"duplicate id {duplicate_ids[local]}")
+                for local, line_no in lines.items()
+            )
+
+    elapsed = time.perf_counter() - started
+    logging.info(
+        "Validated %s lines in %s files in %.2fs (%.0f lines/sec, workers=%s)",
+        total_lines,
+        len(files),
+        elapsed,
+        total_lines / elapsed if elapsed > 0 else 0.0,
+        max(1, workers),
+    )
 
     if errors:
-        raise SystemExit("\n".join(errors))
+        errors.sort(key=lambda error: error[:2])
+        if len(files) == 1:
+            raise SystemExit(
+                "\n".join(f"Line {line_no}: {message}" for line_no, _, message in errors)
+            )
+        lines = []
+        for line_no, _, message in errors:
+            path, local = locate(line_no)
+            lines.append(f"{path} line {local}: {message}")
+        raise SystemExit("\n".join(lines))
@@ -2,8 +2,9 @@ import fs from "node:fs";
 import path from "node:path";
 import type { NewsItem } from "./types";
 
-const DATA_PATH = path.resolve(process.cwd(), "..", "data", "news.jsonl");
-const INDEX_PATH = path.resolve(process.cwd(), "..", "data", "index.json");
+const DATA_DIR = path.resolve(process.cwd(), "..", "data");
+const DATA_PATH = path.join(DATA_DIR, "news.jsonl");
+const INDEX_PATH = path.join(DATA_DIR, "index.json");
 
 type SourceRunStatus = {
   fetched?: number;
@@ -20,41 +21,144 @@ type IndexPayload = {
   last_run?: {
     sources?: Record<string, SourceRunStatus>;
   };
+  // Set by crawls in settings.storage.mode: partitioned; the manifest path is
+  // relative to data/ and honours settings.storage.partition_dir.
+  storage?: {
+    mode?: string;
+    manifest?: string;
+  };
+};
+
+type Partition = {
+  key: string;
+  path: string;
+  count: number;
+  newest?: string | null;
+  oldest?: string | null;
+  sources?: Record<string, number>;
+};
+
+type Manifest = {
+  total?: number;
+  source_names?: Record<string, string>;
+  partitions?: Partition[];
 };
 
-export function loadNews(): NewsItem[] {
-  if (!fs.existsSync(DATA_PATH)) {
-    return [];
+// Every page of the build calls into this module; parse each file once.
+const fileCache = new Map<string, NewsItem[]>();
+
+function readJsonl(filePath: string): NewsItem[] {
+  const cached = fileCache.get(filePath);
+  if (cached) {
+    return cached;
   }
-  const raw = fs.readFileSync(DATA_PATH, "utf-8");
-  if (!raw.trim()) {
-    return [];
+  let items: NewsItem[] = [];
+  if (fs.existsSync(filePath)) {
+    const raw = fs.readFileSync(filePath, "utf-8");
+    items = raw
+      .split("\n")
+      .map((line: string) => line.trim())
+      .filter(Boolean)
+      .map((line: string): NewsItem | null => {
+        try {
+          return JSON.parse(line) as NewsItem;
+        } catch {
+          return null;
+        }
+      })
+      .filter((item): item is NewsItem => Boolean(item));
+  }
+  fileCache.set(filePath, items);
+  return items;
+}
+
+// Partitioned layout: YYYY/MM.jsonl files plus a manifest listing the months
+// newest first. Used only when the last crawl wrote it (index.json "storage"),
+// so partitions produced by `crawler migrate` wait for the mode switch.
+function manifestPath(): string | null {
+  const storage = loadIndex()?.storage;
+  if (storage?.mode !== "partitioned" || !storage.manifest) {
+    return null;
+  }
+  return path.resolve(DATA_DIR, storage.manifest);
+}
+
+function loadManifest(): { manifest: Manifest; root: string } | null {
+  const manifestFile = manifestPath();
+  if (!manifestFile || !fs.existsSync(manifestFile)) {
+    return null;
+  }
+  try {
+    const manifest = JSON.parse(fs.readFileSync(manifestFile, "utf-8")) as Manifest;
+    return { manifest, root: path.dirname(manifestFile) };
+  } catch {
+    return null;
   }
-  return raw
-    .split("\n")
-    .map((line: string) => line.trim())
-    .filter(Boolean)
-    .map((line: string): NewsItem | null => {
-      try {
-        return JSON.parse(line) as NewsItem;
-      } catch {
-        return null;
-      }
-    })
-    .filter((item): item is NewsItem => Boolean(item))
-    .sort((a: NewsItem, b: NewsItem) => b.published_at.localeCompare(a.published_at));
+}
+
+function loadPartitions(): { partitions: Partition[]; root: string } | null {
+  const loaded = loadManifest();
+  if (!loaded?.manifest.partitions) {
+    return null;
+  }
+  return { partitions: loaded.manifest.partitions, root: loaded.root };
+}
+
+function loadSourceNames(): Record<string, string> {
+  return loadManifest()?.manifest.source_names ?? {};
+}
+
+export function listMonths(): string[] {
+  return (loadPartitions()?.partitions ?? []).map((partition) => partition.key);
+}
+
+// `months` ("YYYY/MM" keys) limits a partitioned archive to those months.
+export function loadNews(months?: string[]): NewsItem[] {
+  const loaded = loadPartitions();
+  let items: NewsItem[];
+  if (loaded) {
+    const wanted = months ? new Set(months) : null;
+    items = loaded.partitions
+      .filter((partition) => !wanted || wanted.has(partition.key))
+      .flatMap((partition) => readJsonl(path.join(loaded.root, partition.path)));
+  } else {
+    items = readJsonl(DATA_PATH).slice();
+  }
+  return items.sort((a: NewsItem, b: NewsItem) => b.published_at.localeCompare(a.published_at));
 }
 
 export function getNewsPage(page: number, perPage = 30) {
-  const items = loadNews();
-  const totalPages = Math.max(1, Math.ceil(items.length / perPage));
+  const partitions = loadPartitions()?.partitions ?? null;
+  const allItems = partitions ? null : loadNews();
+  const totalItems = allItems
+    ? allItems.length
+    : (partitions ?? []).reduce((sum, partition) => sum + partition.count, 0);
+  const totalPages = Math.max(1, Math.ceil(totalItems / perPage));
   const safePage = Math.min(Math.max(page, 1), totalPages);
   const start = (safePage - 1) * perPage;
+
+  let items = allItems ?? [];
+  let offset = 0;
+  if (!allItems) {
+    // Partitions are newest first, so only the months overlapping this page are read.
+    const months: string[] = [];
+    let seen = 0;
+    for (const partition of partitions ?? []) {
+      const end = seen + partition.count;
+      if (end <= start) {
+        offset = end;
+      } else if (seen < start + perPage) {
+        months.push(partition.key);
+      }
+      seen = end;
+    }
+    items = loadNews(months);
+  }
   return {
-    items: items.slice(start, start + perPage),
+    items: items.slice(start - offset, start - offset + perPage),
     totalPages,
     currentPage: safePage,
-    totalItems: items.length,
+    totalItems,
   };
 }
 
@@ -87,8 +191,21 @@ export function getLatestBySource(limitPerSource = 6) {
 }
 
 export function getSourcesSummary() {
-  const items = loadNews();
   const summary: Record<string, { name: string; count: number }> = {};
+  const partitions = loadPartitions()?.partitions ?? null;
+  if (partitions) {
+    // Counts come straight from the manifest; no partition is read.
+    const names = loadSourceNames();
+    for (const partition of partitions) {
+      for (const [id, count] of Object.entries(partition.sources ?? {})) {
+        if (!summary[id]) {
+          summary[id] = { name: names[id] || id, count: 0 };
+        }
+        summary[id].count += count;
+      }
+    }
+  }
+  const items = partitions ? [] : loadNews();
   for (const item of items) {
     if (!summary[item.source_id]) {
       summary[item.source_id] = { name: item.source_name, count: 0 };
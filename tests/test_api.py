@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from urllib.parse import urljoin
+
+import httpx
+import pytest
+
+from crawler.adapters.api import _compile_join, _ExtractionPlan, fetch_api, fetch_api_async
+from crawler.json_stream import JsonItemStream, stream_prefix
+from crawler.models import SourceDefinition
+
+ROWS = 23
+
+
+def _handler(requests: list[tuple[str, dict]]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        requests.append((request.url.path, params))
+        assert params["api_key"] == "K"
+        series = request.url.path.rsplit("/", 1)[-1]
+        limit = int(params.get("limit", 5))
+        if series == "cursor":
+            start = int(params.get("cursor", 0))
+            extra = {"next": start + limit if start + limit < ROWS else None}
+        elif series == "page":
+            start = (int(params.get("page", 1)) - 1) * limit
+            extra = {"total": ROWS}
+        else:
+            start = int(params.get("offset", 0))
+            extra = {"count": ROWS}
+        rows = [{"n": n, "d": "2024-01-01"} for n in range(start, min(start + limit, ROWS))]
+        return httpx.Response(200, json={"data": {"rows": rows}, **extra})
+
+    return handler
+
+
+def _source(**config) -> SourceDefinition:
+    return SourceDefinition(
+        id="api",
+        name="API",
+        type="api",
+        enabled=True,
+        config={
+            "endpoint": "https://api.x.org/v1/{series_id}",
+            "params": {"limit": 5},
+            "auth_env": {"api_key": "TEST_API_KEY"},
+            "items_path": "data.rows",
+            "field_map": {"published_at": "d"},
+            "title_template": "{name} #{n}",
+            "url_template": "https://x.org/{series_id}/{n}",
+            **config,
+        },
+    )
+
+
+def _fetch(source: SourceDefinition, mode: str) -> tuple[list[dict], list[tuple[str, dict]]]:
+    requests: list[tuple[str, dict]] = []
+    transport = httpx.MockTransport(_handler(requests))
+    if mode == "sync":
+        with httpx.Client(transport=transport) as client:
+            return list(fetch_api(source, "ua", 5, 1, 0, client=client)), requests
+
+    async def run() -> list[dict]:
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [item async for item in fetch_api_async(source, "ua", 5, 1, 0, client=client)]
+
+    return asyncio.run(run()), requests
+
+
+def _series(series_id: str, name: str) -> dict:
+    return {"series_id": series_id, "fields": {"name": name}}
+
+
+# name: (config, requests made, titles)
+CASES = {
+    "offset with total": (
+        {
+            "param_sets": [_series("offs", "A"), _series("offs2", "B")],
+            "pagination": {"type": "offset", "total_path": "count", "max_pages": 10},
+        },
+        10,
+        [f"A #{n}" for n in range(ROWS)] + [f"B #{n}" for n in range(ROWS)],
+    ),
+    "offset until a short page": (
+        {"param_sets": [_series("offw", "A")], "pagination": {"type": "offset", "max_pages": 10}},
+        5,
+        [f"A #{n}" for n in range(ROWS)],
+    ),
+    "offset capped by max_pages": (
+        {
+            "param_sets": [_series("offc", "A")],
+            "pagination": {"type": "offset", "total_path": "count", "max_pages": 3},
+        },
+        3,
+        [f"A #{n}" for n in range(15)],
+    ),
+    "page": (
+        {
+            "param_sets": [_series("page", "P")],
+            "pagination": {"type": "page", "total_path": "total"},
+        },
+        5,
+        [f"P #{n}" for n in range(ROWS)],
+    ),
+    "cursor": (
+        {
+            "param_sets": [_series("cursor", "C")],
+            "pagination": {"type": "cursor", "cursor_path": "next"},
+        },
+        5,
+        [f"C #{n}" for n in range(ROWS)],
+    ),
+    "no pagination": ({"param_sets": [_series("x", "N")]}, 1, [f"N #{n}" for n in range(5)]),
+}
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+@pytest.mark.parametrize("mode", ["sync", "async"])
+@pytest.mark.parametrize("case", CASES.values(), ids=CASES.keys())
+def test_pages_and_param_sets_come_back_in_order(
+    monkeypatch: pytest.MonkeyPatch, case: tuple, mode: str, concurrency: int
+) -> None:
+    monkeypatch.setenv("TEST_API_KEY", "K")
+    config, request_count, titles = case
+    items, requests = _fetch(_source(**config, concurrency=concurrency), mode)
+    assert [item["title"] for item in items] == titles
+    assert len(requests) == request_count
+    assert items[0]["url"].startswith("https://x.org/")
+    assert items[0]["published_at"] == "2024-01-01"
+
+
+def _reference_map(config: dict, raw_items: list) -> list[dict]:
+    # The per-record mapping the compiled plan replaced.
+    field_map = config.get("field_map") or {}
+    items = []
+    for raw in raw_items:
+        if not isinstance(raw, dict):
+            continue
+        merged = dict(raw)
+        for key, value in (config.get("static_fields") or {}).items():
+            merged.setdefault(key, value)
+        values = {}
+        for name in ("title", "url", "published_at", "summary"):
+            value = merged.get(field_map.get(name, name))
+            template = config.get(f"{name}_template")
+            if not value and template:
+                try:
+                    value = template.format_map(merged)
+                except KeyError:
+                    value = None
+            values[name] = value
+        if values["url"] and config.get("base_url"):
+            values["url"] = urljoin(config["base_url"], str(values["url"]))
+        items.append(
+            {
+                **values,
+                "content_type": config.get("content_type", "news"),
+                "language": config.get("language"),
+                "region": config.get("region"),
+            }
+        )
+    return items
+
+
+PLAN_CONFIG = {
+    "items_path": "Results.series.0.data",
+    "base_url": "https://x.org/news/list.html",
+    "field_map": {"title": "headline", "url": "link"},
+    "static_fields": {"kind": "release", "headline": "static title"},
+    "summary_template": "{kind}: {meta[note]}",
+    "published_at_template": "{year}-{month:0>2}-01",
+    "language": "en",
+    "region": "US",
+}
+RECORDS = [
+    {"headline": "Plain", "link": "2024/1.html", "year": 2024, "month": 1, "meta": {"note": "n"}},
+    {"link": "/abs/path?q=1", "year": 2024, "month": 12},
+    {"headline": "", "link": "../up.html", "meta": {}},
+    {"headline": "Absolute", "link": "https://y.org/a", "published_at": "2024-02-02"},
+    {"headline": "Unicode", "link": "统计/1.html", "summary": "given"},
+    {"headline": "Protocol-relative", "link": "//cdn.x.org/a", "year": 2023, "month": 5},
+    {"headline": "Dot segment", "link": "./a/./b.html"},
+    {"headline": "Number", "link": 42},
+    {"headline": "No link"},
+    "not a record",
+]
+
+
+def test_extraction_plan_matches_the_per_record_mapping() -> None:
+    source = _source(**PLAN_CONFIG)
+    payload = {"Results": {"series": [{"data": RECORDS}]}}
+    plan = _ExtractionPlan(source)
+    assert plan.map(payload) == _reference_map(source.config, RECORDS)
+    fields = {"kind": "speech", "meta": {"note": "from param set"}}
+    expected = _reference_map(
+        source.config, [{**fields, **record} for record in RECORDS if isinstance(record, dict)]
+    )
+    assert plan.map(payload, fields) == expected
+
+
+@pytest.mark.parametrize(
+    "base_url",
+    ["https://x.org/news/list.html", "https://x.org", "https://x.org/a//b/", "http://x.org/./c"],
+)
+def test_compiled_join_matches_urljoin(base_url: str) -> None:
+    join = _compile_join(base_url)
+    urls = ("a.html", "/b", "c/../d", "./e", "?q=1", "#f", "//h.org/g", "g;p", "统计", "a b", "")
+    for url in urls:
+        assert join(url) == urljoin(base_url, url), url
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+@pytest.mark.parametrize("case", CASES.values(), ids=CASES.keys())
+def test_streamed_responses_match_whole_ones(
+    monkeypatch: pytest.MonkeyPatch, case: tuple, mode: str
+) -> None:
+    monkeypatch.setenv("TEST_API_KEY", "K")
+    config = case[0]
+    streamed, _ = _fetch(_source(**config, stream=True), mode)
+    assert streamed == _fetch(_source(**config), mode)[0]
+
+
+def test_item_stream_reads_scalars_on_either_side_of_the_list() -> None:
+    pytest.importorskip("ijson")
+    payload = {
+        "total": 3,
+        "data": {"rows": [{"n": 1, "x": 1.5}, {"n": 2, "t": "统计  "}, {"n": 3, "x": None}]},
+        "next": "c2",
+    }
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    stream = JsonItemStream(stream_prefix("data.rows"), ("total", "next"))
+    stream.read(iter(body[offset : offset + 1] for offset in range(len(body))))
+    assert stream.items == payload["data"]["rows"]
+    assert stream.count == 3
+    assert stream.scalars == {"total": 3, "next": "c2"}
+    assert stream_prefix("Results.series.0.data") is None
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import httpx
+import pytest
+
+from crawler.adapters.rss import _parse_feed
+from crawler.models import SourceDefinition
+from crawler.utils import news_item_id
+
+FEED_URL = "https://x.org/feeds/press.xml"
+SOURCE = SourceDefinition(id="fed", name="Fed", type="rss", config={"feed_urls": [FEED_URL]})
+LXML = replace(SOURCE, config={**SOURCE.config, "engine": "lxml"})
+
+FEEDS = {
+    "rss2": (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>Fed</title>'
+        "<item><title><![CDATA[Statement & minutes]]></title><link>https://x.org/press/2.htm</link>"
+        "<guid>https://x.org/press/2.htm</guid><pubDate>Wed, 03 Jan 2024 14:00:00 GMT</pubDate>"
+        "<description><![CDATA[<p>Summary</p>]]></description></item>"
+        "<item><title>No link</title><guid isPermaLink='false'>tag:x.org,2024:1</guid>"
+        "<pubDate>Tue, 02 Jan 2024 14:00:00 GMT</pubDate></item>"
+        "</channel></rss>"
+    ),
+    "rss1": (
+        '<?xml version="1.0"?><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+        'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        '<channel rdf:about="https://x.org/"><title>BIS</title></channel>'
+        '<item rdf:about="https://x.org/review/1.htm"><title>Review</title>'
+        "<link>https://x.org/review/1.htm</link><dc:date>2024-01-02T10:00:00Z</dc:date>"
+        "<description>d &lt;b&gt;b&lt;/b&gt;</description></item>"
+        '<item rdf:about="https://x.org/review/0.htm"><title>Older</title>'
+        "<dc:date>2024-01-01T10:00:00Z</dc:date></item>"
+        "</rdf:RDF>"
+    ),
+    "atom": (
+        '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom" '
+        'xml:base="https://x.org/news/"><title>ECB</title>'
+        "<entry><title type='xhtml'><div xmlns='http://www.w3.org/1999/xhtml'>Policy <b>rates</b></div>"
+        "</title><link rel='self' href='https://x.org/self'/><link href='2024/1.html'/>"
+        "<id>urn:x:1</id><updated>2024-01-02T10:00:00Z</updated>"
+        "<published>2024-01-02T09:00:00Z</published></entry>"
+        "<entry><title>Updated only</title><link rel='alternate' href='https://x.org/news/0.html'/>"
+        "<id>urn:x:0</id><updated>2024-01-01T10:00:00Z</updated></entry>"
+        "</feed>"
+    ),
+    "relative link without xml:base": (
+        "<rss version='2.0'><channel><item><title>A</title><link>/press/1.htm</link>"
+        "<description>plain &amp; text</description></item></channel></rss>"
+    ),
+    "unsafe rss markup": (
+        "<rss version='2.0' xmlns:content='http://purl.org/rss/1.0/modules/content/'><channel>"
+        "<item><title>&lt;b&gt;x&lt;/b&gt;&lt;script&gt;a()&lt;/script&gt;</title>"
+        "<link>https://x.org/1</link><description><![CDATA[<p onclick='x()'>Hi <script>bad()</script>"
+        "<a href='/rel'>l</a></p>]]></description></item>"
+        "<item><title>5 &lt; 6</title><link>https://x.org/2</link>"
+        "<content:encoded><![CDATA[<iframe src='x'></iframe><p>ok</p>]]></content:encoded></item>"
+        "</channel></rss>"
+    ),
+    "atom markup and xml:base": (
+        "<feed xmlns='http://www.w3.org/2005/Atom' xml:base='https://x.org/news/'>"
+        "<entry><title type='html'>&lt;b&gt;T&lt;/b&gt;</title><link href='2024/1.html'/>"
+        "<summary type='html'>&lt;a href=\"rel.html\"&gt;r&lt;/a&gt;&lt;script&gt;s()&lt;/script&gt;"
+        "</summary></entry>"
+        "<entry><title>a &lt;b&gt; c</title><link href='/2.html'/><summary>1 &lt; 2</summary></entry>"
+        "<entry><title>t</title><link href='3.html'/><content type='xhtml' xml:base='sub/'>"
+        "<div xmlns='http://www.w3.org/1999/xhtml'><a href='r.html'>r</a>"
+        "<img src='i.png' onerror='x'/></div></content></entry>"
+        "</feed>"
+    ),
+    "atom styles without xml:base": (
+        "<feed xmlns='http://www.w3.org/2005/Atom'><entry><title>T</title><link href='/2024/1.html'/>"
+        "<content type='html'>&lt;p style=\"color:red\"&gt;c&lt;/p&gt;</content></entry></feed>"
+    ),
+}
+
+
+def _response(body: str) -> httpx.Response:
+    return httpx.Response(
+        200,
+        content=body.encode("utf-8"),
+        headers={"content-type": "application/xml"},
+        request=httpx.Request("GET", FEED_URL),
+    )
+
+
+@pytest.mark.parametrize("body", FEEDS.values(), ids=FEEDS.keys())
+def test_iterparse_engine_matches_feedparser(body: str) -> None:
+    expected = list(_parse_feed(_response(body), FEED_URL, SOURCE))
+    assert expected
+    assert list(_parse_feed(_response(body), FEED_URL, LXML)) == expected
+
+
+def test_relative_links_keep_the_ids_feedparser_gives_them() -> None:
+    (item,) = _parse_feed(_response(FEEDS["relative link without xml:base"]), FEED_URL, LXML)
+    assert item["url"] == "/press/1.htm"
+
+
+def test_malformed_feed_falls_back_to_feedparser() -> None:
+    cut = "<item><title>Cut</title><link>https://x.org/cut"
+    body = FEEDS["rss2"].replace("</channel></rss>", cut)
+    items = list(_parse_feed(_response(body), FEED_URL, LXML))
+    assert items == list(_parse_feed(_response(body), FEED_URL, SOURCE))
+
+
+def test_stored_entries_stop_the_walk_only_when_opted_in() -> None:
+    # A pinned old entry at the top must not hide the newer ones below it.
+    known = {news_item_id(SOURCE.id, "https://x.org/press/2.htm")}
+    assert len(list(_parse_feed(_response(FEEDS["rss2"]), FEED_URL, LXML, known))) == 2
+    stopping = replace(LXML, config={**LXML.config, "stop_when_known": True})
+    assert list(_parse_feed(_response(FEEDS["rss2"]), FEED_URL, stopping, known)) == []
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import httpx
+import pytest
+
+from crawler.adapters.html import fetch_html, fetch_html_async
+from crawler.adapters.rss import _parse_feed
+from crawler.high_water import HighWaterMark, stop_by_date, until_high_water
+from crawler.models import SourceDefinition
+from crawler.utils import news_item_id
+
+SOURCE = SourceDefinition(
+    id="nbs",
+    name="NBS",
+    type="html",
+    config={"published_format": "%Y-%m-%d", "published_timezone": "Asia/Shanghai"},
+)
+RAW = [
+    {"url": "https://x.org/4", "published_at": "2024-01-04"},
+    # Pinned at the top of the list, older than the mark.
+    {"url": "https://x.org/pinned", "published_at": "2023-06-01"},
+    {"url": "https://x.org/3", "published_at": "2024-01-03"},
+    {"url": "https://x.org/2", "published_at": "2024-01-02"},
+    {"url": "https://x.org/1", "published_at": "2024-01-01"},
+]
+MARK = HighWaterMark(
+    published_at="2024-01-01T16:00:00+00:00", id=news_item_id(SOURCE.id, "https://x.org/2")
+)
+
+
+def test_stops_at_the_high_water_item_by_default() -> None:
+    items, reached = until_high_water(RAW, SOURCE, MARK)
+    assert reached
+    assert [item["url"] for item in items] == [
+        "https://x.org/4",
+        "https://x.org/pinned",
+        "https://x.org/3",
+    ]
+
+
+def test_date_cutoff_is_opt_in() -> None:
+    items, reached = until_high_water(RAW, SOURCE, MARK, by_date=True)
+    assert reached
+    assert [item["url"] for item in items] == ["https://x.org/4"]
+
+
+def test_unparseable_dates_never_stop_the_walk() -> None:
+    raw = [{"url": "https://x.org/a", "published_at": "soon"}, {"url": "https://x.org/b"}]
+    assert until_high_water(raw, SOURCE, MARK, by_date=True) == (raw, False)
+
+
+def test_no_mark_keeps_everything() -> None:
+    assert until_high_water(RAW, SOURCE, None, by_date=True) == (RAW, False)
+
+
+def test_stop_by_date_needs_opt_in_and_a_single_listing() -> None:
+    opted_in = replace(SOURCE, config={**SOURCE.config, "high_water_by_date": True})
+    assert not stop_by_date(SOURCE, 1)
+    assert stop_by_date(opted_in, 1)
+    assert not stop_by_date(opted_in, 2)
+
+
+def test_advance_ignores_fallback_dates() -> None:
+    now = "2024-02-01T00:00:00+00:00"
+    items = [
+        {"id": "a", "published_at": "2024-01-05T00:00:00+00:00"},
+        {"id": "b", "published_at": now},
+        {"id": "c", "published_at": "2024-01-03T00:00:00+00:00"},
+    ]
+    mark = HighWaterMark.advance(MARK, items, now)
+    assert mark == HighWaterMark(published_at="2024-01-05T00:00:00+00:00", id="a")
+    assert HighWaterMark.advance(mark, items[2:], now) is mark
+    assert HighWaterMark.from_state(mark.as_state()) == mark
+    assert HighWaterMark.from_state({"published_at": "x"}) is None
+
+
+LISTS = {
+    "/a.html": ["https://x.org/a/3", "https://x.org/a/2", "https://x.org/a/1"],
+    "/b.html": ["https://x.org/b/2", "https://x.org/b/1"],
+}
+HTML_SOURCE = SourceDefinition(
+    id="safe",
+    name="SAFE",
+    type="html",
+    config={
+        "list_urls": ["https://x.org/a.html", "https://x.org/b.html"],
+        "item_selector": "li",
+        "title_selector": "a",
+        "url_selector": "a",
+        "published_selector": "span",
+        "engine": "lxml",
+    },
+)
+
+
+def _fetch_lists(mark: HighWaterMark, mode: str) -> list[str]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        rows = "".join(
+            f"<li><a href='{url}'>{url}</a><span>2024-01-0{len(LISTS) + index}</span></li>"
+            for index, url in enumerate(LISTS[request.url.path])
+        )
+        return httpx.Response(200, text=f"<ul>{rows}</ul>", headers={"content-type": "text/html"})
+
+    transport = httpx.MockTransport(handler)
+    if mode == "sync":
+        with httpx.Client(transport=transport) as client:
+            items = list(fetch_html(HTML_SOURCE, "ua", 5, 1, 0, client=client, high_water=mark))
+    else:
+
+        async def run() -> list:
+            async with httpx.AsyncClient(transport=transport) as client:
+                return [
+                    item
+                    async for item in fetch_html_async(
+                        HTML_SOURCE, "ua", 5, 1, 0, client=client, high_water=mark
+                    )
+                ]
+
+        items = asyncio.run(run())
+    return [item["url"] for item in items]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_mark_on_one_list_url_keeps_the_new_items_of_the_others(mode: str) -> None:
+    mark = HighWaterMark(
+        published_at="2024-01-03T00:00:00+00:00",
+        id=news_item_id(HTML_SOURCE.id, "https://x.org/a/3"),
+    )
+    assert _fetch_lists(mark, mode) == ["https://x.org/b/2", "https://x.org/b/1"]
+
+
+FEED_URL = "https://x.org/feed.rdf"
+FEED = (
+    '<?xml version="1.0"?><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+    'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    '<item rdf:about="https://x.org/review/1.htm"><title>Review</title>'
+    "<link>https://x.org/review/1.htm</link><dc:date>2024-01-02T10:00:00Z</dc:date></item>"
+    '<item rdf:about="https://x.org/review/0.htm"><title>Older</title>'
+    "<link>https://x.org/review/0.htm</link><dc:date>2024-01-01T10:00:00Z</dc:date></item>"
+    "</rdf:RDF>"
+)
+
+
+@pytest.mark.parametrize("engine", ["feedparser", "lxml"])
+def test_both_feed_engines_stop_at_the_high_water_item(engine: str) -> None:
+    source = SourceDefinition(id="bis", name="BIS", type="rss", config={"engine": engine})
+    mark = HighWaterMark(
+        published_at="2024-01-01T10:00:00+00:00",
+        id=news_item_id(source.id, "https://x.org/review/0.htm"),
+    )
+    response = httpx.Response(200, content=FEED.encode(), request=httpx.Request("GET", FEED_URL))
+    items = list(_parse_feed(response, FEED_URL, source, high_water=mark))
+    assert [item["url"] for item in items] == ["https://x.org/review/1.htm"]
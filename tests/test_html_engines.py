@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import replace
+
+import httpx
+import pytest
+
+from crawler.adapters.html import _parse_list_page, fetch_html, fetch_html_async
+from crawler.high_water import HighWaterMark
+from crawler.models import SourceDefinition
+from crawler.utils import news_item_id
+
+SOURCE = SourceDefinition(
+    id="pboc",
+    name="PBOC",
+    type="html",
+    config={
+        "list_urls": ["https://x.org/list/index.html"],
+        "item_selector": "div.list ul li",
+        "title_selector": "a.title",
+        "url_selector": "a.title",
+        "published_selector": "span.date",
+        "region": "CN",
+    },
+)
+
+PAGES = {
+    "plain": (
+        "<div class='list'><ul>"
+        "<li><a class='title' href='/a/1.html'>Rate decision</a><span class='date'>2024-01-02</span></li>"
+        "<li><a class='title' href='https://y.org/b'>Absolute</a><span class='date'>2024-01-01</span></li>"
+        "</ul></div>"
+    ),
+    "nested markup and whitespace": (
+        "<div class='list'><ul><li>\n  <a class='title' href='c.html'>\n  <b>Bold</b> part\n</a>"
+        "<span class='date'> 2024-01-03 </span></li></ul></div>"
+    ),
+    "rows without a link are skipped": (
+        "<div class='list'><ul><li><span class='date'>2024-01-01</span></li>"
+        "<li><a class='title' href='d.html'>Kept</a><span class='date'>2024-01-01</span></li>"
+        "<li><a class='title'>No href</a><span class='date'>2024-01-01</span></li></ul></div>"
+    ),
+    "non-ascii and entities": (
+        "<div class='list'><ul><li><a class='title' href='/统计/1.html'>国家统计局 &amp; 发布</a>"
+        "<span class='date'>2024年01月02日</span></li></ul></div>"
+    ),
+    "navigation noise": (
+        "<ul><li><a class='title' href='/nav'>Nav</a><span class='date'>x</span></li></ul>"
+        "<div class='list'><ul><li><a class='title' href='e.html'>E</a><a class='title' href='f.html'>F</a>"
+        "<span class='date'>2024-01-04</span></li></ul></div>"
+    ),
+    "script, style and template text": (
+        "<div class='list'><ul><li><a class='title' href='g.html'>G<script>var g = 1;</script>"
+        "<style>.g {}</style> tail<!-- note --><template>T</template><noscript>N</noscript></a>"
+        "<span class='date'>2024-01-05<script>x()</script></span></li></ul></div>"
+    ),
+    "empty": "   ",
+}
+
+
+@pytest.mark.parametrize("html", PAGES.values(), ids=PAGES.keys())
+def test_lxml_engine_matches_beautifulsoup(html: str) -> None:
+    lxml_source = replace(SOURCE, config={**SOURCE.config, "engine": "lxml"})
+    url = SOURCE.config["list_urls"][0]
+    assert _parse_list_page(html, url, lxml_source) == _parse_list_page(html, url, SOURCE)
+
+
+def test_lxml_engine_honours_base_url() -> None:
+    config = {**SOURCE.config, "base_url": "https://base.org/dir/"}
+    items = [
+        _parse_list_page(PAGES["plain"], "https://x.org/", replace(SOURCE, config=engine_config))
+        for engine_config in (config, {**config, "engine": "lxml"})
+    ]
+    assert items[0] == items[1]
+    assert items[0][0]["url"] == "https://base.org/a/1.html"
+
+
+ROW_SELECTORS = {
+    "scope child": {"title_selector": ":scope > a", "url_selector": ":scope > a"},
+    "scope descendant": {"title_selector": ":scope a.title", "published_selector": ":scope span"},
+    "root": {"url_selector": ":root a.title"},
+}
+SCOPED = (
+    "<div class='list'><ul><li><a class='title' href='h.html'>Direct</a><span class='date'>d</span>"
+    "<div><a class='title' href='i.html'>Nested</a></div></li>"
+    "<li><div><a class='title' href='j.html'>Only nested</a></div><span class='date'>n</span></li>"
+    "</ul></div>"
+)
+
+
+@pytest.mark.parametrize("selectors", ROW_SELECTORS.values(), ids=ROW_SELECTORS.keys())
+def test_row_anchored_selectors_match_beautifulsoup(selectors: dict) -> None:
+    source = replace(SOURCE, config={**SOURCE.config, **selectors})
+    lxml_source = replace(source, config={**source.config, "engine": "lxml"})
+    url = SOURCE.config["list_urls"][0]
+    expected = _parse_list_page(SCOPED, url, source)
+    assert expected
+    assert _parse_list_page(SCOPED, url, lxml_source) == expected
+
+
+LAST_PAGE = 6
+
+
+def _list_page(number: int) -> str:
+    rows = "".join(
+        f"<li><a class='title' href='/a/{number}-{row}.html'>P{number}-{row}</a>"
+        f"<span class='date'>2024-01-{10 - number:02d}</span></li>"
+        for row in range(3)
+    )
+    link = f"<a class='next' href='index_{number + 1}.html'>next</a>" if number < LAST_PAGE else ""
+    return f"<div class='list'><ul>{rows}</ul></div>{link}"
+
+
+def _ids(*urls: str) -> set[str]:
+    return {news_item_id(SOURCE.id, url) for url in urls}
+
+
+def _page_urls(first: int, last: int) -> list[str]:
+    return [
+        f"https://x.org/a/{page}-{row}.html" for page in range(first, last + 1) for row in range(3)
+    ]
+
+
+def _crawl(pagination: dict, *, known: set[str], high_water=None, mode: str = "sync"):
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        match = re.search(r"index(?:_(\d+))?\.html", request.url.path)
+        number = int(match.group(1) or 1)
+        if number > LAST_PAGE:
+            return httpx.Response(404)
+        return httpx.Response(200, text=_list_page(number), headers={"content-type": "text/html"})
+
+    source = replace(SOURCE, config={**SOURCE.config, "engine": "lxml", "pagination": pagination})
+    transport = httpx.MockTransport(handler)
+    if mode == "sync":
+        with httpx.Client(transport=transport) as client:
+            items = list(
+                fetch_html(
+                    source, "ua", 5, 1, 0, client=client, known_ids=known, high_water=high_water
+                )
+            )
+    else:
+
+        async def run() -> list:
+            async with httpx.AsyncClient(transport=transport) as client:
+                return [
+                    item
+                    async for item in fetch_html_async(
+                        source, "ua", 5, 1, 0, client=client, known_ids=known, high_water=high_water
+                    )
+                ]
+
+        items = asyncio.run(run())
+    return [item["url"] for item in items], requests
+
+
+PAGINATIONS = {
+    "url_template": {
+        "url_template": "https://x.org/list/index_{page}.html",
+        "first_page": 2,
+        "concurrency": 3,
+    },
+    "next_selector": {"next_selector": "a.next"},
+}
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+@pytest.mark.parametrize("pagination", PAGINATIONS.values(), ids=PAGINATIONS.keys())
+def test_list_page_with_a_stored_item_is_not_paged_past(pagination: dict, mode: str) -> None:
+    urls, requests = _crawl(pagination, known=_ids(_page_urls(1, 1)[2]), mode=mode)
+    assert urls == _page_urls(1, 1)
+    assert requests == ["/list/index.html"]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+@pytest.mark.parametrize("pagination", PAGINATIONS.values(), ids=PAGINATIONS.keys())
+def test_paging_stops_at_the_first_page_holding_a_stored_item(pagination: dict, mode: str) -> None:
+    urls, requests = _crawl(pagination, known=_ids(*_page_urls(4, LAST_PAGE)[1:]), mode=mode)
+    # Page 4 still yields its one new item (stored ones are dropped by the pipeline).
+    assert urls == _page_urls(1, 4)
+    if "next_selector" in pagination:
+        assert requests == ["/list/index.html"] + [f"/list/index_{page}.html" for page in (2, 3, 4)]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+@pytest.mark.parametrize("pagination", PAGINATIONS.values(), ids=PAGINATIONS.keys())
+def test_backfill_walks_every_page(pagination: dict, mode: str) -> None:
+    urls, _ = _crawl(pagination, known=set(), mode=mode)
+    assert urls == _page_urls(1, LAST_PAGE)
+
+
+def test_high_water_item_ends_the_walk() -> None:
+    mark = HighWaterMark(
+        published_at="2024-01-07T00:00:00+00:00", id=news_item_id(SOURCE.id, _page_urls(3, 3)[1])
+    )
+    urls, requests = _crawl(PAGINATIONS["next_selector"], known=set(), high_water=mark)
+    assert urls == _page_urls(1, 3)[:7]
+    assert requests[-1] == "/list/index_3.html"
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from crawler.id_index import IdIndex
+
+
+def _ids(start: int, stop: int) -> list[str]:
+    return [hashlib.sha256(f"item-{number}".encode()).hexdigest() for number in range(start, stop)]
+
+
+@pytest.mark.parametrize("bloom_bits_per_item", [0, 10])
+def test_lookup_after_rebuild_and_reopen(tmp_path: Path, bloom_bits_per_item: int) -> None:
+    index = IdIndex(tmp_path / "news.idx", bloom_bits_per_item=bloom_bits_per_item)
+    index.rebuild(_ids(0, 500) + _ids(0, 10), source_size=123)
+    index.close()
+
+    index = IdIndex(tmp_path / "news.idx", bloom_bits_per_item=bloom_bits_per_item).open()
+    assert index.source_size == 123
+    assert len(index) == 500
+    assert all(item_id in index for item_id in _ids(0, 500))
+    assert not any(item_id in index for item_id in _ids(500, 1000))
+    # Ids that are not sha256 hex digests are hashed.
+    index.add("legacy id")
+    assert "legacy id" in index and "legacy" not in index
+    assert 42 not in index
+
+
+def test_small_additions_go_to_the_tail(tmp_path: Path) -> None:
+    index = IdIndex(tmp_path / "news.idx")
+    index.rebuild(_ids(0, 100), source_size=1)
+    index.add(_ids(0, 1)[0])
+    for item_id in _ids(100, 110):
+        index.add(item_id)
+    index.save(source_size=2)
+    assert (tmp_path / "news.idx.tail").stat().st_size == 10 * 32
+
+    reopened = IdIndex(tmp_path / "news.idx").open()
+    assert reopened.source_size == 2
+    assert len(reopened) == 110
+    assert all(item_id in reopened for item_id in _ids(0, 110))
+
+
+def test_large_tail_is_merged_into_the_sorted_file(tmp_path: Path) -> None:
+    index = IdIndex(tmp_path / "news.idx")
+    index.rebuild(_ids(0, 100), source_size=1)
+    for item_id in _ids(100, 1300):
+        index.add(item_id)
+    index.save(source_size=2)
+    assert not (tmp_path / "news.idx.tail").exists()
+
+    reopened = IdIndex(tmp_path / "news.idx").open()
+    assert len(reopened) == 1300
+    records = [reopened._records[position] for position in range(len(reopened))]
+    assert records == sorted(records)
+    assert all(item_id in reopened for item_id in _ids(0, 1300))
+
+
+def test_discard_removes_ids_from_disk_and_tail(tmp_path: Path) -> None:
+    index = IdIndex(tmp_path / "news.idx")
+    index.rebuild(_ids(0, 100), source_size=1)
+    index.add(_ids(100, 101)[0])
+    index.save(source_size=2)
+
+    gone = _ids(0, 10) + _ids(100, 101)
+    index.discard(gone)
+    assert not any(item_id in index for item_id in gone)
+    index.save(source_size=3)
+
+    reopened = IdIndex(tmp_path / "news.idx").open()
+    assert len(reopened) == 90
+    assert not any(item_id in reopened for item_id in gone)
+    assert all(item_id in reopened for item_id in _ids(10, 100))
+    # A discarded id can come back.
+    reopened.add(gone[0])
+    assert gone[0] in reopened
+
+
+def test_unreadable_index_opens_empty(tmp_path: Path) -> None:
+    (tmp_path / "news.idx").write_bytes(b"not an index")
+    index = IdIndex(tmp_path / "news.idx").open()
+    assert index.source_size is None
+    assert len(index) == 0
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from crawler.models import SourceDefinition
+from crawler.pipeline import _normalize_item, normalize_batch
+from crawler.storage import iter_news_items
+
+FETCHED_AT = "2024-03-01T08:00:00+00:00"
+DATA = Path(__file__).resolve().parents[1] / "data" / "news.jsonl"
+
+SOURCES = [
+    SourceDefinition(id="fed", name="Fed", type="rss"),
+    SourceDefinition(
+        id="pboc",
+        name="PBOC",
+        type="html",
+        config={"published_format": "%Y-%m-%d", "region": "CN"},
+    ),
+]
+
+RAW_ITEMS = [
+    {"title": " Rate decision ", "url": "https://x.org/a?utm_source=x&b=2&a=1", "published_at": "2024-01-02"},
+    {"title": "Same date", "url": "https://x.org/b", "published_at": "2024-01-02"},
+    {"title": "RFC 822", "url": "https://x.org/c", "published_at": "Tue, 02 Jan 2024 14:00:00 GMT"},
+    {"title": "Bad date", "url": "https://x.org/d", "published_at": "not a date"},
+    {"title": "Bad date again", "url": "https://x.org/e", "published_at": "not a date"},
+    {"title": "No date", "url": "https://x.org/f"},
+    {"title": "List date", "url": "https://x.org/g", "published_at": ["2024-01-02"]},
+    {"title": "Dict date", "url": "https://x.org/h", "published_at": {"value": "2024-01-02"}},
+    {"title": "Int date", "url": "https://x.org/i", "published_at": 1},
+    {"title": "Bool date", "url": "https://x.org/j", "published_at": True},
+    {"title": None, "url": None, "summary": "s", "keywords": ["policy"]},
+]
+
+
+@pytest.mark.parametrize("source", SOURCES, ids=lambda source: source.id)
+def test_normalize_batch_matches_per_item(source: SourceDefinition) -> None:
+    expected = [_normalize_item(raw, source, fetched_at=FETCHED_AT) for raw in RAW_ITEMS]
+    assert normalize_batch(RAW_ITEMS, source, fetched_at=FETCHED_AT) == expected
+
+
+def test_unhashable_published_falls_back_to_fetched_at() -> None:
+    raw = [{"title": "t", "url": "https://x.org/a", "published_at": ["2024"]}]
+    (item,) = normalize_batch(raw, SOURCES[0], fetched_at=FETCHED_AT)
+    assert item["published_at"] == _normalize_item(raw[0], SOURCES[0], fetched_at=FETCHED_AT)[
+        "published_at"
+    ]
+
+
+@pytest.mark.skipif(not DATA.exists(), reason="no committed data/news.jsonl")
+def test_normalize_batch_matches_per_item_on_archive() -> None:
+    batches: dict[str, list[dict]] = {}
+    for item in iter_news_items(DATA):
+        raw = {key: item.get(key) for key in ("title", "url", "published_at", "summary")}
+        batches.setdefault(item["source_id"], []).append(raw)
+    for source_id, raw_items in batches.items():
+        source = SourceDefinition(id=source_id, name=source_id, type="rss")
+        expected = [_normalize_item(raw, source, fetched_at=FETCHED_AT) for raw in raw_items]
+        assert normalize_batch(raw_items, source, fetched_at=FETCHED_AT) == expected
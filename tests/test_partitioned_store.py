@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from crawler.pipeline import migrate
+from crawler.storage import open_store, write_news_items
+from crawler.validator import validate
+
+MONTHS = ["2024-03", "2024-02", "2024-01"]
+
+
+def _item(number: int, month: str) -> dict:
+    return {
+        "id": f"{number:064x}",
+        "source_id": "fed",
+        "source_name": "Fed",
+        "title": f"Item {number}",
+        "url": f"https://x.org/{number}",
+        "canonical_url": f"https://x.org/{number}",
+        "published_at": f"{month}-{10 + number % 10:02d}T00:00:00+00:00",
+        "fetched_at": "2024-04-01T00:00:00+00:00",
+        "summary": "",
+        "keywords": [],
+        "content_type": "news",
+        "language": "en",
+        "region": "US",
+    }
+
+
+def _corpus() -> list[dict]:
+    items = [_item(number, MONTHS[number % 3]) for number in range(30)]
+    return sorted(items, key=lambda item: item["published_at"], reverse=True)
+
+
+def test_migrate_splits_the_jsonl_into_months(tmp_path: Path) -> None:
+    data_path = tmp_path / "news.jsonl"
+    items = _corpus()
+    write_news_items(data_path, items)
+    migrate(str(data_path))
+
+    store = open_store(data_path, {"mode": "partitioned"})
+    assert store.months() == ["2024/03", "2024/02", "2024/01"]
+    assert [item["id"] for item in store.iter_news_items()] == [item["id"] for item in items]
+    assert all(item["id"] in store.ids for item in items)
+    validate(str(data_path), workers=2, storage={"mode": "partitioned"})
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_validate_finds_duplicates_across_partitions(tmp_path: Path, workers: int) -> None:
+    data_path = tmp_path / "news.jsonl"
+    store = open_store(data_path, {"mode": "partitioned"})
+    store.write_news_items(_corpus())
+    copy = {**_item(0, "2024-01"), "published_at": "2024-02-20T00:00:00+00:00"}
+    with (tmp_path / "news" / "2024" / "02.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(copy) + "\n")
+
+    with pytest.raises(SystemExit) as raised:
+        validate(str(data_path), workers=workers, storage={"mode": "partitioned"})
+    assert f"duplicate id {copy['id']}" in str(raised.value)
+
+
+@pytest.mark.parametrize("partition_dir", [None, "archive/months"])
+def test_index_points_the_site_at_the_manifest(tmp_path: Path, partition_dir: str | None) -> None:
+    data_path = tmp_path / "news.jsonl"
+    storage = {"mode": "partitioned"}
+    if partition_dir:
+        storage["partition_dir"] = str(tmp_path / partition_dir)
+    store = open_store(data_path, storage)
+    store.write_news_items(_corpus())
+    store.write_index(tmp_path / "index.json")
+
+    payload = json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))
+    manifest = f"{partition_dir or 'news'}/manifest.json"
+    assert payload["storage"] == {"mode": "partitioned", "manifest": manifest}
+    assert (tmp_path / manifest).exists()
+    assert payload["total"] == 30
+
+
+def test_single_file_index_keeps_the_site_on_news_jsonl(tmp_path: Path) -> None:
+    # Partitions left by migrate are not served until the mode is switched.
+    data_path = tmp_path / "news.jsonl"
+    write_news_items(data_path, _corpus())
+    migrate(str(data_path))
+    open_store(data_path, {"mode": "full"}).load().write_index(tmp_path / "index.json")
+    assert "storage" not in json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from crawler import http_client, pipeline
+from crawler.config import load_settings
+from crawler.models import SourceDefinition
+from crawler.storage import iter_news_items
+
+SOURCES = [
+    SourceDefinition(
+        id="fed",
+        name="Fed",
+        type="rss",
+        enabled=True,
+        config={"feed_urls": ["https://fed.example/a.xml", "https://fed.example/b.xml"]},
+    ),
+    SourceDefinition(
+        id="nbs",
+        name="NBS",
+        type="html",
+        enabled=True,
+        config={
+            "list_urls": ["https://nbs.example/list.html"],
+            "item_selector": "li",
+            "title_selector": "a",
+            "url_selector": "a",
+            "published_selector": "span",
+            "published_format": "%Y-%m-%d",
+        },
+    ),
+    SourceDefinition(
+        id="csrc",
+        name="CSRC",
+        type="html",
+        enabled=True,
+        config={
+            "list_urls": ["https://csrc.example/list.html"],
+            "item_selector": "li",
+            "title_selector": "a",
+            "url_selector": "a",
+        },
+    ),
+]
+
+
+def _feed(prefix: str) -> str:
+    items = "".join(
+        f"<item><title>{prefix} {number}</title><link>https://fed.example/{prefix}/{number}</link>"
+        f"<pubDate>Mon, 0{1 + number} Jan 2024 10:00:00 GMT</pubDate></item>"
+        for number in range(6)
+    )
+    return f"<rss version='2.0'><channel><title>Fed</title>{items}</channel></rss>"
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "csrc.example":
+        return httpx.Response(404)
+    etag = f'"{request.url.path}"'
+    if request.headers.get("If-None-Match") == etag:
+        return httpx.Response(304)
+    if request.url.host == "fed.example":
+        prefix = request.url.path.strip("/").split(".")[0]
+        headers = {"content-type": "application/xml", "ETag": etag}
+        return httpx.Response(200, text=_feed(prefix), headers=headers)
+    rows = "".join(
+        f"<li><a href='/{number}.html'>NBS {number}</a><span>2024-02-0{1 + number}</span></li>"
+        for number in range(4)
+    )
+    headers = {"content-type": "text/html", "ETag": etag}
+    return httpx.Response(200, text=f"<ul>{rows}</ul>", headers=headers)
+
+
+@pytest.fixture
+def crawl(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    settings = {**load_settings(), "crawl_delay_sec": 0, "retry_backoff_sec": 0, "max_retries": 1}
+    monkeypatch.setattr(pipeline, "load_settings", lambda: settings)
+    monkeypatch.setattr(pipeline, "load_sources", lambda: SOURCES)
+    client_options = http_client._client_options
+    monkeypatch.setattr(
+        http_client,
+        "_client_options",
+        lambda settings: {**client_options(settings), "transport": httpx.MockTransport(_handler)},
+    )
+
+    def run(name: str, concurrency: int) -> tuple[dict, list[dict]]:
+        data_path = tmp_path / name / "news.jsonl"
+        data_path.parent.mkdir(exist_ok=True)
+        index_path = data_path.with_name("index.json")
+        pipeline.crawl(str(data_path), str(index_path), concurrency=concurrency)
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        items = [{**item, "fetched_at": None} for item in iter_news_items(data_path)]
+        return index, items
+
+    return run
+
+
+def _outcome(index: dict) -> dict:
+    # Everything but timings and timestamps.
+    return {
+        "total": index["total"],
+        "sources": index["sources"],
+        "last_run": {
+            source_id: {
+                key: value for key, value in stats.items() if key not in ("last_run", "timings")
+            }
+            for source_id, stats in index["last_run"]["sources"].items()
+        },
+        "state": {
+            source_id: {key: value for key, value in state.items() if key != "last_run"}
+            for source_id, state in index["state"]["sources"].items()
+        },
+    }
+
+
+def test_concurrent_crawl_matches_the_sequential_one(crawl) -> None:
+    sequential_index, sequential_items = crawl("sequential", 1)
+    concurrent_index, concurrent_items = crawl("concurrent", 8)
+    assert concurrent_items == sequential_items
+    assert _outcome(concurrent_index) == _outcome(sequential_index)
+    assert list(concurrent_index["last_run"]["sources"]) == [source.id for source in SOURCES]
+    assert sequential_index["total"] == 16
+    assert sequential_index["last_run"]["sources"]["csrc"]["status"] != "success"
+
+
+@pytest.mark.parametrize("concurrency", [1, 8])
+def test_unchanged_sources_are_not_modified(crawl, concurrency: int) -> None:
+    # Validators are kept once there is a store to protect, i.e. from run two.
+    crawl("cached", concurrency)
+    first_index, first_items = crawl("cached", concurrency)
+    index, items = crawl("cached", concurrency)
+    assert items == first_items
+    assert index["total"] == first_index["total"]
+    statuses = {
+        source_id: (stats["status"], stats["fetched"], stats["zero_new_streak"])
+        for source_id, stats in index["last_run"]["sources"].items()
+    }
+    assert statuses["fed"] == statuses["nbs"] == ("not_modified", 0, 2)
+    assert index["state"]["sources"]["fed"]["last_status"] == "not_modified"
+    assert statuses["csrc"][0] != "not_modified"
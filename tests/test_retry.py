@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from crawler.retry import CircuitBreaker, RetryPolicy
+
+URL = "https://x.org/feed.xml"
+
+
+def _status(code: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", URL)
+    response = httpx.Response(code, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"{code}", request=request, response=response)
+
+
+class Attempts:
+    """Callable that raises the queued errors in turn, then returns "ok"."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def _policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(max_retries=3, backoff_sec=0, **kwargs)
+
+
+def test_transient_errors_are_retried() -> None:
+    attempt = Attempts(_status(503), httpx.ConnectError("refused"))
+    assert _policy().call(URL, attempt) == "ok"
+    assert attempt.calls == 3
+
+
+def test_permanent_status_fails_on_the_first_attempt() -> None:
+    attempt = Attempts(_status(404))
+    with pytest.raises(RuntimeError, match="Failed to fetch"):
+        _policy().call(URL, attempt)
+    assert attempt.calls == 1
+
+
+def test_retries_are_bounded() -> None:
+    attempt = Attempts(*[_status(500)] * 5)
+    with pytest.raises(RuntimeError):
+        _policy().call(URL, attempt)
+    assert attempt.calls == 3
+
+
+def test_retry_after_is_honoured_up_to_the_cap() -> None:
+    policy = RetryPolicy(backoff_sec=2, max_backoff_sec=30)
+    assert policy.delay(1, _status(429, {"Retry-After": "7"})) == 7
+    assert policy.delay(1, _status(429, {"Retry-After": "120"})) is None
+    assert 1 <= policy.delay(1, _status(503)) <= 2
+    assert 15 <= policy.delay(10, _status(503)) <= 30
+    assert policy.delay(1, _status(403)) is None
+
+
+def test_deadline_stops_new_requests() -> None:
+    policy = RetryPolicy(backoff_sec=5, deadline_sec=0.05)
+    # The backoff would outlast the deadline, so the first failure is final.
+    attempt = Attempts(_status(503))
+    with pytest.raises(RuntimeError, match="Failed to fetch"):
+        policy.call(URL, attempt)
+    assert attempt.calls == 1
+    time.sleep(0.06)
+    with pytest.raises(RuntimeError, match="deadline"):
+        policy.call(URL, Attempts())
+    # Each source gets a fresh deadline.
+    assert policy.for_source().call(URL, Attempts()) == "ok"
+
+
+def test_host_failures_set_the_streak_and_any_response_clears_it() -> None:
+    breaker = CircuitBreaker(threshold=3)
+    policy = _policy(breaker=breaker)
+    with pytest.raises(RuntimeError):
+        policy.call("https://down.org/a", Attempts(*[httpx.ConnectError("down")] * 3))
+    with pytest.raises(RuntimeError):
+        policy.call("https://gone.org/a", Attempts(_status(404)))
+    policy.call("https://flaky.org/a", Attempts(_status(502)))
+
+    previous = {"down.org": {"failure_streak": 2}, "gone.org": {"failure_streak": 4}}
+    assert breaker.host_state(previous) == {"down.org": {"failure_streak": 3}}
+
+
+def test_half_open_host_is_probed_once_without_retries() -> None:
+    breaker = CircuitBreaker(threshold=3)
+    breaker.seed({"x.org": {"failure_streak": 3}, "ok.org": {"failure_streak": 1}})
+    policy = _policy(breaker=breaker)
+
+    probe = Attempts(_status(503), _status(503))
+    with pytest.raises(RuntimeError):
+        policy.call(URL, probe)
+    assert probe.calls == 1
+    assert breaker.open_hosts() == ["x.org"]
+
+    later = Attempts()
+    with pytest.raises(RuntimeError, match="Circuit open"):
+        policy.call(URL, later)
+    assert later.calls == 0
+    assert policy.call("https://ok.org/a", Attempts()) == "ok"
+
+
+def test_requests_wait_for_the_probe() -> None:
+    breaker = CircuitBreaker(threshold=3)
+    breaker.seed({"x.org": {"failure_streak": 5}})
+    policy = _policy(breaker=breaker)
+    started = threading.Event()
+    finish = threading.Event()
+    order: list[str] = []
+
+    def probe() -> str:
+        started.set()
+        finish.wait(5)
+        order.append("probe")
+        return "ok"
+
+    def follower() -> str:
+        order.append("follower")
+        return "ok"
+
+    thread = threading.Thread(target=policy.call, args=(URL, probe))
+    thread.start()
+    started.wait(5)
+    waiting = threading.Thread(target=policy.call, args=(URL, follower))
+    waiting.start()
+    time.sleep(0.05)
+    assert order == []
+    finish.set()
+    thread.join(5)
+    waiting.join(5)
+    assert order == ["probe", "follower"]
+    assert breaker.open_hosts() == []
+    assert breaker.host_state({"x.org": {"failure_streak": 5}}) == {}
+
+
+def test_async_requests_wait_for_a_failed_probe() -> None:
+    breaker = CircuitBreaker(threshold=3)
+    breaker.seed({"x.org": {"failure_streak": 3}})
+    policy = _policy(breaker=breaker)
+    calls: list[str] = []
+
+    async def probe() -> str:
+        calls.append("probe")
+        await asyncio.sleep(0.05)
+        raise httpx.ConnectTimeout("timed out")
+
+    async def follower() -> str:
+        calls.append("follower")
+        return "ok"
+
+    async def run() -> list:
+        return await asyncio.gather(
+            policy.call_async(URL, probe),
+            policy.call_async(URL, follower),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert calls == ["probe"]
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert "Circuit open" in str(results[1])
+
+
+def test_probe_without_an_outcome_hands_over() -> None:
+    breaker = CircuitBreaker(threshold=3)
+    breaker.seed({"x.org": {"failure_streak": 3}})
+    policy = _policy(breaker=breaker)
+
+    def broken() -> str:
+        raise ValueError("parser bug")
+
+    with pytest.raises(ValueError):
+        policy.call(URL, broken)
+    assert breaker.open_hosts() == []
+    probe = Attempts(_status(503))
+    with pytest.raises(RuntimeError):
+        policy.call(URL, probe)
+    assert probe.calls == 1
+    assert breaker.open_hosts() == ["x.org"]
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from crawler import pipeline
+from crawler.storage import (
+    apply_retention,
+    iter_news_items,
+    merge_retained,
+    open_store,
+    write_news_items,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+def _item(number: int, days_ago: int) -> dict:
+    day = NOW - timedelta(days=days_ago)
+    published_at = day.replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        # Hashed, so id order says nothing about insertion order.
+        "id": hashlib.sha256(str(number).encode()).hexdigest(),
+        "source_id": "fed",
+        "source_name": "Fed",
+        "title": f"Item {number}",
+        "url": f"https://x.org/{number}",
+        "canonical_url": f"https://x.org/{number}",
+        "published_at": published_at.isoformat(),
+        "fetched_at": NOW.isoformat(),
+        "summary": "",
+        "keywords": [],
+        "content_type": "news",
+        "language": "en",
+        "region": "US",
+    }
+
+
+def _batches(seed: int, runs: int = 5, size: int = 30, days: int = 12) -> list[list[dict]]:
+    # Few distinct days, so most items tie on published_at.
+    rng = random.Random(seed)
+    numbers = iter(range(runs * size))
+    return [[_item(next(numbers), rng.randint(0, days)) for _ in range(size)] for _ in range(runs)]
+
+
+def _stored(store, data_path: Path, mode: str) -> list[dict]:
+    if mode in ("sqlite", "partitioned"):
+        return list(store.iter_news_items())
+    return list(iter_news_items(data_path))
+
+
+def _newest_first(items: list[dict]) -> list[dict]:
+    return sorted(items, key=lambda item: item["published_at"], reverse=True)
+
+
+RETENTIONS = {
+    "off": {"enabled": False},
+    "max_items": {"enabled": True, "max_items": 40},
+    "days": {"enabled": True, "days": 7},
+    "both": {"enabled": True, "max_items": 25, "days": 10},
+}
+
+
+@pytest.mark.parametrize("retention", RETENTIONS.values(), ids=RETENTIONS.keys())
+def test_merge_retained_matches_sort_then_retention(retention: dict) -> None:
+    existing, new_items = (_newest_first(batch) for batch in _batches(1, runs=2))
+    dropped: list[dict] = []
+    merged = list(merge_retained(existing, new_items, retention, dropped=dropped.append))
+    expected = apply_retention(_newest_first(existing + new_items), retention)
+    assert merged == expected
+    assert sorted(item["id"] for item in merged + dropped) == sorted(
+        item["id"] for item in existing + new_items
+    )
+
+
+def test_merge_retained_without_dropped_stops_reading_existing() -> None:
+    existing = _newest_first(_batches(2, runs=1)[0])
+    read: list[dict] = []
+
+    def reader():
+        for item in existing:
+            read.append(item)
+            yield item
+
+    merged = list(merge_retained(reader(), [], {"enabled": True, "max_items": 5}))
+    assert merged == existing[:5]
+    assert len(read) < len(existing)
+
+
+def test_full_store_sorts_a_hand_edited_file(tmp_path: Path) -> None:
+    existing, new_items = _batches(5, runs=2)
+    data_path = tmp_path / "news.jsonl"
+    write_news_items(data_path, existing)
+    retention = RETENTIONS["both"]
+    store = open_store(data_path, {"mode": "full"})
+    store.add_items([dict(item) for item in new_items], retention)
+    expected = apply_retention(_newest_first(existing + new_items), retention)
+    assert [item["id"] for item in iter_news_items(data_path)] == [item["id"] for item in expected]
+    assert store.total == len(expected)
+
+
+@pytest.mark.parametrize("mode", ["full", "incremental", "sqlite"])
+@pytest.mark.parametrize("retention", RETENTIONS.values(), ids=RETENTIONS.keys())
+def test_stores_keep_the_full_store_order(tmp_path: Path, mode: str, retention: dict) -> None:
+    batches = _batches(3)
+    expected: list[dict] = []
+    for batch in batches:
+        expected = apply_retention(_newest_first(expected + batch), retention)
+
+    data_path = tmp_path / "news.jsonl"
+    store = open_store(data_path, {"mode": mode, "compact_after_items": 10})
+    for batch in batches:
+        store.add_items([dict(item) for item in batch], retention)
+    if mode == "incremental":
+        store.compact(retention)
+    getattr(store, "close", lambda: None)()
+
+    store = open_store(data_path, {"mode": mode})
+    items = _stored(store, data_path, mode)
+    assert [item["id"] for item in items] == [item["id"] for item in expected]
+    if mode == "sqlite":
+        assert [item["id"] for item in iter_news_items(data_path)] == [
+            item["id"] for item in expected
+        ]
+    getattr(store, "close", lambda: None)()
+
+
+def test_sqlite_store_is_rebuilt_from_the_export(tmp_path: Path) -> None:
+    # CI checks out news.jsonl only; the database is rebuilt from it.
+    retention = {"enabled": False}
+    batches = _batches(7, runs=2)
+    data_path = tmp_path / "news.jsonl"
+    store = open_store(data_path, {"mode": "sqlite"})
+    store.add_items([dict(item) for item in batches[0]], retention)
+    store.close()
+    (tmp_path / "news.sqlite3").unlink()
+
+    store = open_store(data_path, {"mode": "sqlite"})
+    assert store.total == 30
+    store.add_items([dict(item) for item in batches[1]], retention)
+    store.close()
+    expected = _newest_first(batches[0] + batches[1])
+    assert [item["id"] for item in iter_news_items(data_path)] == [item["id"] for item in expected]
+
+
+def _settings(mode: str, retention: dict):
+    return lambda: {"storage": {"mode": mode, "compact_after_items": 1000}, "retention": retention}
+
+
+def test_compact_command_sorts_the_configured_store(tmp_path: Path, monkeypatch) -> None:
+    retention = RETENTIONS["max_items"]
+    monkeypatch.setattr(pipeline, "load_settings", _settings("incremental", retention))
+    data_path = tmp_path / "news.jsonl"
+    batches = _batches(5)
+    store = open_store(data_path, {"mode": "incremental", "compact_after_items": 1000})
+    for batch in batches:
+        store.add_items([dict(item) for item in batch], retention)
+
+    pipeline.compact(str(data_path))
+    items = [item for batch in batches for item in batch]
+    expected = apply_retention(_newest_first(items), retention)
+    assert [item["id"] for item in iter_news_items(data_path)] == [item["id"] for item in expected]
+
+
+@pytest.mark.parametrize("mode", ["full", "sqlite", "partitioned"])
+def test_compact_command_leaves_other_stores_alone(tmp_path: Path, monkeypatch, mode: str) -> None:
+    monkeypatch.setattr(pipeline, "load_settings", _settings(mode, {"enabled": False}))
+    data_path = tmp_path / "news.jsonl"
+    data_path.write_text("unsorted\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        pipeline.compact(str(data_path))
+    assert data_path.read_text(encoding="utf-8") == "unsorted\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["news.jsonl"]
+
+
+@pytest.mark.parametrize("mode", ["full", "incremental", "partitioned"])
+def test_dedup_index_follows_retention(tmp_path: Path, mode: str) -> None:
+    retention = {"enabled": True, "max_items": 40}
+    # Spread over months so the partitioned store retires some of them.
+    batches = _batches(4, days=150)
+    data_path = tmp_path / "news.jsonl"
+    store = open_store(data_path, {"mode": mode, "compact_after_items": 10})
+    for batch in batches:
+        store.add_items([dict(item) for item in batch], retention)
+    if mode == "incremental":
+        store.compact(retention)
+    kept = {item["id"] for item in _stored(store, data_path, mode)}
+
+    reopened = open_store(data_path, {"mode": mode})
+    assert len(reopened.ids) == len(kept)
+    assert all(item_id in reopened.ids for item_id in kept)
+    dropped = {item["id"] for batch in batches for item in batch} - kept
+    assert dropped and not any(item_id in reopened.ids for item_id in dropped)
+
+
+@pytest.mark.parametrize("mode", ["full", "incremental", "partitioned"])
+def test_git_ignored_sidecars_are_rebuilt(tmp_path: Path, mode: str) -> None:
+    # A fresh checkout has the corpus but none of the sidecars.
+    retention = {"enabled": False}
+    batches = _batches(6, runs=3)
+    data_path = tmp_path / "news.jsonl"
+    store = open_store(data_path, {"mode": mode, "compact_after_items": 1000})
+    store.add_items([dict(item) for item in batches[0]], retention)
+    if mode == "incremental":
+        store.compact(retention)
+    for batch in batches[1:]:
+        store.add_items([dict(item) for item in batch], retention)
+    for pattern in ("*.idx", "*.idx.tail", "*.meta.json"):
+        for path in tmp_path.rglob(pattern):
+            path.unlink()
+
+    reopened = open_store(data_path, {"mode": mode, "compact_after_items": 60})
+    assert len(reopened.ids) == 90
+    assert all(item["id"] in reopened.ids for batch in batches for item in batch)
+    assert reopened.total == 90
+    if mode == "incremental":
+        assert reopened.appended_since_compaction == 60
+        assert reopened.due_for_compaction()
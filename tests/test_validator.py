@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from crawler import validator
+from crawler.validator import _split_ranges, validate
+
+STORAGE = {"mode": "full"}
+
+
+def _line(number: int, **changes) -> str:
+    item = {
+        "id": f"id-{number}",
+        "source_id": "fed",
+        "source_name": "Fed",
+        "title": f"Item {number}",
+        "url": f"https://x.org/{number}",
+        "published_at": "2024-01-02T00:00:00+00:00",
+        **changes,
+    }
+    return json.dumps(item)
+
+
+def _write(path: Path, lines: list[str]) -> Path:
+    path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+    return path
+
+
+def _errors(path: Path, workers: int) -> str:
+    with pytest.raises(SystemExit) as raised:
+        validate(str(path), workers=workers, storage=STORAGE)
+    return str(raised.value)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3, 7])
+def test_ranges_cover_the_file_at_line_starts(tmp_path: Path, workers: int) -> None:
+    # One line longer than a worker's share, so some splits collapse.
+    lines = [_line(0, summary="x" * 5000)] + [_line(number) for number in range(1, 40)]
+    path = _write(tmp_path / "news.jsonl", lines)
+    data = path.read_bytes()
+    ranges = _split_ranges(path, workers)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    assert all(data[start - 1 : start] == b"\n" for start, _ in ranges[1:])
+
+
+def test_clean_file_passes_with_workers(tmp_path: Path) -> None:
+    path = _write(tmp_path / "news.jsonl", [_line(number) for number in range(50)])
+    validate(str(path), workers=4, storage=STORAGE)
+
+
+def test_workers_report_the_sequential_errors(tmp_path: Path) -> None:
+    lines = [_line(number) for number in range(60)]
+    lines[5] = "{not json"
+    lines[20] = _line(20, title="")
+    lines[33] = _line(33, published_at="someday")
+    # Duplicates of ids first seen in an earlier byte range.
+    lines[58] = _line(1)
+    lines[59] = _line(40, title="")
+    lines.append(_line(2))
+    path = _write(tmp_path / "news.jsonl", lines)
+
+    expected = _errors(path, workers=1)
+    assert expected.splitlines() == [
+        "Line 6: invalid json",
+        "Line 21: missing title",
+        "Line 34: invalid published_at",
+        "Line 59: duplicate id id-1",
+        "Line 60: missing title",
+        "Line 60: duplicate id id-40",
+        "Line 61: duplicate id id-2",
+    ]
+    assert _errors(path, workers=4) == expected
+
+
+def test_duplicates_are_found_across_sort_runs(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(validator, "_RUN_RECORDS", 3)
+    lines = [_line(number) for number in range(20)] + [_line(0), _line(19)]
+    path = _write(tmp_path / "news.jsonl", lines)
+    assert _errors(path, workers=1).splitlines() == [
+        "Line 21: duplicate id id-0",
+        "Line 22: duplicate id id-19",
+    ]